@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 from pathlib import Path
 
 from fastapi.testclient import TestClient
 
+from backend.app.config import settings
 from backend.app.main import app
+from backend.app.services.jobs import BatchRunner, get_queue
 
 
 def run(topic: str) -> dict:
@@ -25,7 +28,7 @@ def run(topic: str) -> dict:
 
     gather_resp = client.post(
         "/api/v1/research/gather",
-        json={"sources": candidates},
+        json={"sources": candidates, "topic": topic, "queries": search_data.get("optimized_queries", [])},
     )
     gather_resp.raise_for_status()
     gather_data = gather_resp.json()
@@ -58,13 +61,43 @@ def run(topic: str) -> dict:
     }
 
 
+def _read_topics(path: str) -> list[str]:
+    text = Path(path).read_text()
+    if path.endswith(".json"):
+        return [str(t) for t in json.loads(text)]
+    return [line.strip() for line in text.splitlines() if line.strip() and not line.startswith("#")]
+
+
+async def run_batch(topics: list[str], workers: int, batch_id: str | None = None) -> dict:
+    """Enqueue ``topics`` (or resume ``batch_id``) and work the batch to completion."""
+    queue = get_queue()
+    if topics:
+        batch_id, _ = queue.enqueue(topics, batch_id=batch_id)
+    if batch_id is None or queue.batch(batch_id) is None:
+        raise SystemExit(f"Unknown batch: {batch_id}")
+    print(f"Batch {batch_id}: working with {workers} worker(s)")
+    # The app lifespan sets up pools/clients; its own runner stays off so only
+    # this batch is drained here.
+    settings.batch_workers = 0
+    async with app.router.lifespan_context(app):
+        await BatchRunner(app, queue, workers=workers, batch_id=batch_id).drain()
+    return queue.batch(batch_id, with_results=True)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Run a research flow and save output JSON")
     parser.add_argument("--topic", default="Flow State for Productivity", help="Topic to research")
     parser.add_argument("--out", default="../outputs/research_output.json", help="Output JSON file path")
+    parser.add_argument("--batch", help="File of topics (one per line, or a .json list) to run as a batch")
+    parser.add_argument("--batch-id", help="Resume (or add --batch topics to) an existing batch")
+    parser.add_argument("--workers", type=int, default=2, help="Concurrent pipelines in batch mode")
     args = parser.parse_args()
 
-    result = run(args.topic)
+    if args.batch or args.batch_id:
+        topics = _read_topics(args.batch) if args.batch else []
+        result = asyncio.run(run_batch(topics, max(1, args.workers), args.batch_id))
+    else:
+        result = run(args.topic)
 
     out_path = Path(args.out)
     out_path.parent.mkdir(parents=True, exist_ok=True)
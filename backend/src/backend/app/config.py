@@ -9,12 +9,22 @@ class Settings(BaseSettings):
     environment: str = Field(default="development")
     api_prefix: str = Field(default="/api/v1")
     cors_origins: list[str] = Field(default_factory=lambda: ["http://localhost:3000"])  # dev
+    agents_base_url: str | None = None  # call agents over HTTP at this URL instead of in-process
     # Search
     search_provider: str = Field(default="ddg")  # tavily|bing|serpapi|ddg
     tavily_api_key: str | None = None
     bing_search_key: str | None = None
     bing_search_endpoint: str | None = None
     serpapi_api_key: str | None = None
+    search_region: str = Field(default="us-en")
+    search_cache_ttl: float = Field(default=3600.0)  # seconds
+    search_cache_max_entries: int = Field(default=1024)  # in-memory tier
+    search_cache_max_bytes: int = Field(default=32 * 1024 * 1024)  # disk tier; 0 disables
+    # Upstream search rate limits (requests per second, burst size); 0 disables
+    ddg_rate_per_sec: float = Field(default=1.0)
+    ddg_burst: float = Field(default=2.0)
+    tavily_rate_per_sec: float = Field(default=5.0)
+    tavily_burst: float = Field(default=5.0)
     # LLM
     llm_provider: str = Field(default="none")  # openai|azure-openai|anthropic|none
     openai_api_key: str | None = None
@@ -22,6 +32,74 @@ class Settings(BaseSettings):
     azure_openai_endpoint: str | None = None
     azure_openai_api_key: str | None = None
     azure_openai_deployment: str | None = None
+    llm_model: str = Field(default="gpt-4o-mini")
+    llm_temperature: float = Field(default=0.2)
+    llm_timeout: float = Field(default=60.0)  # seconds
+    llm_max_concurrency: int = Field(default=4)  # in-flight completions per worker
+    llm_max_retries: int = Field(default=3)
+    llm_retry_base_delay: float = Field(default=0.5)  # seconds, doubled per retry
+    synthesis_token_budget: int = Field(default=3000)  # estimated prompt tokens for evidence
+    synthesis_mode: str = Field(default="auto")  # single|map_reduce|auto (map-reduce when over budget)
+    synthesis_chunk_tokens: int = Field(default=2000)  # evidence per map-step prompt
+    synthesis_map_concurrency: int = Field(default=4)
+    synthesis_max_evidence_tokens: int = Field(default=200_000)  # cap across all chunks
+    llm_cache_max_bytes: int = Field(default=64 * 1024 * 1024)  # response cache; 0 disables
+    # Storage (defaults to backend/storage)
+    storage_dir: str | None = None
+    # Run state
+    run_state_backend: str = Field(default="memory")  # memory|sqlite|redis
+    run_state_sqlite_path: str | None = None  # defaults to <storage>/run_state.db
+    redis_url: str = Field(default="redis://localhost:6379/0")
+    run_store_max_runs: int = Field(default=256)
+    run_store_max_bytes: int = Field(default=64 * 1024 * 1024)
+    run_store_ttl: float = Field(default=3600.0)  # seconds idle before leaving memory
+    run_store_spill: bool = Field(default=True)  # keep evicted runs on disk under storage/runs
+    # Run artifacts (storage/runs/<run_id>: evidence.jsonl, <stage>.json, index.json)
+    run_artifacts_enabled: bool = Field(default=True)
+    run_artifacts_fsync_interval: float = Field(default=1.0)  # seconds between batched evidence fsyncs; 0 = every append
+    # Background runs
+    run_task_concurrency: int = Field(default=8)  # stages executing at once; the rest wait queued
+    run_status_poll: float = Field(default=1.0)  # seconds between status checks on SSE streams
+    # Batch jobs
+    batch_workers: int = Field(default=2)  # in-process batch workers; 0 = enqueue only
+    batch_db_path: str | None = None  # defaults to <storage>/jobs.db
+    batch_lease_seconds: float = Field(default=300.0)  # running job without heartbeat is requeued
+    batch_max_attempts: int = Field(default=3)
+    # Fetching
+    fetch_max_concurrency: int = Field(default=16)
+    fetch_per_host_limit: int = Field(default=4)  # concurrent requests per registrable domain
+    fetch_domain_delay: float = Field(default=0.5)  # seconds between request starts to one domain
+    robots_enabled: bool = Field(default=True)  # skip URLs disallowed by robots.txt
+    robots_ttl: float = Field(default=3600.0)  # seconds a site's robots.txt is cached
+    robots_max_crawl_delay: float = Field(default=10.0)  # cap on honoured Crawl-delay
+    robots_max_bytes: int = Field(default=512 * 1024)  # larger robots.txt files are ignored (allow all)
+    robots_cache_max_entries: int = Field(default=4096)  # origins whose rules are kept
+    fetch_timeout: float = Field(default=10.0)  # seconds, per request
+    fetch_max_bytes: int = Field(default=5 * 1024 * 1024)  # larger bodies are abandoned mid-download
+    harvest_deadline: float = Field(default=25.0)  # seconds, whole harvest
+    harvest_top_k: int = Field(default=8)  # sources harvested per pipeline run, best BM25 first
+    harvest_per_query: int = Field(default=3)  # top sources taken from each query's results
+    harvest_adaptive: bool = Field(default=True)  # fetch in rank order, stop once evidence is sufficient
+    harvest_parallel: int = Field(default=4)  # sources in flight per harvest in adaptive mode
+    harvest_min_quotes: int = Field(default=8)  # sufficiency thresholds (0 ignores one)
+    harvest_min_publishers: int = Field(default=3)
+    harvest_min_keyword_coverage: float = Field(default=0.75)  # share of topic/query keyword weight quoted
+    # Near-duplicate detection (64-bit SimHash)
+    dedupe_enabled: bool = Field(default=True)  # skip mirrored documents while harvesting
+    dedupe_max_distance: int = Field(default=3)  # differing bits still counted as a duplicate (max 3)
+    # Extraction
+    extract_workers: int = Field(default=0)  # process pool size; 0 = one per CPU core
+    extract_queue_size: int = Field(default=32)  # documents waiting beyond busy workers
+    extract_cpu_seconds: float = Field(default=5.0)  # CPU-time cap per document; 0 disables
+    # PDF extraction
+    pdf_enabled: bool = Field(default=True)  # fetch PDF candidates instead of rejecting them
+    pdf_max_bytes: int = Field(default=20 * 1024 * 1024)  # download cap for PDFs
+    pdf_max_pages: int = Field(default=50)  # pages read per document at most
+    pdf_target_pages: int = Field(default=3)  # stop after this many keyword-relevant pages
+    # Page cache
+    page_cache_enabled: bool = Field(default=True)
+    page_cache_ttl: float = Field(default=86400.0)  # seconds before revalidation
+    page_cache_max_bytes: int = Field(default=256 * 1024 * 1024)
 
     class Config:
         env_file = ".env"
@@ -7,7 +7,14 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .config import settings
-from .routers import research, runs
+from .services.artifacts import start_flusher, stop_flusher
+from .services.extraction import shutdown_pool, start_pool
+from .services.fetcher import close_engine
+from .services.jobs import start_runner, stop_runner
+from .services.llm import close_llm_client, get_llm_client
+from .services.orchestrator import close_client as close_agent_client
+from .services.tasks import close_tasks, get_tasks
+from .routers import cache, research, runs
 from ..crew.agents.query_optimizer.api import router as query_optimizer_router
 from ..crew.agents.source_scout.api import router as source_scout_router
 from ..crew.agents.evidence_harvester.api import router as evidence_harvester_router
@@ -15,12 +22,25 @@ from ..crew.agents.citation_builder.api import router as citation_builder_router
 from ..crew.agents.synthesizer.api import router as synthesizer_router
 from ..crew.agents.title_abstract.api import router as title_abstract_router
 from ..crew.agents.reviewer.api import router as reviewer_router
+from ..crew.agents.registry import register_routes
 
 
-async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     # Place for starting background tasks or warmups
+    start_pool()
+    get_llm_client()
+    get_tasks()
+    start_runner(app)
+    start_flusher()
     yield
     # Graceful shutdown hooks can go here
+    await stop_runner()
+    await close_tasks()
+    await close_agent_client()
+    await close_engine()
+    await close_llm_client()
+    shutdown_pool()
+    await stop_flusher()
 
 
 app = FastAPI(title=settings.app_name, version="0.1.0", lifespan=lifespan)
@@ -40,18 +60,23 @@ async def healthz() -> dict[str, str]:
     return {"status": "ok"}
 
 
-# Include agent routers under /api/v1/agents/*
-app.include_router(query_optimizer_router, prefix=f"{settings.api_prefix}")
-app.include_router(source_scout_router, prefix=f"{settings.api_prefix}")
-app.include_router(evidence_harvester_router, prefix=f"{settings.api_prefix}")
-app.include_router(citation_builder_router, prefix=f"{settings.api_prefix}")
-app.include_router(synthesizer_router, prefix=f"{settings.api_prefix}")
-app.include_router(title_abstract_router, prefix=f"{settings.api_prefix}")
-app.include_router(reviewer_router, prefix=f"{settings.api_prefix}")
+# Include agent routers under /api/v1/agents/* and register them for in-process calls
+for agent_router in (
+    query_optimizer_router,
+    source_scout_router,
+    evidence_harvester_router,
+    citation_builder_router,
+    synthesizer_router,
+    title_abstract_router,
+    reviewer_router,
+):
+    app.include_router(agent_router, prefix=f"{settings.api_prefix}")
+    register_routes(agent_router)
 
 # Include app routers
 app.include_router(research.router, prefix=f"{settings.api_prefix}")
 app.include_router(runs.router, prefix=f"{settings.api_prefix}")
+app.include_router(cache.router, prefix=f"{settings.api_prefix}")
 
 
 def cli() -> None:
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import asyncio
+
+from fastapi import APIRouter
+
+from ..services.llm import response_cache_stats
+from ..services.memory import get_store
+from ..services.page_cache import get_page_cache
+from ..services.search_cache import get_search_cache
+
+router = APIRouter(tags=["cache"], prefix="/cache")
+
+
+def _stats() -> dict:
+    pages = get_page_cache()
+    return {
+        "search": get_search_cache().stats(),
+        "pages": pages.stats() if pages else None,
+        "runs": get_store().stats(),
+        "llm": response_cache_stats(),
+    }
+
+
+@router.get("/stats")
+async def stats():
+    # The disk tiers list their directory on first use
+    return await asyncio.to_thread(_stats)
@@ -1,12 +1,20 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Request
+import asyncio
+import json
+import uuid
+
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 
+from ...crew.agents.evidence_harvester.api import MAX_SOURCES
+from ..services.jobs import get_queue, notify_runner
 from ..services.orchestrator import Orchestrator
-from ..services.memory import set_evidence, get_evidence
-from ..services.streaming import sse_format
-from fastapi.responses import StreamingResponse
+from ..services.memory import aget_evidence
+from ..services.streaming import ldj_stream, sse_format
+from ..services.tasks import get_tasks
+from ..services.storage import RunId
+from fastapi.responses import JSONResponse, StreamingResponse
 
 
 router = APIRouter(tags=["research"], prefix="/research")
@@ -23,49 +31,163 @@ async def search(req: Request, payload: SearchRequest):
     return await orch.search(payload.topic, payload.constraints or {})
 
 
+async def _submit(run_id: str, stage: str, work) -> JSONResponse:
+    # Background variant of a stage: 202 with the run's status to poll at /runs/{run_id}
+    try:
+        return JSONResponse(await get_tasks().submit(run_id, stage, work), status_code=202)
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+
+
 class GatherRequest(BaseModel):
-    run_id: str | None = None
+    run_id: RunId | None = None
     sources: list[dict] | None = None
+    topic: str | None = None
+    queries: list[str] | None = None
+    background: bool = False
 
 
 @router.post("/gather")
 async def gather(req: Request, payload: GatherRequest):
     orch = Orchestrator(req.app)
-    res = await orch.gather(payload.run_id, payload.sources or [])
-    if res.get("run_id") and res.get("evidence") is not None:
-        set_evidence(res["run_id"], res.get("evidence", []))
-    return res
+    if not payload.background:
+        return await orch.gather(payload.run_id, payload.sources or [], topic=payload.topic, queries=payload.queries)
+    run_id = payload.run_id or uuid.uuid4().hex[:12]
+    sources = payload.sources or []
+
+    async def _work(report):
+        # Progress is the share of sources finished (the harvester takes at most MAX_SOURCES)
+        total = max(1, min(len({s["url"] for s in sources if s.get("url")}), MAX_SOURCES))
+        finished = 0
+        async for event, _ in orch.gather_stream(run_id, sources, topic=payload.topic, queries=payload.queries):
+            if event == "source":
+                finished += 1
+                report("gather", min(finished / total, 1.0))
+
+    return await _submit(run_id, "gather", _work)
+
+
+@router.post("/gather/stream")
+async def gather_stream(req: Request, payload: GatherRequest, format: str = "ndjson"):
+    """Stream evidence per source as it is extracted (NDJSON, or SSE with ``format=sse``)."""
+    orch = Orchestrator(req.app)
+    events = orch.gather_stream(payload.run_id, payload.sources or [], topic=payload.topic, queries=payload.queries)
+    if format == "sse":
+
+        async def _sse():
+            async for event, data in events:
+                yield sse_format(event, json.dumps(data))
+
+        return StreamingResponse(_sse(), media_type="text/event-stream")
+
+    async def _objects():
+        async for event, data in events:
+            yield {"event": event, "data": data}
+
+    return StreamingResponse(ldj_stream(_objects()), media_type="application/x-ndjson")
+
+
+# Background synthesis progress: map step under way, then the answer streaming
+_SYNTH_PROGRESS = {"progress": 0.3, "token": 0.6}
 
 
 class SynthesizeRequest(BaseModel):
-    run_id: str
+    run_id: RunId
     evidence: list[dict] | None = None
+    topic: str | None = None
+    background: bool = False
 
 
 @router.post("/synthesize")
 async def synthesize(req: Request, payload: SynthesizeRequest):
     orch = Orchestrator(req.app)
-    return await orch.synthesize(payload.run_id, evidence=payload.evidence or [])
+    if not payload.background:
+        return await orch.synthesize(payload.run_id, evidence=payload.evidence or [], topic=payload.topic)
+
+    async def _work(report):
+        reported = None
+        async for event, _ in orch.synthesize_stream(payload.run_id, evidence=payload.evidence or [], topic=payload.topic):
+            progress = _SYNTH_PROGRESS.get(event)
+            if progress is not None and progress != reported:
+                reported = progress
+                report("synthesize", progress)
+
+    return await _submit(payload.run_id, "synthesize", _work)
 
 
 @router.get("/synthesize/stream")
-async def synthesize_stream(req: Request, run_id: str):
+async def synthesize_stream(req: Request, run_id: RunId, topic: str | None = None):
     orch = Orchestrator(req.app)
 
     async def _gen():
         yield sse_format("progress", "Starting synthesis...")
-        ev = get_evidence(run_id)
+        ev = await aget_evidence(run_id)
         yield sse_format("progress", f"Loaded {len(ev)} evidence items")
-        data = await orch.synthesize(run_id, evidence=ev)
-        import json
+        async for event, data in orch.synthesize_stream(run_id, evidence=ev, topic=topic):
+            yield sse_format(event, json.dumps(data))
+
+    return StreamingResponse(_gen(), media_type="text/event-stream")
+
+
+class RunRequest(BaseModel):
+    topic: str
+    constraints: dict | None = None
+    run_id: RunId | None = None
 
-        yield sse_format("result", json.dumps(data))
+
+def _run_events(req: Request, payload: RunRequest) -> StreamingResponse:
+    orch = Orchestrator(req.app)
+
+    async def _gen():
+        async for event, data in orch.run(payload.topic, payload.constraints or {}, run_id=payload.run_id):
+            yield sse_format(event, json.dumps(data))
 
     return StreamingResponse(_gen(), media_type="text/event-stream")
 
 
+@router.post("/run")
+async def run(req: Request, payload: RunRequest):
+    return _run_events(req, payload)
+
+
+@router.get("/run/stream")
+async def run_stream(req: Request, topic: str, run_id: RunId | None = None):
+    # EventSource-friendly variant of POST /run
+    return _run_events(req, RunRequest(topic=topic, run_id=run_id))
+
+
+class BatchRequest(BaseModel):
+    topics: list[str]
+    constraints: dict | None = None
+
+
+@router.post("/batch")
+async def batch(payload: BatchRequest):
+    batch_id, jobs = await asyncio.to_thread(get_queue().enqueue, payload.topics, payload.constraints)
+    if not jobs:
+        raise HTTPException(status_code=422, detail="No topics given")
+    notify_runner()
+    return {"batch_id": batch_id, "jobs": jobs}
+
+
+@router.get("/batch/{batch_id}")
+async def batch_status(batch_id: str):
+    status = await asyncio.to_thread(get_queue().batch, batch_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return status
+
+
+@router.get("/batch/{batch_id}/results")
+async def batch_results(batch_id: str):
+    status = await asyncio.to_thread(get_queue().batch, batch_id, with_results=True)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return status
+
+
 class TitleRequest(BaseModel):
-    run_id: str
+    run_id: RunId
 
 
 @router.post("/title")
@@ -75,7 +197,7 @@ async def title(req: Request, payload: TitleRequest):
 
 
 class ReviewRequest(BaseModel):
-    run_id: str
+    run_id: RunId
 
 
 @router.post("/review")
@@ -1,22 +1,121 @@
 from __future__ import annotations
 
-from fastapi import APIRouter
+import json
+import re
+import uuid
+from datetime import datetime, timezone
+from urllib.parse import quote
+
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from ..services.storage import build_zip_bytes
+
+from ..config import settings
+from ..services.orchestrator import STAGE_PROGRESS, Orchestrator
+from ..services import artifacts
+from ..services.memory import aget_evidence, aload_run_state, get_evidence
+from ..services.storage import iter_zip, RunId
+from ..services.streaming import sse_format
+from ..services.tasks import TERMINAL_STATES, aget_status, get_tasks
 
 router = APIRouter(tags=["runs"], prefix="/runs")
 
 
+class SubmitRequest(BaseModel):
+    topic: str
+    constraints: dict | None = None
+    run_id: RunId | None = None
+
+
+@router.post("", status_code=202)
+async def submit(req: Request, payload: SubmitRequest):
+    """Run the whole pipeline in the background; poll or stream its status."""
+    orch = Orchestrator(req.app)
+    run_id = payload.run_id or uuid.uuid4().hex[:12]
+
+    async def _work(report):
+        async for event, _ in orch.run(payload.topic, payload.constraints or {}, run_id=run_id):
+            if event in STAGE_PROGRESS:
+                report(event, STAGE_PROGRESS[event])
+
+    try:
+        return await get_tasks().submit(run_id, "run", _work)
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+
+
+@router.get("/{run_id}")
+async def status(run_id: RunId):
+    data = await aget_status(run_id)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    return data
+
+
+@router.get("/{run_id}/events")
+async def status_events(run_id: RunId):
+    if await aget_status(run_id) is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    tasks = get_tasks()
+
+    async def _gen():
+        last = None
+        while True:
+            data = await aget_status(run_id)
+            if data != last:
+                yield sse_format("status", json.dumps(data))
+                last = data
+            if data is None or data.get("state") in TERMINAL_STATES:
+                return
+            await tasks.wait(run_id, timeout=settings.run_status_poll)
+
+    return StreamingResponse(_gen(), media_type="text/event-stream")
+
+
+@router.delete("/{run_id}")
+async def cancel(run_id: RunId):
+    if not get_tasks().cancel(run_id):
+        raise HTTPException(status_code=404, detail="No stage in progress for this run")
+    return {"run_id": run_id, "cancelling": True}
+
+
+_REPORT_FIELDS = ("topic", "optimized_queries", "candidates", "synthesis", "title", "review")
+
+
+def _attachment(topic: str) -> str:
+    """``Content-Disposition`` for the ZIP: an ASCII slug plus the RFC 5987 UTF-8 name."""
+    name = topic.lower().replace(" ", "_")
+    slug = re.sub(r"[^a-z0-9-]+", "_", name).strip("_")[:80] or "report"
+    return f"attachment; filename=\"research_{slug}.zip\"; filename*=UTF-8''{quote(f'research_{name}.zip', safe='')}"
+
+
+def _zip_response(report: dict, evidence) -> StreamingResponse:
+    # A sync iterator: Starlette drains it in a worker thread, chunk by chunk.
+    return StreamingResponse(
+        iter_zip(report, evidence=evidence),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": _attachment(report.get("topic") or "report"),
+        },
+    )
+
+
 @router.get("/{run_id}/download")
-async def download(run_id: str):
-    # Placeholder implementation; later stream a ZIP archive
-    return {"run_id": run_id, "status": "download-ready", "note": "ZIP streaming to be implemented"}
+async def download(run_id: RunId):
+    state = await aload_run_state(run_id)
+    on_disk = settings.run_artifacts_enabled and artifacts.has_evidence(run_id)
+    if not state and not on_disk and not await aget_evidence(run_id):
+        raise HTTPException(status_code=404, detail="Run not found")
+    report = {"run_id": run_id, **{k: state.get(k) for k in _REPORT_FIELDS}}
+    report["generated_at"] = datetime.now(timezone.utc).isoformat()
+    # Evidence is read line by line from evidence.jsonl while the ZIP streams
+    evidence = (lambda: artifacts.iter_evidence(run_id)) if on_disk else (lambda: get_evidence(run_id))
+    return _zip_response(report, evidence)
 
 
 class BundleRequest(BaseModel):
     topic: str
-    run_id: str | None = None
+    run_id: RunId | None = None
     optimized_queries: list[str] | None = None
     candidates: list[dict] | None = None
     evidence: list[dict] | None = None
@@ -29,12 +128,15 @@ class BundleRequest(BaseModel):
 @router.post("/bundle")
 async def bundle(req: BundleRequest):
     report = req.model_dump()
-    data = build_zip_bytes(report)
-    filename = f"research_{(req.topic or 'report').lower().replace(' ', '_')}.zip"
-    return StreamingResponse(
-        iter([data]),
-        media_type="application/zip",
-        headers={
-            "Content-Disposition": f"attachment; filename={filename}",
-        },
-    )
+    # Anything the client left out is taken from the run's persisted state
+    state = await aload_run_state(req.run_id) if req.run_id else {}
+    for key in _REPORT_FIELDS:
+        if report.get(key) is None and state.get(key) is not None:
+            report[key] = state[key]
+    evidence = lambda: report.get("evidence") or []  # noqa: E731
+    if report.get("evidence") is None and req.run_id:
+        if settings.run_artifacts_enabled and artifacts.has_evidence(req.run_id):
+            evidence = lambda: artifacts.iter_evidence(req.run_id)  # noqa: E731
+        else:
+            evidence = lambda: get_evidence(req.run_id)  # noqa: E731
+    return _zip_response(report, evidence)
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterator, List
+
+from ..config import settings
+from .storage import run_dir, run_path
+
+# Layout of storage/runs/<run_id>/:
+#   evidence.jsonl   append-only, one evidence item per line
+#   <stage>.json     latest output of each stage (synthesis, title, review, ...)
+#   index.json       what is on disk: stage files, evidence count/bytes
+_EVIDENCE = "evidence.jsonl"
+_INDEX = "index.json"
+_STAGE = re.compile(r"^[A-Za-z0-9_-]+$")
+
+_LOCK = threading.RLock()
+_LAST_SYNC = 0.0
+_PENDING: set[Path] = set()
+_FLUSHER: asyncio.Task | None = None
+
+
+def _sync(path: Path, fd: int) -> None:
+    """fsync an evidence append now if the batch interval has passed, else defer it.
+
+    Appends are flushed to the OS immediately, so a process crash loses
+    nothing. Deferred fsyncs are issued by the next append after the
+    interval or by the flusher task (``start_flusher``), so on power failure
+    roughly one ``run_artifacts_fsync_interval`` of appended evidence is at
+    risk. Stage and index files are always fsynced (see ``_write_atomic``).
+    """
+    global _LAST_SYNC
+    interval = settings.run_artifacts_fsync_interval
+    now = time.monotonic()
+    if interval > 0 and now - _LAST_SYNC < interval:
+        _PENDING.add(path)
+        return
+    os.fsync(fd)
+    _PENDING.discard(path)
+    _LAST_SYNC = now
+    flush_pending()
+
+
+def flush_pending() -> None:
+    """fsync every file whose sync was deferred."""
+    with _LOCK:
+        for path in list(_PENDING):
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except OSError:
+                _PENDING.discard(path)
+                continue
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            _PENDING.discard(path)
+
+
+async def _flush_loop(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        if _PENDING:
+            await asyncio.to_thread(flush_pending)
+
+
+def start_flusher() -> None:
+    """Start issuing deferred fsyncs every interval, so an idle run is not left unsynced."""
+    global _FLUSHER
+    interval = settings.run_artifacts_fsync_interval
+    if interval > 0 and _FLUSHER is None:
+        _FLUSHER = asyncio.create_task(_flush_loop(interval))
+
+
+async def stop_flusher() -> None:
+    global _FLUSHER
+    if _FLUSHER is not None:
+        _FLUSHER.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await _FLUSHER
+    _FLUSHER = None
+    flush_pending()
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    # The data must be durable before the rename, or a crash can leave an
+    # empty file under the final name
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _read_index(run_id: str) -> dict[str, Any]:
+    try:
+        return json.loads((run_dir(run_id) / _INDEX).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"run_id": run_id, "stages": {}, "evidence": {"count": 0, "bytes": 0}}
+
+
+def _write_index(run_id: str, index: dict[str, Any]) -> None:
+    index["updated_at"] = time.time()
+    _write_atomic(run_path(run_id) / _INDEX, json.dumps(index, ensure_ascii=False).encode("utf-8"))
+
+
+def _encode_evidence(items: List[dict]) -> bytes:
+    return "".join(json.dumps(e, ensure_ascii=False, default=str) + "\n" for e in items).encode("utf-8")
+
+
+def append_evidence(run_id: str, items: List[dict]) -> None:
+    if not items:
+        return
+    data = _encode_evidence(items)
+    with _LOCK:
+        path = run_path(run_id) / _EVIDENCE
+        with open(path, "ab") as f:
+            f.write(data)
+            f.flush()
+            _sync(path, f.fileno())
+        index = _read_index(run_id)
+        index["evidence"] = {"count": index["evidence"]["count"] + len(items), "bytes": index["evidence"]["bytes"] + len(data)}
+        _write_index(run_id, index)
+
+
+def write_evidence(run_id: str, items: List[dict]) -> None:
+    """Replace the run's evidence file (used when a stage supplies the full set)."""
+    data = _encode_evidence(items)
+    with _LOCK:
+        _write_atomic(run_path(run_id) / _EVIDENCE, data)
+        index = _read_index(run_id)
+        index["evidence"] = {"count": len(items), "bytes": len(data)}
+        _write_index(run_id, index)
+
+
+def iter_evidence(run_id: str) -> Iterator[dict]:
+    """Stream evidence items from disk; a torn last line (crash mid-append) is skipped."""
+    try:
+        f = open(run_dir(run_id) / _EVIDENCE, "rb")
+    except OSError:
+        return
+    with f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def write_stage(run_id: str, stage: str, data: Any) -> None:
+    if not _STAGE.match(stage):
+        raise ValueError(f"invalid stage name: {stage!r}")
+    payload = json.dumps(data, ensure_ascii=False, default=str).encode("utf-8")
+    with _LOCK:
+        _write_atomic(run_path(run_id) / f"{stage}.json", payload)
+        index = _read_index(run_id)
+        index["stages"][stage] = {"file": f"{stage}.json", "bytes": len(payload), "updated_at": time.time()}
+        _write_index(run_id, index)
+
+
+def read_stage(run_id: str, stage: str) -> Any:
+    if not _STAGE.match(stage):
+        return None
+    try:
+        return json.loads((run_dir(run_id) / f"{stage}.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def load_run(run_id: str) -> dict[str, Any]:
+    """All persisted stage outputs of a run (evidence excluded; see ``iter_evidence``)."""
+    index = _read_index(run_id)
+    out = {}
+    for stage in index["stages"]:
+        value = read_stage(run_id, stage)
+        if value is not None:
+            out[stage] = value
+    return out
+
+
+def has_evidence(run_id: str) -> bool:
+    return (run_dir(run_id) / _EVIDENCE).exists()
+
+
+def index(run_id: str) -> dict[str, Any] | None:
+    if not (run_dir(run_id) / _INDEX).exists():
+        return None
+    return _read_index(run_id)
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import Any, Iterable, List
+
+from ..config import settings
+
+_WORD = re.compile(r"[a-z0-9]+")
+_BITS = 64
+_BANDS = 4  # 16-bit bands: any two signatures within 3 bits share at least one band
+
+
+def _hash64(data: str) -> int:
+    return int.from_bytes(hashlib.blake2b(data.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text: str, k: int = 3, limit: int = 8000) -> int:
+    """64-bit SimHash over word ``k``-shingles (the first ``limit`` distinct ones).
+
+    Punctuation and case are ignored, so reformatted or syndicated copies of a
+    passage land within a few bits of each other.
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) < k:
+        shingles = {" ".join(words)} if words else set()
+    else:
+        shingles = set()
+        for i in range(len(words) - k + 1):
+            shingles.add(" ".join(words[i : i + k]))
+            if len(shingles) >= limit:
+                break
+    if not shingles:
+        return 0
+    counts = [0] * _BITS
+    for s in shingles:
+        h = _hash64(s)
+        for b in range(_BITS):
+            counts[b] += 1 if h >> b & 1 else -1
+    return sum(1 << b for b in range(_BITS) if counts[b] > 0)
+
+
+def fingerprint(text: str) -> str:
+    """SimHash as 16 hex chars (JSON-safe; 64-bit ints lose precision in JS)."""
+    return f"{simhash(text):016x}"
+
+
+def _as_int(fp: int | str) -> int:
+    return int(fp, 16) if isinstance(fp, str) else fp
+
+
+def hamming(a: int | str, b: int | str) -> int:
+    return (_as_int(a) ^ _as_int(b)).bit_count()
+
+
+class SimHashIndex:
+    """Banded LSH over SimHash signatures for near-duplicate lookups.
+
+    Signatures are split into ``_BANDS`` bands and bucketed per band, so a
+    lookup only compares against signatures sharing a band instead of all of
+    them. With ``max_distance`` < ``_BANDS`` no near duplicate is missed.
+    """
+
+    def __init__(self, max_distance: int = 3):
+        self._max_distance = max_distance
+        self._width = _BITS // _BANDS
+        self._buckets: list[dict[int, list[tuple[int, Any]]]] = [{} for _ in range(_BANDS)]
+
+    def _bands(self, sig: int) -> Iterable[tuple[int, int]]:
+        mask = (1 << self._width) - 1
+        for i in range(_BANDS):
+            yield i, (sig >> (i * self._width)) & mask
+
+    def add(self, fp: int | str, item: Any) -> None:
+        sig = _as_int(fp)
+        for i, band in self._bands(sig):
+            self._buckets[i].setdefault(band, []).append((sig, item))
+
+    def near(self, fp: int | str) -> Any | None:
+        """The first indexed item within ``max_distance`` bits of ``fp``, if any."""
+        sig = _as_int(fp)
+        for i, band in self._bands(sig):
+            for other, item in self._buckets[i].get(band, ()):
+                if hamming(sig, other) <= self._max_distance:
+                    return item
+        return None
+
+
+def cluster_evidence(evidence: List[dict], max_distance: int | None = None) -> List[List[dict]]:
+    """Group near-identical quotes; each cluster starts with its first occurrence.
+
+    Uses the item's ``fingerprint`` when present, else hashes its quote.
+    Clusters come back in order of first appearance.
+    """
+    index = SimHashIndex(settings.dedupe_max_distance if max_distance is None else max_distance)
+    clusters: List[List[dict]] = []
+    for e in evidence:
+        quote = e.get("quote") or ""
+        if not quote.strip():
+            continue
+        fp = e.get("fingerprint") or fingerprint(quote)
+        found = index.near(fp)
+        if found is None:
+            index.add(fp, len(clusters))
+            clusters.append([e])
+        else:
+            clusters[found].append(e)
+    return clusters
+
+
+class DocumentDeduper:
+    """Tracks harvested documents of one run to skip mirrors and syndicated copies.
+
+    ``before_fetch`` consults the fingerprint stored with a URL's cached
+    extraction so a known mirror is not fetched at all; ``after_extract``
+    catches the rest once the page text is in hand.
+    """
+
+    def __init__(self, known: Iterable[str] = (), max_distance: int | None = None):
+        self._index = SimHashIndex(settings.dedupe_max_distance if max_distance is None else max_distance)
+        for fp in known:
+            # Documents from earlier harvest calls carry no URL
+            self._index.add(fp, "")
+
+    def before_fetch(self, cached_fingerprint: str | None) -> str | None:
+        if not cached_fingerprint:
+            return None
+        return self._duplicate_of(cached_fingerprint)
+
+    def after_extract(self, url: str, extracted: dict) -> str | None:
+        fp = extracted.get("fingerprint")
+        if not fp:
+            return None
+        dup = self._duplicate_of(fp)
+        if dup is None:
+            self._index.add(fp, url)
+        # A URL registered from its cached signature matches itself
+        return None if dup == url else dup
+
+    def _duplicate_of(self, fp: str) -> str | None:
+        found = self._index.near(fp)
+        if found is None:
+            return None
+        return found or "earlier source"
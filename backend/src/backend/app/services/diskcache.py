@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+
+class DiskCache:
+    """Size-bounded JSON store on disk with least-recently-used eviction.
+
+    Each entry is one file. The directory is scanned once (oldest mtime
+    first) into an in-memory LRU index of entry sizes; after that, reads,
+    writes, eviction and ``stats`` work from the index instead of listing
+    the tree. Calls do blocking file I/O: async code runs them in a thread.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self._dir = Path(directory)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index: OrderedDict[str, int] | None = None
+        self._size = 0
+        self.evictions = 0
+
+    def _path(self, key: str) -> Path:
+        return self._dir / key[:2] / f"{key}.json"
+
+    def _entries(self) -> OrderedDict[str, int]:
+        # key -> size, least recently used first
+        if self._index is None:
+            found = []
+            for p in self._dir.glob("*/*.json"):
+                try:
+                    st = p.stat()
+                except OSError:
+                    continue
+                found.append((st.st_mtime, p.stem, st.st_size))
+            found.sort()
+            self._index = OrderedDict((key, size) for _, key, size in found)
+            self._size = sum(self._index.values())
+        return self._index
+
+    def get(self, key: str) -> Any | None:
+        path = self._path(key)
+        try:
+            data = path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+        try:
+            value = json.loads(data)
+        except ValueError:
+            self.delete(key)
+            return None
+        self.touch(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with self._lock:
+            entries = self._entries()
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+            self._size += len(data) - entries.pop(key, 0)
+            entries[key] = len(data)
+            if self._size > self._max_bytes:
+                self._evict()
+
+    def touch(self, key: str) -> None:
+        with self._lock:
+            entries = self._entries()
+            if key in entries:
+                entries.move_to_end(key)
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+            self._size -= self._entries().pop(key, 0)
+
+    def _evict(self) -> None:
+        # Drop down to 90% of the bound so we don't evict on every write.
+        target = int(self._max_bytes * 0.9)
+        entries = self._entries()
+        while entries and self._size > target:
+            key, size = entries.popitem(last=False)
+            self._size -= size
+            try:
+                self._path(key).unlink()
+            except OSError:
+                continue  # already gone (another worker evicted it)
+            self.evictions += 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries()),
+                "bytes": self._size,
+                "max_bytes": self._max_bytes,
+                "evictions": self.evictions,
+            }
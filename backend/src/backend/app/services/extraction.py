@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+
+from ..config import settings
+
+
+class CpuBudgetExceeded(BaseException):
+    # Not an Exception: trafilatura's readability/justext fallbacks catch
+    # ``Exception`` and would swallow it, leaving the one-shot timer spent.
+    pass
+
+
+def _on_cpu_budget(signum, frame):  # pragma: no cover - runs in worker processes
+    raise CpuBudgetExceeded()
+
+
+def _init_worker() -> None:  # pragma: no cover - runs in worker processes
+    if hasattr(signal, "setitimer"):
+        signal.signal(signal.SIGPROF, _on_cpu_budget)
+
+
+def _run_limited(func: Callable[..., Any], cpu_seconds: float, *args: Any) -> Any:
+    """Call ``func`` in a worker, giving up once it has burned ``cpu_seconds`` of CPU."""
+    limited = cpu_seconds > 0 and hasattr(signal, "setitimer")
+    if limited:
+        signal.setitimer(signal.ITIMER_PROF, cpu_seconds)
+    try:
+        return func(*args)
+    except CpuBudgetExceeded:
+        return None
+    finally:
+        if limited:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+
+
+_POOL: ProcessPoolExecutor | None = None
+_SLOTS: asyncio.Semaphore | None = None
+_SLOTS_LOOP: asyncio.AbstractEventLoop | None = None
+
+
+def pool_size() -> int:
+    return settings.extract_workers or os.cpu_count() or 1
+
+
+def start_pool() -> ProcessPoolExecutor:
+    global _POOL
+    if _POOL is None:
+        _POOL = ProcessPoolExecutor(
+            max_workers=pool_size(),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+    return _POOL
+
+
+def shutdown_pool() -> None:
+    global _POOL
+    if _POOL is not None:
+        _POOL.shutdown(wait=False, cancel_futures=True)
+    _POOL = None
+
+
+def _slots() -> asyncio.Semaphore:
+    # Bounds running + queued documents; callers wait here when the pool is saturated.
+    global _SLOTS, _SLOTS_LOOP
+    loop = asyncio.get_running_loop()
+    if _SLOTS is None or _SLOTS_LOOP is not loop:
+        _SLOTS = asyncio.Semaphore(pool_size() + max(0, settings.extract_queue_size))
+        _SLOTS_LOOP = loop
+    return _SLOTS
+
+
+async def run_in_pool(func: Callable[..., Any], *args: Any) -> Any:
+    """Run a picklable CPU-bound ``func`` in the extraction pool.
+
+    Returns ``None`` if the document exceeded its CPU budget or the pool broke
+    (the pool is rebuilt for the next caller).
+    """
+    async with _slots():
+        pool = start_pool()
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(pool, _run_limited, func, settings.extract_cpu_seconds, *args)
+        except BrokenProcessPool:
+            if _POOL is pool:
+                shutdown_pool()
+            return None
@@ -1,18 +1,88 @@
 from __future__ import annotations
 
 import hashlib
-from typing import Any
+from functools import partial
+from typing import Any, AsyncIterator, Iterable, Mapping
 
 import trafilatura
 
+from ..config import settings
+from .dedupe import fingerprint
+from .extraction import run_in_pool
+from .fetcher import get_engine, iter_within
+from .page_cache import get_page_cache
+from .passages import select_passages
+from .pdf_extract import extract_pdf, page_of
 
-def extract_from_url(url: str) -> dict[str, Any]:
-    downloaded = trafilatura.fetch_url(url)
-    if not downloaded:
-        return {"url": url, "title": "", "text": ""}
+
+def extract_from_html(url: str, html: str) -> dict[str, Any]:
     # Trafilatura 2.x returns plain text; metadata extraction varies by version
-    text = trafilatura.extract(downloaded, include_comments=False, include_formatting=False) or ""
-    return {"url": url, "title": "", "text": text}
+    text = trafilatura.extract(html, include_comments=False, include_formatting=False) or ""
+    # Document signature for mirror detection; computed here, in the worker process
+    return {"url": url, "title": "", "text": text, "fingerprint": fingerprint(text) if text else None}
+
+
+async def aextract_from_url(url: str, keywords: Mapping[str, float] | None = None) -> dict[str, Any]:
+    """Fetch ``url`` (through the page cache) and extract its text in the pool.
+
+    PDFs are read page by page until enough pages are relevant to
+    ``keywords``; only PDFs read to the end or to ``pdf_max_pages`` are
+    cached, since an earlier stop is specific to the keywords it stopped for.
+    """
+    cache = get_page_cache()
+    cached = await cache.alookup(url) if cache else None
+    if cached and cached["fresh"]:
+        return cached["extracted"]
+    page = await get_engine().fetch(url, headers=cache.validators(cached) if cached else None)
+    if page and page["status"] == 304 and cached:
+        return await cache.arevalidated_ok(url, cached)
+    if page and page.get("content"):
+        return await _extract_pdf_page(url, page, keywords)
+    if not page or not page.get("text"):
+        return {"url": url, "title": "", "text": ""}
+    extracted = await run_in_pool(extract_from_html, url, page["text"])
+    if not extracted:
+        return {"url": url, "title": "", "text": ""}
+    if cache:
+        await cache.astore(url, page["text"], extracted, page.get("headers"))
+    return extracted
+
+
+async def _extract_pdf_page(url: str, page: dict[str, Any], keywords: Mapping[str, float] | None) -> dict[str, Any]:
+    extracted = await run_in_pool(
+        extract_pdf, url, page["content"], dict(keywords or {}), settings.pdf_max_pages, settings.pdf_target_pages,
+    )
+    if not extracted or not extracted.get("text"):
+        return {"url": url, "title": "", "text": ""}
+    cache = get_page_cache()
+    if cache and extracted.get("complete"):
+        await cache.astore(url, extracted["text"], extracted, page.get("headers"))
+    return extracted
+
+
+async def acached_fingerprint(url: str) -> str | None:
+    """Document signature stored with ``url``'s cached extraction (stale or not).
+
+    A peek: the fetch that follows does the counted lookup.
+    """
+    cache = get_page_cache()
+    meta = await cache.apeek(url) if cache else None
+    return (meta or {}).get("fingerprint")
+
+
+def iter_extracted(
+    urls: Iterable[str],
+    deadline: float | None = None,
+    limit: int | None = None,
+    keywords: Mapping[str, float] | None = None,
+) -> AsyncIterator[tuple[str, Any, BaseException | None, float]]:
+    """Yield ``(url, extracted, error, elapsed)`` for each page as soon as it is done.
+
+    With ``limit``, pages are started in the given (ranked) order, at most
+    ``limit`` at a time. ``keywords`` lets PDF extraction stop early.
+    """
+    func = aextract_from_url if not keywords else partial(aextract_from_url, keywords=keywords)
+    return iter_within(urls, func, deadline, limit=limit)
 
 
 def split_sentences(text: str, limit: int = 2) -> list[str]:
@@ -30,21 +100,24 @@ def split_sentences(text: str, limit: int = 2) -> list[str]:
     return sents
 
 
-def evidence_from_text(url: str, title: str, text: str, keywords: list[str] | None = None, max_quotes: int = 3) -> list[dict]:
+def evidence_from_text(
+    url: str,
+    title: str,
+    text: str,
+    keywords: Mapping[str, float] | list[str] | None = None,
+    max_quotes: int = 3,
+    pages: list[dict] | None = None,
+) -> list[dict]:
+    """Quote up to ``max_quotes`` passages of ``text`` as evidence items.
+
+    With ``pages`` (from PDF extraction) each item's ``selector`` records
+    the page its passage was found on, as ``page=N``.
+    """
     if not text:
         return []
     quotes: list[str] = []
     if keywords:
-        lowered = text.lower()
-        for kw in keywords:
-            idx = lowered.find(kw.lower())
-            if idx != -1:
-                start = max(0, idx - 160)
-                end = min(len(text), idx + 240)
-                excerpt = text[start:end].strip()
-                quotes.append(excerpt)
-                if len(quotes) >= max_quotes:
-                    break
+        quotes = select_passages(text, keywords, max_passages=max_quotes)
     # Fallback to first sentences
     if not quotes:
         quotes = split_sentences(text, limit=max_quotes)
@@ -52,11 +125,14 @@ def evidence_from_text(url: str, title: str, text: str, keywords: list[str] | No
     out: list[dict] = []
     for q in quotes:
         checksum = hashlib.sha256((url + q).encode("utf-8")).hexdigest()[:16]
+        page = page_of(pages, text, q) if pages else None
         out.append({
             "url": url,
             "title": title,
             "quote": q,
-            "selector": None,
+            "selector": f"page={page}" if page else None,
             "checksum": checksum,
+            # URL-independent, so the same passage on two sites can be matched
+            "fingerprint": fingerprint(q),
         })
     return out
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import asyncio
+import codecs
+import time
+from typing import Any, AsyncIterator, Iterable
+
+import httpx
+
+from ..config import settings
+from .page_cache import normalize_url
+from .pdf_extract import is_pdf
+from .politeness import DomainScheduler, RobotsCache
+
+_USER_AGENT = "Mozilla/5.0 (compatible; crewAI-research-backend/0.1)"
+# Media types we can extract text from; anything else is dropped at the headers
+TEXT_TYPES = frozenset({"text/html", "application/xhtml+xml", "text/plain", "application/xml", "text/xml"})
+_ACCEPT = "text/html,application/xhtml+xml,application/pdf;q=0.9,text/plain;q=0.8,*/*;q=0.1"
+
+
+def media_type(headers: httpx.Headers | dict[str, str]) -> str:
+    """``text/html`` for ``Content-Type: text/html; charset=utf-8``; "" when absent."""
+    return (headers.get("content-type") or "").split(";", 1)[0].strip().lower()
+
+
+class FetchEngine:
+    """Concurrent page downloader sharing one pooled ``httpx.AsyncClient``.
+
+    A global semaphore bounds the number of in-flight downloads. URLs are
+    canonicalized first, checked against the site's robots.txt (itself
+    fetched under the same pacing, capped at ``robots_max_bytes``) and paced
+    by a ``DomainScheduler`` (per-domain cap and delay). The domain slot is
+    taken before the global one, so requests waiting out a site's delay do
+    not hold up downloads from other sites.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        per_host_limit: int | None = None,
+        timeout: float | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        max_bytes: int | None = None,
+        domain_delay: float | None = None,
+        respect_robots: bool | None = None,
+    ):
+        self._max_concurrency = max_concurrency or settings.fetch_max_concurrency
+        self._per_host_limit = per_host_limit or settings.fetch_per_host_limit
+        self._timeout = timeout or settings.fetch_timeout
+        self._max_bytes = max_bytes or settings.fetch_max_bytes
+        self._pdf = settings.pdf_enabled
+        self._client = httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(self._timeout),
+            limits=httpx.Limits(
+                max_connections=self._max_concurrency,
+                max_keepalive_connections=self._max_concurrency,
+            ),
+            follow_redirects=True,
+            headers={"User-Agent": _USER_AGENT, "Accept": _ACCEPT},
+        )
+        self._global = asyncio.Semaphore(self._max_concurrency)
+        self._domains = DomainScheduler(
+            self._per_host_limit,
+            settings.fetch_domain_delay if domain_delay is None else domain_delay,
+        )
+        respect_robots = settings.robots_enabled if respect_robots is None else respect_robots
+        self._robots = RobotsCache(self._fetch_robots) if respect_robots else None
+        # Responses dropped before/while reading the body, by reason
+        self.rejected = {"content_type": 0, "too_large": 0}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client
+
+    async def fetch(self, url: str, headers: dict[str, str] | None = None) -> dict[str, Any] | None:
+        """Download ``url``; returns ``None`` on network errors, error status,
+        when robots.txt disallows it or when the body is not worth reading.
+
+        The response is streamed: an unsupported ``Content-Type`` or a
+        ``Content-Length`` above ``max_bytes`` is rejected from the headers
+        alone, and a body that grows past ``max_bytes`` is abandoned
+        mid-stream, so oversized PDFs and binaries are never buffered.
+        PDFs (when PDF extraction is available) come back as raw ``content``
+        bytes, capped by ``pdf_max_bytes``, with an empty ``text``.
+        ``headers`` may carry conditional-request validators, in which case a
+        304 response comes back with an empty ``text``. The returned ``url``
+        is the canonical one.
+        """
+        url = normalize_url(url)
+        delay = None
+        if self._robots is not None:
+            if not await self._robots.allowed(url):
+                return None
+            delay = self._robots.crawl_delay(url)
+        async with self._domains.slot(url, delay), self._global:
+            try:
+                async with self._client.stream("GET", url, headers=headers) as resp:
+                    if resp.status_code >= 400:
+                        return None
+                    ctype = media_type(resp.headers)
+                    if resp.status_code == 304:
+                        body: str | bytes | None = ""
+                    elif self._pdf and is_pdf(ctype, url):
+                        body = await self._read_bytes(resp, settings.pdf_max_bytes)
+                    elif not ctype or ctype in TEXT_TYPES:
+                        body = await self._read_text(resp)
+                    else:
+                        self.rejected["content_type"] += 1
+                        body = None
+            except httpx.HTTPError:
+                return None
+        if body is None:
+            return None
+        page = {"url": url, "status": resp.status_code, "headers": dict(resp.headers), "media_type": ctype, "text": ""}
+        if isinstance(body, bytes):
+            page["content"] = body
+        else:
+            page["text"] = body
+        return page
+
+    async def _fetch_robots(self, url: str) -> str | None:
+        """robots.txt body, paced like any other request to its domain and size-capped."""
+        async with self._domains.slot(url), self._global:
+            try:
+                async with self._client.stream("GET", url) as resp:
+                    if resp.status_code >= 400:
+                        return None
+                    return await self._read_text(resp, settings.robots_max_bytes)
+            except httpx.HTTPError:
+                return None
+
+    def _too_large(self, resp: httpx.Response, limit: int) -> bool:
+        length = resp.headers.get("content-length", "")
+        if length.isdigit() and int(length) > limit:
+            self.rejected["too_large"] += 1
+            return True
+        return False
+
+    async def _read_bytes(self, resp: httpx.Response, limit: int) -> bytes | None:
+        """Collect ``resp``'s raw body; ``None`` once it exceeds ``limit``."""
+        if self._too_large(resp, limit):
+            return None
+        buf = bytearray()
+        async for chunk in resp.aiter_bytes():
+            buf += chunk
+            if len(buf) > limit:
+                self.rejected["too_large"] += 1
+                return None
+        return bytes(buf)
+
+    async def _read_text(self, resp: httpx.Response, limit: int | None = None) -> str | None:
+        """Decode ``resp``'s body incrementally; ``None`` if rejected."""
+        limit = limit or self._max_bytes
+        if self._too_large(resp, limit):
+            return None
+        try:
+            decoder = codecs.getincrementaldecoder(resp.encoding or "utf-8")(errors="replace")
+        except LookupError:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        parts: list[str] = []
+        received = 0
+        async for chunk in resp.aiter_bytes():
+            received += len(chunk)
+            if received > limit:
+                self.rejected["too_large"] += 1
+                return None
+            parts.append(decoder.decode(chunk))
+        parts.append(decoder.decode(b"", final=True))
+        return "".join(parts)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+async def iter_within(
+    keys: Iterable[str],
+    func,
+    deadline: float | None = None,
+    limit: int | None = None,
+) -> AsyncIterator[tuple[str, Any, BaseException | None, float]]:
+    """Run ``func(key)`` for each key concurrently, yielding as each call finishes.
+
+    Items are ``(key, value, error, elapsed)``.
+    With ``limit``, at most that many calls run at once and the rest start in
+    key order as slots free up, so a consumer that stops early never starts
+    the tail. Calls not finished by ``deadline`` are cancelled (or never
+    started) and yielded with an ``asyncio.TimeoutError``. ``elapsed`` is
+    seconds since iteration began. Closing the iterator cancels running calls.
+    """
+    started = time.monotonic()
+    queue = list(dict.fromkeys(keys))
+    queue.reverse()
+    tasks: dict[asyncio.Task, str] = {}
+    end = None if deadline is None else started + deadline
+
+    def _launch() -> None:
+        while queue and (limit is None or len(tasks) < limit):
+            key = queue.pop()
+            tasks[asyncio.create_task(func(key))] = key
+
+    try:
+        _launch()
+        while tasks:
+            timeout = None if end is None else max(0.0, end - time.monotonic())
+            done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for t in done:
+                key = tasks.pop(t)
+                elapsed = time.monotonic() - started
+                if t.cancelled():
+                    yield key, None, asyncio.CancelledError(), elapsed
+                elif t.exception() is not None:
+                    yield key, None, t.exception(), elapsed
+                else:
+                    yield key, t.result(), None, elapsed
+            _launch()
+        pending = list(tasks)
+        for t in pending:
+            t.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        for key in [*(tasks[t] for t in pending), *reversed(queue)]:
+            yield key, None, asyncio.TimeoutError(), time.monotonic() - started
+        tasks.clear()
+    finally:
+        # Consumer stopped early (e.g. client disconnected or enough evidence)
+        for t in tasks:
+            t.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+_ENGINE: FetchEngine | None = None
+_ENGINE_LOOP: asyncio.AbstractEventLoop | None = None
+
+
+def get_engine() -> FetchEngine:
+    """Return the process-wide engine, rebuilding it if the event loop changed."""
+    global _ENGINE, _ENGINE_LOOP
+    loop = asyncio.get_running_loop()
+    if _ENGINE is None or _ENGINE_LOOP is not loop or _ENGINE.client.is_closed:
+        _ENGINE = FetchEngine()
+        _ENGINE_LOOP = loop
+    return _ENGINE
+
+
+async def close_engine() -> None:
+    global _ENGINE, _ENGINE_LOOP
+    if _ENGINE is not None:
+        await _ENGINE.aclose()
+    _ENGINE = None
+    _ENGINE_LOOP = None
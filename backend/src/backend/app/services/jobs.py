@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Iterable
+
+from fastapi import FastAPI
+
+from ..config import settings
+from .orchestrator import STAGE_PROGRESS, Orchestrator
+from .storage import storage_root
+
+
+class JobQueue:
+    """Persistent research job queue in a WAL-mode SQLite file.
+
+    Workers claim jobs atomically and heartbeat while running; a job whose
+    heartbeat is older than the lease (e.g. its worker crashed) is put back
+    on the queue, so batches resume after a restart. Every claim counts as an
+    attempt, so a job that keeps killing its worker ends up failed.
+    """
+
+    def __init__(self, path: str | Path, lease_seconds: float = 300.0, max_attempts: int = 3):
+        self._path = str(path)
+        self._lease = lease_seconds
+        self._max_attempts = max_attempts
+        self._local = threading.local()
+        self._conn().executescript(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY, batch_id TEXT NOT NULL, topic TEXT NOT NULL, constraints TEXT,"
+            " status TEXT NOT NULL, stage TEXT, progress REAL NOT NULL DEFAULT 0, run_id TEXT,"
+            " error TEXT, result TEXT, attempts INTEGER NOT NULL DEFAULT 0,"
+            " created_at REAL NOT NULL, updated_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);"
+            "CREATE INDEX IF NOT EXISTS jobs_batch ON jobs (batch_id);"
+        )
+
+    @property
+    def lease_seconds(self) -> float:
+        return self._lease
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            Path(self._path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self._path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, topics: Iterable[str], constraints: dict | None = None, batch_id: str | None = None) -> tuple[str, list[dict]]:
+        batch_id = batch_id or uuid.uuid4().hex[:12]
+        now = time.time()
+        rows = [
+            (uuid.uuid4().hex[:12], batch_id, t.strip(), json.dumps(constraints or {}), "queued", now + i * 1e-6, now)
+            for i, t in enumerate(topics)
+            if t and t.strip()
+        ]
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT INTO jobs (id, batch_id, topic, constraints, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return batch_id, [{"job_id": r[0], "topic": r[2]} for r in rows]
+
+    def claim(self, batch_id: str | None = None) -> dict | None:
+        """Atomically take the oldest queued job (optionally from one batch)."""
+        self.requeue_stale()
+        where, args = ("status = 'queued'", [])
+        if batch_id:
+            where, args = ("status = 'queued' AND batch_id = ?", [batch_id])
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                f"UPDATE jobs SET status = 'running', attempts = attempts + 1, updated_at = ?"
+                f" WHERE id = (SELECT id FROM jobs WHERE {where} ORDER BY created_at LIMIT 1) RETURNING *",
+                [time.time(), *args],
+            ).fetchone()
+        return self._row(row) if row else None
+
+    def heartbeat(self, job_id: str, stage: str | None = None, progress: float | None = None, run_id: str | None = None) -> None:
+        self._conn().execute(
+            "UPDATE jobs SET updated_at = ?, stage = COALESCE(?, stage), progress = MAX(progress, COALESCE(?, progress)),"
+            " run_id = COALESCE(?, run_id) WHERE id = ?",
+            (time.time(), stage, progress, run_id, job_id),
+        )
+
+    def complete(self, job_id: str, result: dict) -> None:
+        self._conn().execute(
+            "UPDATE jobs SET status = 'done', stage = 'result', progress = 1, error = NULL, result = ?, updated_at = ? WHERE id = ?",
+            (json.dumps(result, ensure_ascii=False, default=str), time.time(), job_id),
+        )
+
+    def fail(self, job_id: str, error: str) -> None:
+        # Retry until max_attempts, then leave the job failed
+        self._conn().execute(
+            "UPDATE jobs SET status = CASE WHEN attempts < ? THEN 'queued' ELSE 'failed' END, error = ?, updated_at = ? WHERE id = ?",
+            (self._max_attempts, error, time.time(), job_id),
+        )
+
+    def release(self, job_id: str) -> None:
+        """Hand a running job back to the queue (e.g. on graceful shutdown)."""
+        self._conn().execute(
+            "UPDATE jobs SET status = 'queued', attempts = MAX(0, attempts - 1), updated_at = ? WHERE id = ? AND status = 'running'",
+            (time.time(), job_id),
+        )
+
+    def requeue_stale(self) -> int:
+        """Requeue running jobs whose lease expired; fail those out of attempts."""
+        cur = self._conn().execute(
+            "UPDATE jobs SET status = CASE WHEN attempts < ? THEN 'queued' ELSE 'failed' END,"
+            " error = CASE WHEN attempts < ? THEN error ELSE 'worker lost: lease expired' END, updated_at = ?"
+            " WHERE status = 'running' AND updated_at < ?",
+            (self._max_attempts, self._max_attempts, time.time(), time.time() - self._lease),
+        )
+        return cur.rowcount
+
+    def batch(self, batch_id: str, with_results: bool = False) -> dict | None:
+        rows = self._conn().execute("SELECT * FROM jobs WHERE batch_id = ? ORDER BY created_at", (batch_id,)).fetchall()
+        if not rows:
+            return None
+        jobs = [self._row(r, with_result=with_results) for r in rows]
+        counts: dict[str, int] = {}
+        for j in jobs:
+            counts[j["status"]] = counts.get(j["status"], 0) + 1
+        return {
+            "batch_id": batch_id,
+            "total": len(jobs),
+            "counts": counts,
+            "progress": round(sum(j["progress"] for j in jobs) / len(jobs), 3),
+            "finished": counts.get("done", 0) + counts.get("failed", 0) == len(jobs),
+            "jobs": jobs,
+        }
+
+    @staticmethod
+    def _row(row: sqlite3.Row, with_result: bool = False) -> dict:
+        out = {
+            "job_id": row["id"],
+            "batch_id": row["batch_id"],
+            "topic": row["topic"],
+            "constraints": json.loads(row["constraints"] or "{}"),
+            "status": row["status"],
+            "stage": row["stage"],
+            "progress": row["progress"],
+            "run_id": row["run_id"],
+            "error": row["error"],
+            "attempts": row["attempts"],
+        }
+        if with_result:
+            out["result"] = json.loads(row["result"]) if row["result"] else None
+        return out
+
+
+class BatchRunner:
+    """Pool of async workers draining the job queue through the pipeline.
+
+    Queue calls run in threads so SQLite waits never block the event loop.
+    Each running job heartbeats on a timer (a third of the lease) besides
+    on stage events, so a long stage is not mistaken for a dead worker.
+    """
+
+    def __init__(self, app: FastAPI, queue: JobQueue, workers: int, batch_id: str | None = None, poll_interval: float = 1.0):
+        self._app = app
+        self._queue = queue
+        self._workers = workers
+        self._batch_id = batch_id
+        self._poll = poll_interval
+        self._tasks: list[asyncio.Task] = []
+        self._wake = asyncio.Event()
+        self._stop_when_idle = False
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self._workers)]
+
+    def notify(self) -> None:
+        self._wake.set()
+
+    async def stop(self) -> None:
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def drain(self) -> None:
+        """Run until no queued jobs remain (CLI mode)."""
+        self._stop_when_idle = True
+        if not self._tasks:
+            self.start()
+        await asyncio.gather(*self._tasks)
+
+    async def _worker(self) -> None:
+        while True:
+            job = await asyncio.to_thread(self._queue.claim, self._batch_id)
+            if job is None:
+                if self._stop_when_idle:
+                    return
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self._poll)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            keepalive = asyncio.create_task(self._keepalive(job["job_id"]))
+            try:
+                await self._run(job)
+            except asyncio.CancelledError:
+                await asyncio.to_thread(self._queue.release, job["job_id"])
+                raise
+            except Exception as exc:
+                await asyncio.to_thread(self._queue.fail, job["job_id"], str(exc) or type(exc).__name__)
+            finally:
+                keepalive.cancel()
+
+    async def _keepalive(self, job_id: str) -> None:
+        interval = max(0.05, self._queue.lease_seconds / 3)
+        while True:
+            await asyncio.sleep(interval)
+            await asyncio.to_thread(self._queue.heartbeat, job_id)
+
+    async def _run(self, job: dict) -> None:
+        orch = Orchestrator(self._app)
+        result: dict[str, Any] | None = None
+        async for event, data in orch.run(job["topic"], job["constraints"], run_id=job["run_id"]):
+            if event in STAGE_PROGRESS:
+                await asyncio.to_thread(
+                    self._queue.heartbeat, job["job_id"], stage=event, progress=STAGE_PROGRESS[event], run_id=data.get("run_id"),
+                )
+            if event == "result":
+                result = data
+        if result is None:
+            raise RuntimeError("pipeline finished without a result")
+        await asyncio.to_thread(self._queue.complete, job["job_id"], result)
+
+
+_QUEUE: JobQueue | None = None
+_RUNNER: BatchRunner | None = None
+
+
+def get_queue() -> JobQueue:
+    global _QUEUE
+    if _QUEUE is None:
+        _QUEUE = JobQueue(
+            settings.batch_db_path or storage_root() / "jobs.db",
+            lease_seconds=settings.batch_lease_seconds,
+            max_attempts=settings.batch_max_attempts,
+        )
+    return _QUEUE
+
+
+def start_runner(app: FastAPI) -> BatchRunner | None:
+    global _RUNNER
+    if settings.batch_workers > 0 and _RUNNER is None:
+        _RUNNER = BatchRunner(app, get_queue(), workers=settings.batch_workers)
+        _RUNNER.start()
+    return _RUNNER
+
+
+async def stop_runner() -> None:
+    global _RUNNER
+    if _RUNNER is not None:
+        await _RUNNER.stop()
+    _RUNNER = None
+
+
+def notify_runner() -> None:
+    if _RUNNER is not None:
+        _RUNNER.notify()
@@ -1,8 +1,18 @@
 from __future__ import annotations
 
-from typing import Any, List
+import asyncio
+import hashlib
+import json
+import random
+from typing import Any, AsyncIterator, Awaitable, Callable, List
+
+import httpx
+from openai import APIConnectionError, InternalServerError, RateLimitError
 
 from ..config import settings
+from .diskcache import DiskCache
+from .packing import item_tokens, pack_evidence
+from .storage import cache_dir
 
 _HEADING_KEYS = {"heading", "title", "name", "label"}
 _CONTENT_KEYS = {
@@ -21,60 +31,306 @@ _CONTENT_KEYS = {
     "bullet",
 }
 
+_SYSTEM_PROMPT = "You are a careful analyst. Only use provided evidence."
+_PROMPT_INSTRUCTIONS = (
+    "You are a research assistant. Given evidence quotes with sources, write a concise Executive Summary and 3-6 Key Findings, each grounded in the evidence (no hallucinations). "
+    "Return JSON with keys: sections=[{heading, content}]."
+)
+_MAP_INSTRUCTIONS = (
+    "Summarize the findings in these evidence quotes as concise bullet points. "
+    "Keep the [n] numbers of the quotes each point relies on. Use only the provided evidence."
+)
+_REDUCE_INSTRUCTIONS = (
+    "You are a research assistant. Given partial summaries of evidence quotes (citing quotes by [n]), write a concise Executive Summary and 3-6 Key Findings, each grounded in the summaries and keeping their [n] citations (no hallucinations). "
+    "Return JSON with keys: sections=[{heading, content}]."
+)
+# Transient API errors; APITimeoutError is an APIConnectionError
+_RETRYABLE = (APIConnectionError, RateLimitError, InternalServerError)
+
+_CLIENT: Any = None
+_CLIENT_LOOP: asyncio.AbstractEventLoop | None = None
+_SLOTS: asyncio.Semaphore | None = None
+_SLOTS_LOOP: asyncio.AbstractEventLoop | None = None
+_RESPONSE_CACHE: DiskCache | None = None
+_CACHE_COUNTERS = {"hits": 0, "misses": 0}
+
+
+def _llm_enabled() -> bool:
+    return settings.llm_provider.lower() == "openai" and bool(settings.openai_api_key)
+
+
+def get_llm_client() -> Any:
+    """Shared ``AsyncOpenAI`` client (one connection pool per event loop), or ``None``."""
+    global _CLIENT, _CLIENT_LOOP
+    if not _llm_enabled():
+        return None
+    try:
+        from openai import AsyncOpenAI
+    except Exception:  # pragma: no cover
+        return None
+    loop = asyncio.get_running_loop()
+    if _CLIENT is None or _CLIENT_LOOP is not loop:
+        http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.llm_timeout),
+            limits=httpx.Limits(max_connections=settings.llm_max_concurrency, max_keepalive_connections=settings.llm_max_concurrency),
+        )
+        # Retries are handled here so streaming and backoff share one policy.
+        _CLIENT = AsyncOpenAI(api_key=settings.openai_api_key, base_url=settings.openai_base_url or None, http_client=http_client, max_retries=0)
+        _CLIENT_LOOP = loop
+    return _CLIENT
+
+
+async def close_llm_client() -> None:
+    global _CLIENT, _CLIENT_LOOP
+    if _CLIENT is not None:
+        await _CLIENT.close()
+    _CLIENT = None
+    _CLIENT_LOOP = None
+
 
-def synthesize_with_llm(run_id: str, evidence: List[dict]) -> dict:
-    if settings.llm_provider.lower() == "openai" and settings.openai_api_key:
+def _slots() -> asyncio.Semaphore:
+    global _SLOTS, _SLOTS_LOOP
+    loop = asyncio.get_running_loop()
+    if _SLOTS is None or _SLOTS_LOOP is not loop:
+        _SLOTS = asyncio.Semaphore(settings.llm_max_concurrency)
+        _SLOTS_LOOP = loop
+    return _SLOTS
+
+
+async def _with_retry(make_call: Callable[[], Awaitable[Any]]) -> Any:
+    """Await ``make_call()``, retrying transient API errors with jittered exponential backoff."""
+    attempt = 0
+    while True:
         try:
-            from openai import OpenAI
-        except Exception:  # pragma: no cover
-            return _fallback(run_id, evidence)
-
-        client = OpenAI(api_key=settings.openai_api_key, base_url=settings.openai_base_url or None)
-        quotes = []
-        for i, e in enumerate(evidence[:10], start=1):
-            src = e.get("url", "")
-            quotes.append(f"[{i}] {e.get('quote','').strip()}\nSource: {src}")
-        prompt = (
-            "You are a research assistant. Given evidence quotes with sources, write a concise Executive Summary and 3-6 Key Findings, each grounded in the evidence (no hallucinations). "
-            "Return JSON with keys: sections=[{heading, content}]."
-            "\n\nEvidence:\n" + "\n\n".join(quotes)
-        )
+            return await make_call()
+        except _RETRYABLE:
+            if attempt >= settings.llm_max_retries:
+                raise
+            delay = settings.llm_retry_base_delay * (2 ** attempt)
+            await asyncio.sleep(delay + random.uniform(0, delay))
+            attempt += 1
+
+
+def _response_cache() -> DiskCache | None:
+    global _RESPONSE_CACHE
+    if settings.llm_cache_max_bytes <= 0:
+        return None
+    if _RESPONSE_CACHE is None:
+        _RESPONSE_CACHE = DiskCache(cache_dir("llm"), max_bytes=settings.llm_cache_max_bytes)
+    return _RESPONSE_CACHE
+
+
+def _evidence_checksum(e: dict) -> str:
+    # Same scheme as fetch_extract.evidence_from_text for items that lack one
+    return e.get("checksum") or hashlib.sha256((e.get("url", "") + e.get("quote", "")).encode("utf-8")).hexdigest()[:16]
+
+
+def response_cache_key(messages: List[dict], evidence: List[dict], instructions: str = _PROMPT_INSTRUCTIONS) -> str:
+    """Canonical key for a synthesis prompt.
+
+    Built from the model, temperature, system prompt, the prompt instructions
+    and the ordered checksums of the evidence that went into the prompt.
+    """
+    canonical = json.dumps({
+        "model": settings.llm_model,
+        "temperature": settings.llm_temperature,
+        "system": messages[0]["content"],
+        "instructions": instructions,
+        "evidence": [_evidence_checksum(e) for e in evidence],
+    }, sort_keys=True)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def response_cache_stats() -> dict[str, Any]:
+    cache = _response_cache()
+    lookups = _CACHE_COUNTERS["hits"] + _CACHE_COUNTERS["misses"]
+    return {
+        **_CACHE_COUNTERS,
+        "hit_rate": round(_CACHE_COUNTERS["hits"] / lookups, 3) if lookups else 0.0,
+        "disk": cache.stats() if cache else None,
+    }
+
+
+def _build_messages(evidence: List[dict]) -> List[dict]:
+    quotes = []
+    for i, e in enumerate(evidence, start=1):
+        src = e.get("url", "")
+        quotes.append(f"[{i}] {e.get('quote','').strip()}\nSource: {src}")
+    prompt = _PROMPT_INSTRUCTIONS + "\n\nEvidence:\n" + "\n\n".join(quotes)
+    return [
+        {"role": "system", "content": _SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _parse_completion(run_id: str, content: str, evidence: List[dict], packing: dict | None = None) -> dict:
+    # Try to coerce to JSON (handle ```json fenced blocks)
+    text = content.strip()
+    if text.startswith("```"):
+        # Find first fenced block
+        fence = "```"
         try:
-            completion = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are a careful analyst. Only use provided evidence."},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.2,
-            )
-            content = completion.choices[0].message.content or ""
-            # Try to coerce to JSON (handle ```json fenced blocks)
-            import json
-            text = content.strip()
-            if text.startswith("```"):
-                # Find first fenced block
-                fence = "```"
-                try:
-                    start = text.index(fence) + len(fence)
-                    # optional language tag
-                    nl = text.find("\n", start)
-                    payload = text[nl + 1 : text.rfind(fence)] if nl != -1 and text.rfind(fence) != -1 else text
-                    text = payload.strip()
-                except Exception:
-                    pass
-            try:
-                obj = json.loads(text)
-            except Exception:
-                sections = _normalize_sections(None, text, evidence)
-            else:
-                sections = _normalize_sections(obj, text, evidence)
-            return {"run_id": run_id, "sections": sections, "quality_metrics": {"coverage": round(len(evidence) / max(1, len(set(e.get('url') for e in evidence))), 2)}}
+            start = text.index(fence) + len(fence)
+            # optional language tag
+            nl = text.find("\n", start)
+            payload = text[nl + 1 : text.rfind(fence)] if nl != -1 and text.rfind(fence) != -1 else text
+            text = payload.strip()
         except Exception:
-            return _fallback(run_id, evidence)
+            pass
+    try:
+        obj = json.loads(text)
+    except Exception:
+        sections = _normalize_sections(None, text, evidence)
+    else:
+        sections = _normalize_sections(obj, text, evidence)
+    metrics: dict[str, Any] = {"coverage": round(len(evidence) / max(1, len(set(e.get('url') for e in evidence))), 2)}
+    if packing is not None:
+        metrics["packing"] = packing
+    return {"run_id": run_id, "sections": sections, "quality_metrics": metrics}
+
+
+def _build_map_messages(chunk: List[dict], offset: int) -> List[dict]:
+    quotes = []
+    for i, e in enumerate(chunk, start=offset + 1):
+        quotes.append(f"[{i}] {e.get('quote','').strip()}\nSource: {e.get('url', '')}")
+    prompt = _MAP_INSTRUCTIONS + "\n\nEvidence:\n" + "\n\n".join(quotes)
+    return [
+        {"role": "system", "content": _SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _build_reduce_messages(summaries: List[str]) -> List[dict]:
+    parts = [f"Part {i}:\n{text.strip()}" for i, text in enumerate(summaries, start=1) if text.strip()]
+    prompt = _REDUCE_INSTRUCTIONS + "\n\nPartial summaries:\n" + "\n\n".join(parts)
+    return [
+        {"role": "system", "content": _SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _chunk_evidence(evidence: List[dict], chunk_tokens: int) -> List[List[dict]]:
+    chunks: List[List[dict]] = []
+    current: List[dict] = []
+    used = 0
+    for e in evidence:
+        cost = item_tokens(e)
+        if current and used + cost > chunk_tokens:
+            chunks.append(current)
+            current, used = [], 0
+        current.append(e)
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+async def _stream_completion(client: Any, messages: List[dict], key: str) -> AsyncIterator[str]:
+    """Yield completion tokens, serving and filling the response cache."""
+    cache = _response_cache()
+    cached = await asyncio.to_thread(cache.get, key) if cache else None
+    if cached is not None:
+        _CACHE_COUNTERS["hits"] += 1
+        yield cached["content"]
+        return
+    _CACHE_COUNTERS["misses"] += 1
+    parts: List[str] = []
+    async with _slots():
+        stream = await _with_retry(lambda: client.chat.completions.create(
+            model=settings.llm_model,
+            messages=messages,
+            temperature=settings.llm_temperature,
+            stream=True,
+        ))
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                parts.append(delta)
+                yield delta
+    content = "".join(parts)
+    if cache and content:
+        await asyncio.to_thread(cache.set, key, {"content": content})
+
+
+async def _summarize_chunks(client: Any, chunks: List[List[dict]]) -> AsyncIterator[tuple[str, Any]]:
+    """Map step: summarize chunks concurrently, yielding progress then ``("summaries", [...])``."""
+    limit = asyncio.Semaphore(settings.synthesis_map_concurrency)
+    offsets = [sum(len(c) for c in chunks[:i]) for i in range(len(chunks))]
+
+    async def _one(i: int) -> tuple[int, str]:
+        messages = _build_map_messages(chunks[i], offsets[i])
+        key = response_cache_key(messages, chunks[i], _MAP_INSTRUCTIONS)
+        async with limit:
+            return i, "".join([t async for t in _stream_completion(client, messages, key)])
+
+    tasks = [asyncio.create_task(_one(i)) for i in range(len(chunks))]
+    summaries = [""] * len(chunks)
+    try:
+        for done, fut in enumerate(asyncio.as_completed(tasks), start=1):
+            i, text = await fut
+            summaries[i] = text
+            yield "progress", f"Summarized evidence chunk {done}/{len(chunks)}"
+    finally:
+        for t in tasks:
+            t.cancel()
+    yield "summaries", summaries
+
+
+async def stream_synthesis(run_id: str, evidence: List[dict], topic: str | None = None) -> AsyncIterator[tuple[str, Any]]:
+    """Yield ``("token", text)`` as the model streams, then ``("result", synthesis)``.
+
+    Evidence that fits the token budget is synthesized in one prompt. Larger
+    sets (``synthesis_mode`` auto/map_reduce) are split into chunks that are
+    summarized concurrently and then reduced into the final sections, with
+    ``("progress", message)`` events for the map step.
+    Without a configured LLM (or on failure) only the heuristic result is yielded.
+    """
+    client = get_llm_client()
+    if client is None:
+        yield "result", _fallback(run_id, evidence)
+        return
+    mode = settings.synthesis_mode.lower()
+    if mode == "single":
+        included, packing = pack_evidence(evidence, topic, budget=settings.synthesis_token_budget)
+    else:
+        included, packing = pack_evidence(evidence, topic, budget=settings.synthesis_max_evidence_tokens)
+        if mode != "map_reduce" and packing["estimated_tokens"] <= settings.synthesis_token_budget:
+            mode = "single"
+        else:
+            mode = "map_reduce"
+    packing["mode"] = mode
+
+    parts: List[str] = []
+    try:
+        if mode == "map_reduce":
+            chunks = _chunk_evidence(included, settings.synthesis_chunk_tokens)
+            packing["chunks"] = len(chunks)
+            summaries: List[str] = []
+            async for event, data in _summarize_chunks(client, chunks):
+                if event == "summaries":
+                    summaries = data
+                else:
+                    yield event, data
+            messages = _build_reduce_messages(summaries)
+            key = response_cache_key(messages, included, _REDUCE_INSTRUCTIONS)
+        else:
+            messages = _build_messages(included)
+            key = response_cache_key(messages, included)
+        async for token in _stream_completion(client, messages, key):
+            parts.append(token)
+            yield "token", token
+    except Exception:
+        yield "result", _fallback(run_id, evidence)
+        return
+    yield "result", _parse_completion(run_id, "".join(parts), evidence, packing)
+
 
-    # Default fallback
-    return _fallback(run_id, evidence)
+async def synthesize_with_llm(run_id: str, evidence: List[dict], topic: str | None = None) -> dict:
+    result: dict = {}
+    async for event, data in stream_synthesis(run_id, evidence, topic=topic):
+        if event == "result":
+            result = data
+    return result
 
 
 def _fallback(run_id: str, evidence: List[dict]) -> dict:
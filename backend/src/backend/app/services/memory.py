@@ -1,14 +1,412 @@
 from __future__ import annotations
 
-from typing import Dict, List
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Protocol
 
-_EVIDENCE: Dict[str, List[dict]] = {}
+from ..config import settings
+from . import artifacts
+from .resp import RespClient
+from .storage import check_run_id, run_dir, run_path, storage_root
+
+_SPILL_FILE = "state.json"
+
+
+class RunStateBackend(Protocol):
+    """Where per-run state lives; ``update`` merges fields into the run.
+
+    Evidence is kept apart from the other fields as an append-only log, so
+    adding a source's quotes never rewrites what is already stored and
+    concurrent writers cannot lose each other's items. ``get_evidence``
+    returns ``None`` when the backend holds nothing for the run.
+    """
+
+    def get(self, run_id: str) -> dict[str, Any]: ...
+
+    def update(self, run_id: str, **fields: Any) -> None: ...
+
+    def get_evidence(self, run_id: str) -> List[dict] | None: ...
+
+    def set_evidence(self, run_id: str, items: List[dict]) -> None: ...
+
+    def append_evidence(self, run_id: str, items: List[dict]) -> None: ...
+
+    def stats(self) -> dict[str, Any]: ...
+
+
+class RunStore:
+    """In-memory run state with LRU, byte and TTL bounds.
+
+    Each run holds its evidence plus stage results (synthesis, title, review,
+    ...). Runs pushed out of memory are spilled to ``run_path(run_id)`` when
+    ``spill`` is on and reloaded lazily on the next access. Sizes are tracked
+    per field and evidence appends only measure the new items, so byte
+    accounting stays linear as a run grows.
+    """
+
+    def __init__(self, max_runs: int, max_bytes: int, ttl: float, spill: bool = True):
+        self._max_runs = max_runs
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._spill = spill
+        self._runs: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._field_sizes: Dict[str, Dict[str, int]] = {}
+        self._touched: Dict[str, float] = {}
+        self._bytes = 0
+        # Helpers run in worker threads (see ``aget_result`` and friends)
+        self._lock = threading.RLock()
+        self.evictions = 0
+        self.spilled = 0
+        self.reloaded = 0
+
+    def get(self, run_id: str) -> dict[str, Any]:
+        with self._lock:
+            return self._get(run_id)
+
+    def _get(self, run_id: str) -> dict[str, Any]:
+        self._expire()
+        state = self._runs.get(run_id)
+        if state is not None:
+            self._runs.move_to_end(run_id)
+            self._touched[run_id] = time.monotonic()
+            return state
+        state = self._load(run_id)
+        if state is None:
+            return {}
+        self.reloaded += 1
+        self._put(run_id, state, state)
+        return state
+
+    def update(self, run_id: str, **fields: Any) -> None:
+        with self._lock:
+            state = dict(self._get(run_id))
+            state.update(fields)
+            self._put(run_id, state, fields)
+
+    def get_evidence(self, run_id: str) -> List[dict] | None:
+        with self._lock:
+            evidence = self._get(run_id).get("evidence")
+            return None if evidence is None else list(evidence)
+
+    def set_evidence(self, run_id: str, items: List[dict]) -> None:
+        self.update(run_id, evidence=list(items))
+
+    def append_evidence(self, run_id: str, items: List[dict]) -> None:
+        with self._lock:
+            state = dict(self._get(run_id))
+            # Extend in place: readers get copies from ``get_evidence``
+            state.setdefault("evidence", []).extend(items)
+            fields = self._field_sizes.setdefault(run_id, {})
+            fields["evidence"] = fields.get("evidence", 2) + sum(_measure(e) + 1 for e in items)
+            self._put(run_id, state, {})
+
+    def _put(self, run_id: str, state: dict[str, Any], changed: dict[str, Any]) -> None:
+        # Only the ``changed`` fields are re-measured
+        fields = self._field_sizes.setdefault(run_id, {})
+        for key, value in changed.items():
+            fields[key] = _measure(value)
+        size = sum(fields.values())
+        self._bytes += size - self._sizes.get(run_id, 0)
+        self._runs[run_id] = state
+        self._runs.move_to_end(run_id)
+        self._sizes[run_id] = size
+        self._touched[run_id] = time.monotonic()
+        # Always keep the run just written, even if it alone exceeds the byte bound.
+        while len(self._runs) > 1 and (len(self._runs) > self._max_runs or self._bytes > self._max_bytes):
+            self._evict(next(iter(self._runs)))
+
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - self._ttl
+        for run_id in [r for r, t in self._touched.items() if t < cutoff]:
+            self._evict(run_id)
+
+    def _evict(self, run_id: str) -> None:
+        state = self._runs.pop(run_id, None)
+        self._bytes -= self._sizes.pop(run_id, 0)
+        self._field_sizes.pop(run_id, None)
+        self._touched.pop(run_id, None)
+        if state is None:
+            return
+        self.evictions += 1
+        if self._spill:
+            path = run_path(run_id) / _SPILL_FILE
+            path.write_text(json.dumps(state, ensure_ascii=False, default=str), encoding="utf-8")
+            self.spilled += 1
+
+    def _load(self, run_id: str) -> dict[str, Any] | None:
+        if not self._spill:
+            return None
+        path = run_dir(run_id) / _SPILL_FILE
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "runs": len(self._runs),
+                "bytes": self._bytes,
+                "max_runs": self._max_runs,
+                "max_bytes": self._max_bytes,
+                "evictions": self.evictions,
+                "spilled": self.spilled,
+                "reloaded": self.reloaded,
+            }
+
+
+def _measure(value: Any) -> int:
+    return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+class SQLiteRunStore:
+    """Run state in a WAL-mode SQLite file, shared by all workers on one host.
+
+    One row per (run, field) so stages only rewrite what they produced, and
+    one row per evidence item so appends are plain inserts.
+    """
+
+    def __init__(self, path: str | Path, ttl: float):
+        self._path = str(path)
+        self._ttl = ttl
+        self._local = threading.local()
+        self._last_sweep = 0.0
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS run_state ("
+            " run_id TEXT NOT NULL, field TEXT NOT NULL, value TEXT NOT NULL, updated_at REAL NOT NULL,"
+            " PRIMARY KEY (run_id, field))"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS run_state_updated ON run_state (updated_at)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS run_evidence ("
+            " seq INTEGER PRIMARY KEY AUTOINCREMENT, run_id TEXT NOT NULL, item TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS run_evidence_run ON run_evidence (run_id, seq)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            Path(self._path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self._path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, run_id: str) -> dict[str, Any]:
+        rows = self._conn().execute("SELECT field, value FROM run_state WHERE run_id = ?", (run_id,)).fetchall()
+        return {field: json.loads(value) for field, value in rows}
+
+    def update(self, run_id: str, **fields: Any) -> None:
+        now = time.time()
+        rows = [(run_id, k, json.dumps(v, ensure_ascii=False, default=str), now) for k, v in fields.items()]
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT INTO run_state (run_id, field, value, updated_at) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (run_id, field) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+                rows,
+            )
+        self._maybe_sweep(now)
+
+    def get_evidence(self, run_id: str) -> List[dict] | None:
+        rows = self._conn().execute("SELECT item FROM run_evidence WHERE run_id = ? ORDER BY seq", (run_id,)).fetchall()
+        return [json.loads(item) for (item,) in rows] if rows else None
+
+    def set_evidence(self, run_id: str, items: List[dict]) -> None:
+        self._write_evidence(run_id, items, replace=True)
+
+    def append_evidence(self, run_id: str, items: List[dict]) -> None:
+        if items:
+            self._write_evidence(run_id, items, replace=False)
+
+    def _write_evidence(self, run_id: str, items: List[dict], replace: bool) -> None:
+        now = time.time()
+        rows = [(run_id, json.dumps(e, ensure_ascii=False, default=str), now) for e in items]
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if replace:
+                conn.execute("DELETE FROM run_evidence WHERE run_id = ?", (run_id,))
+            conn.executemany("INSERT INTO run_evidence (run_id, item, created_at) VALUES (?, ?, ?)", rows)
+        self._maybe_sweep(now)
+
+    def _maybe_sweep(self, now: float) -> None:
+        if now - self._last_sweep > 60:
+            self._last_sweep = now
+            self._sweep(now)
+
+    def _sweep(self, now: float) -> None:
+        # Drop whole runs whose newest field (or evidence item) is older than the TTL
+        with self._conn() as conn:
+            conn.execute(
+                "DELETE FROM run_state WHERE run_id IN ("
+                " SELECT run_id FROM run_state GROUP BY run_id HAVING MAX(updated_at) < ?)",
+                (now - self._ttl,),
+            )
+            conn.execute(
+                "DELETE FROM run_evidence WHERE run_id IN ("
+                " SELECT run_id FROM run_evidence GROUP BY run_id HAVING MAX(created_at) < ?)",
+                (now - self._ttl,),
+            )
+
+    def stats(self) -> dict[str, Any]:
+        conn = self._conn()
+        runs, size = conn.execute("SELECT COUNT(DISTINCT run_id), COALESCE(SUM(LENGTH(value)), 0) FROM run_state").fetchone()
+        items, ev_size = conn.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(item)), 0) FROM run_evidence").fetchone()
+        return {"backend": "sqlite", "runs": runs, "bytes": size + ev_size, "evidence_items": items}
+
+
+class RedisRunStore:
+    """Run state as one Redis hash per run (``run:<id>``) plus a list of
+    evidence items (``run:<id>:evidence``, appended with ``RPUSH``), both
+    expiring after the TTL."""
+
+    def __init__(self, url: str, ttl: float, prefix: str = "run:"):
+        self._client = RespClient(url)
+        self._ttl = max(1, int(ttl))
+        self._prefix = prefix
+
+    def get(self, run_id: str) -> dict[str, Any]:
+        flat = self._client.execute("HGETALL", self._prefix + run_id) or []
+        return {flat[i].decode(): json.loads(flat[i + 1]) for i in range(0, len(flat), 2)}
+
+    def update(self, run_id: str, **fields: Any) -> None:
+        if not fields:
+            return
+        args: list[Any] = []
+        for k, v in fields.items():
+            args.extend([k, json.dumps(v, ensure_ascii=False, default=str)])
+        key = self._prefix + run_id
+        self._client.execute("HSET", key, *args)
+        self._client.execute("EXPIRE", key, self._ttl)
+
+    def _evidence_key(self, run_id: str) -> str:
+        return f"{self._prefix}{run_id}:evidence"
+
+    def get_evidence(self, run_id: str) -> List[dict] | None:
+        items = self._client.execute("LRANGE", self._evidence_key(run_id), 0, -1) or []
+        return [json.loads(item) for item in items] if items else None
+
+    def set_evidence(self, run_id: str, items: List[dict]) -> None:
+        self._client.execute("DEL", self._evidence_key(run_id))
+        self.append_evidence(run_id, items)
+
+    def append_evidence(self, run_id: str, items: List[dict]) -> None:
+        if not items:
+            return
+        key = self._evidence_key(run_id)
+        self._client.execute("RPUSH", key, *(json.dumps(e, ensure_ascii=False, default=str) for e in items))
+        self._client.execute("EXPIRE", key, self._ttl)
+
+    def stats(self) -> dict[str, Any]:
+        return {"backend": "redis", "keys": self._client.execute("DBSIZE")}
+
+
+_STORE: RunStateBackend | None = None
+
+
+def get_store() -> RunStateBackend:
+    global _STORE
+    if _STORE is None:
+        backend = settings.run_state_backend.lower()
+        if backend == "sqlite":
+            path = settings.run_state_sqlite_path or storage_root() / "run_state.db"
+            _STORE = SQLiteRunStore(path, ttl=settings.run_store_ttl)
+        elif backend == "redis":
+            _STORE = RedisRunStore(settings.redis_url, ttl=settings.run_store_ttl)
+        else:
+            _STORE = RunStore(
+                max_runs=settings.run_store_max_runs,
+                max_bytes=settings.run_store_max_bytes,
+                ttl=settings.run_store_ttl,
+                # With artifacts on disk, evicted runs are reloaded from there instead
+                spill=settings.run_store_spill and not settings.run_artifacts_enabled,
+            )
+    return _STORE
 
 
 def set_evidence(run_id: str, evidence: List[dict]) -> None:
-    _EVIDENCE[run_id] = evidence
+    check_run_id(run_id)
+    get_store().set_evidence(run_id, evidence)
+    if settings.run_artifacts_enabled:
+        artifacts.write_evidence(run_id, evidence)
+
+
+def append_evidence(run_id: str, evidence: List[dict]) -> None:
+    """Add newly harvested evidence; both the store and disk append, never rewrite."""
+    check_run_id(run_id)
+    get_store().append_evidence(run_id, list(evidence))
+    if settings.run_artifacts_enabled:
+        artifacts.append_evidence(run_id, evidence)
 
 
 def get_evidence(run_id: str) -> List[dict]:
-    return _EVIDENCE.get(run_id, [])
+    evidence = get_store().get_evidence(run_id)
+    if evidence is None and settings.run_artifacts_enabled:
+        evidence = list(artifacts.iter_evidence(run_id))
+    return evidence or []
+
+
+def set_result(run_id: str, stage: str, data: Any) -> None:
+    check_run_id(run_id)
+    get_store().update(run_id, **{stage: data})
+    if settings.run_artifacts_enabled:
+        artifacts.write_stage(run_id, stage, data)
+
+
+def get_result(run_id: str, stage: str) -> Any:
+    value = get_store().get(run_id).get(stage)
+    if value is None and settings.run_artifacts_enabled:
+        value = artifacts.read_stage(run_id, stage)
+    return value
+
+
+def load_run_state(run_id: str) -> dict[str, Any]:
+    """Run state with anything the store no longer holds filled in from disk.
+
+    Evidence is left out; read it with ``get_evidence`` or stream it with
+    ``artifacts.iter_evidence``.
+    """
+    state = {k: v for k, v in get_store().get(run_id).items() if k != "evidence"}
+    if settings.run_artifacts_enabled:
+        for stage, value in artifacts.load_run(run_id).items():
+            state.setdefault(stage, value)
+    return state
+
+
+# Async variants for request handlers and pipeline stages: the backends
+# block (SQLite, Redis sockets, artifact files), so they run in a thread.
+
+
+async def aset_evidence(run_id: str, evidence: List[dict]) -> None:
+    await asyncio.to_thread(set_evidence, run_id, evidence)
+
+
+async def aappend_evidence(run_id: str, evidence: List[dict]) -> None:
+    await asyncio.to_thread(append_evidence, run_id, evidence)
+
+
+async def aget_evidence(run_id: str) -> List[dict]:
+    return await asyncio.to_thread(get_evidence, run_id)
+
+
+async def aset_result(run_id: str, stage: str, data: Any) -> None:
+    await asyncio.to_thread(set_result, run_id, stage, data)
+
+
+async def aget_result(run_id: str, stage: str) -> Any:
+    return await asyncio.to_thread(get_result, run_id, stage)
+
 
+async def aload_run_state(run_id: str) -> dict[str, Any]:
+    return await asyncio.to_thread(load_run_state, run_id)
@@ -1,41 +1,253 @@
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+import uuid
+from typing import Any, AsyncIterator
 
 import httpx
 from fastapi import FastAPI
 from httpx import ASGITransport
 
+from ..config import settings
+from ...crew.agents.evidence_harvester.api import harvest_stream
+from ...crew.agents.registry import get_agent
+from .llm import stream_synthesis
+from .memory import aappend_evidence, aget_evidence, aget_result, aset_evidence, aset_result
+from .passages import derive_keywords
+from .ranking import rank_candidates
+from .sufficiency import Sufficiency
+from .websearch import merge_results
+
+# Rough completion fraction once each pipeline event has been seen
+STAGE_PROGRESS = {
+    "queries": 0.1,
+    "candidates": 0.25,
+    "evidence": 0.5,
+    "synthesis": 0.8,
+    "title": 0.9,
+    "review": 0.95,
+    "result": 1.0,
+}
+
 
 class Orchestrator:
+    """Runs research stages by calling agents.
+
+    Agents registered in this process are invoked directly; anything else goes
+    over HTTP, to ``settings.agents_base_url`` when set, otherwise to this app.
+    """
+
     def __init__(self, app: FastAPI):
         self._app = app
-        self._client = httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://orchestrator")
 
     async def search(self, topic: str, constraints: dict[str, Any]) -> dict[str, Any]:
         # Call Query Optimizer then Source Scout
-        q = await self._post("/api/v1/agents/query-optimizer/optimize", json={"topic": topic, "constraints": constraints})
-        candidates = await self._post("/api/v1/agents/source-scout/discover", json={"queries": q["optimized_queries"]})
+        q = await self._call("/agents/query-optimizer/optimize", {"topic": topic, "constraints": constraints})
+        candidates = await self._call("/agents/source-scout/discover", {"queries": q["optimized_queries"]})
         return {"optimized_queries": q["optimized_queries"], "candidates": candidates["candidates"]}
 
-    async def gather(self, run_id: str | None, sources: list[dict]) -> dict[str, Any]:
-        payload = {"run_id": run_id, "sources": sources}
-        ev = await self._post("/api/v1/agents/evidence-harvester/harvest", json=payload)
+    async def gather(self, run_id: str | None, sources: list[dict], topic: str | None = None, queries: list[str] | None = None) -> dict[str, Any]:
+        topic, queries = await self._focus(run_id, topic, queries)
+        payload = {"run_id": run_id, "sources": sources, "topic": topic, "queries": queries}
+        ev = await self._call("/agents/evidence-harvester/harvest", payload)
+        if ev.get("run_id"):
+            await aset_evidence(ev["run_id"], ev.get("evidence", []))
         return {"run_id": ev.get("run_id"), "evidence": ev.get("evidence", []), "evidence_count": len(ev.get("evidence", []))}
 
-    async def synthesize(self, run_id: str, evidence: list[dict] | None = None) -> dict[str, Any]:
-        data = await self._post("/api/v1/agents/synthesizer/synthesize", json={"run_id": run_id, "evidence": evidence or []})
+    async def gather_stream(
+        self,
+        run_id: str | None,
+        sources: list[dict],
+        topic: str | None = None,
+        queries: list[str] | None = None,
+    ) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+        """Harvest ``sources`` in-process, yielding evidence as each source finishes.
+
+        Each source's evidence is appended to the run as soon as its ``source``
+        event arrives, so a client that disconnects keeps what was gathered.
+        """
+        topic, queries = await self._focus(run_id, topic, queries)
+        run_id = run_id or uuid.uuid4().hex[:12]
+        await aset_evidence(run_id, [])
+        pending: list[dict] = []
+        async for event, data in harvest_stream(run_id, sources, topic=topic, queries=queries):
+            if event == "evidence":
+                pending.append(data)
+            elif event == "source" and pending:
+                await aappend_evidence(run_id, pending)
+                pending = []
+            yield event, data
+
+    async def synthesize(self, run_id: str, evidence: list[dict] | None = None, topic: str | None = None) -> dict[str, Any]:
+        # Fall back to the evidence and topic recorded earlier for this run
+        evidence = evidence or await aget_evidence(run_id)
+        topic = topic or await aget_result(run_id, "topic")
+        data = await self._call("/agents/synthesizer/synthesize", {"run_id": run_id, "evidence": evidence, "topic": topic})
+        await aset_result(run_id, "synthesis", data)
         return data
 
+    async def synthesize_stream(self, run_id: str, evidence: list[dict] | None = None, topic: str | None = None) -> AsyncIterator[tuple[str, Any]]:
+        """Stream synthesis as ``("token", text)`` events followed by ``("result", data)``."""
+        evidence = evidence or await aget_evidence(run_id)
+        topic = topic or await aget_result(run_id, "topic")
+        async for event, data in stream_synthesis(run_id, evidence, topic=topic):
+            if event == "result":
+                await aset_result(run_id, "synthesis", data)
+            yield event, data
+
     async def title(self, run_id: str) -> dict[str, Any]:
-        data = await self._post("/api/v1/agents/title-abstract/generate", json={"run_id": run_id})
+        data = await self._call("/agents/title-abstract/generate", {"run_id": run_id})
+        await aset_result(run_id, "title", data)
         return data
 
     async def review(self, run_id: str) -> dict[str, Any]:
-        data = await self._post("/api/v1/agents/reviewer/review", json={"run_id": run_id})
+        data = await self._call("/agents/reviewer/review", {"run_id": run_id})
+        await aset_result(run_id, "review", data)
         return data
 
+    async def run(self, topic: str, constraints: dict[str, Any] | None = None, run_id: str | None = None) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+        """Execute the whole research pipeline, yielding ``(event, data)`` per stage.
+
+        Each optimized query is searched concurrently and its new candidates are
+        harvested as soon as they arrive, so fetching overlaps the remaining
+        searches. In adaptive mode, harvesting stops (in-flight harvests are
+        cancelled) once the run's evidence is sufficient. Title and review run
+        concurrently once synthesis finishes.
+        """
+        run_id = run_id or uuid.uuid4().hex[:12]
+        # A rerun (e.g. a resumed batch job) starts from an empty evidence log
+        await aset_evidence(run_id, [])
+        await aset_result(run_id, "topic", topic)
+        q = await self._call("/agents/query-optimizer/optimize", {"topic": topic, "constraints": constraints or {}})
+        queries = q["optimized_queries"]
+        await aset_result(run_id, "optimized_queries", queries)
+        yield "queries", {"run_id": run_id, "optimized_queries": queries}
+
+        batches: list[list[dict]] = []
+        evidence: list[dict] = []
+        seen: set[str] = set()
+        tasks: dict[asyncio.Task, str] = {}
+        # Signatures of documents harvested so far; later batches skip their mirrors
+        documents: list[str] = []
+        coverage = Sufficiency(derive_keywords(topic, queries))
+        sufficient = False
+
+        async def _search(query: str) -> tuple[str, list[dict]]:
+            res = await self._call("/agents/source-scout/discover", {"queries": [query]})
+            return query, res["candidates"]
+
+        async def _harvest(sources: list[dict]) -> tuple[list[dict], list[dict]]:
+            payload = {"run_id": run_id, "sources": sources, "topic": topic, "queries": queries, "known_documents": list(documents)}
+            res = await self._call("/agents/evidence-harvester/harvest", payload)
+            documents.extend((res.get("documents") or {}).values())
+            return sources, res.get("evidence", [])
+
+        for query in queries:
+            tasks[asyncio.create_task(_search(query))] = "search"
+        try:
+            while tasks:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for t in done:
+                    stage = tasks.pop(t)
+                    if t.exception() is not None:
+                        yield "error", {"run_id": run_id, "stage": stage, "message": str(t.exception())}
+                        continue
+                    if stage == "search":
+                        query, cands = t.result()
+                        batches.append(cands)
+                        # Harvest only this query's most relevant new sources, within the run's budget
+                        ranked = rank_candidates(cands, topic)
+                        relevant = [c for c in ranked if c["relevance"] > 0] or ranked
+                        fresh = [c for c in relevant if c.get("url") and c["url"] not in seen]
+                        fresh = fresh[: max(0, min(settings.harvest_per_query, settings.harvest_top_k - len(seen)))]
+                        seen.update(c["url"] for c in fresh)
+                        if fresh and not sufficient:
+                            tasks[asyncio.create_task(_harvest(fresh))] = "gather"
+                        yield "candidates", {"run_id": run_id, "query": query, "candidates": cands}
+                    else:
+                        sources, ev = t.result()
+                        evidence.extend(ev)
+                        await aappend_evidence(run_id, ev)
+                        yield "evidence", {"run_id": run_id, "sources": [s["url"] for s in sources], "evidence": ev}
+                        coverage.add(ev)
+                        if settings.harvest_adaptive and not sufficient and coverage.met:
+                            sufficient = True
+                            harvests = [h for h, st in tasks.items() if st == "gather"]
+                            for h in harvests:
+                                tasks.pop(h).cancel()
+                            await asyncio.gather(*harvests, return_exceptions=True)
+                            yield "sufficient", {"run_id": run_id, "cancelled_harvests": len(harvests), **coverage.report()}
+        finally:
+            for t in tasks:
+                t.cancel()
+
+        candidates = merge_results(batches)
+        await aset_result(run_id, "candidates", candidates)
+        synthesis: dict[str, Any] = {}
+        async for event, data in self.synthesize_stream(run_id, evidence=evidence, topic=topic):
+            if event == "token":
+                yield "token", {"run_id": run_id, "delta": data}
+            elif event == "result":
+                synthesis = data
+            else:
+                yield event, {"run_id": run_id, "message": data}
+        yield "synthesis", synthesis
+
+        title, review = await asyncio.gather(self.title(run_id), self.review(run_id))
+        yield "title", title
+        yield "review", review
+        yield "result", {
+            "topic": topic,
+            "run_id": run_id,
+            "optimized_queries": queries,
+            "candidates": candidates,
+            "evidence": evidence,
+            "evidence_count": len(evidence),
+            "synthesis": synthesis,
+            "title": title,
+            "review": review,
+        }
+
+    @staticmethod
+    async def _focus(run_id: str | None, topic: str | None, queries: list[str] | None) -> tuple[str | None, list[str] | None]:
+        # Topic and queries steer passage selection; fall back to what the run recorded
+        if run_id:
+            topic = topic or await aget_result(run_id, "topic")
+            queries = queries or await aget_result(run_id, "optimized_queries")
+        return topic, queries
+
+    async def _call(self, path: str, payload: dict) -> dict[str, Any]:
+        agent = get_agent(path)
+        if agent is not None and not settings.agents_base_url:
+            return await agent.invoke(payload)
+        return await self._post(f"{settings.api_prefix}{path}", json=payload)
+
     async def _post(self, path: str, json: dict) -> dict[str, Any]:
-        resp = await self._client.post(path, json=json)
+        resp = await _client(self._app).post(path, json=json)
         resp.raise_for_status()
         return resp.json()
+
+
+_CLIENT: httpx.AsyncClient | None = None
+_CLIENT_LOOP: asyncio.AbstractEventLoop | None = None
+
+
+def _client(app: FastAPI) -> httpx.AsyncClient:
+    """Pooled client for agent calls that genuinely need HTTP."""
+    global _CLIENT, _CLIENT_LOOP
+    loop = asyncio.get_running_loop()
+    if _CLIENT is None or _CLIENT_LOOP is not loop or _CLIENT.is_closed:
+        if settings.agents_base_url:
+            _CLIENT = httpx.AsyncClient(base_url=settings.agents_base_url, timeout=httpx.Timeout(120.0))
+        else:
+            _CLIENT = httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://orchestrator")
+        _CLIENT_LOOP = loop
+    return _CLIENT
+
+
+async def close_client() -> None:
+    global _CLIENT, _CLIENT_LOOP
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+    _CLIENT = None
+    _CLIENT_LOOP = None
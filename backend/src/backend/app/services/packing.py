@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import re
+from typing import Any, List
+
+from .dedupe import cluster_evidence
+
+_WORD = re.compile(r"[a-z0-9]+")
+# Rough prompt overhead per quote for the "[n] ...\nSource: url" framing
+_ITEM_OVERHEAD = 12
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English prose with BPE tokenizers
+    return max(1, (len(text) + 3) // 4)
+
+
+def _words(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+
+def _relevance(words: List[str], topic_terms: set[str]) -> float:
+    if not topic_terms or not words:
+        return 0.0
+    present = topic_terms.intersection(words)
+    density = sum(1 for w in words if w in topic_terms) / len(words)
+    return len(present) / len(topic_terms) + density
+
+
+def item_tokens(e: dict) -> int:
+    return estimate_tokens((e.get("quote") or "") + (e.get("url") or "")) + _ITEM_OVERHEAD
+
+
+def pack_evidence(evidence: List[dict], topic: str | None, budget: int, max_distance: int | None = None) -> tuple[List[dict], dict[str, Any]]:
+    """Choose the evidence that goes into the synthesis prompt.
+
+    Near-identical quotes (SimHash within ``max_distance`` bits) are clustered
+    and only the first of each cluster kept, with the other URLs listed under
+    ``mirrors``. The rest are ranked by overlap with ``topic`` and added
+    greedily until ``budget`` estimated tokens are used. Returns the packed
+    items (in rank order) and a report for ``quality_metrics``.
+    """
+    topic_terms = {w for w in _words(topic or "") if len(w) > 2}
+    unique: List[tuple[float, int, dict]] = []
+    duplicates = 0
+    for idx, cluster in enumerate(cluster_evidence(evidence, max_distance)):
+        e = cluster[0]
+        if len(cluster) > 1:
+            duplicates += len(cluster) - 1
+            mirrors = [d.get("url") for d in cluster[1:] if d.get("url") and d.get("url") != e.get("url")]
+            e = dict(e, mirrors=list(dict.fromkeys(mirrors)))
+        unique.append((_relevance(_words(e.get("quote") or ""), topic_terms), idx, e))
+
+    unique.sort(key=lambda t: (-t[0], t[1]))
+    packed: List[dict] = []
+    used = 0
+    over_budget = 0
+    for _, _, e in unique:
+        cost = item_tokens(e)
+        if used + cost > budget:
+            over_budget += 1
+            continue
+        packed.append(e)
+        used += cost
+
+    report = {
+        "budget_tokens": budget,
+        "estimated_tokens": used,
+        "included": len(packed),
+        "dropped_duplicates": duplicates,
+        "dropped_over_budget": over_budget,
+        "included_checksums": [e.get("checksum") for e in packed if e.get("checksum")],
+    }
+    return packed, report
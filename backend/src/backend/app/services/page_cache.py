@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from ..config import settings
+from .diskcache import DiskCache
+from .storage import cache_dir
+
+
+# Click-tracking parameters that never change the page served
+_TRACKING_PARAMS = {
+    "gclid", "dclid", "gbraid", "wbraid", "fbclid", "msclkid", "yclid", "igshid",
+    "mc_cid", "mc_eid", "_ga", "_gl", "_hsenc", "_hsmi", "ref_src", "ref_url",
+}
+
+
+def _is_tracking(param: str) -> bool:
+    param = param.lower()
+    return param.startswith("utm_") or param in _TRACKING_PARAMS
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of ``url`` used for fetching, caching and deduplication.
+
+    Lowercases scheme and host (IDNA-encoded, trailing dot dropped), drops
+    default ports, the fragment and tracking parameters (``utm_*``,
+    ``gclid``, ``fbclid``...), keeping the remaining query in its order.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower().rstrip(".")
+    try:
+        host = host.encode("idna").decode("ascii")
+    except UnicodeError:
+        pass
+    port = parts.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+    query = parts.query
+    if query:
+        pairs = parse_qsl(query, keep_blank_values=True)
+        kept = [(k, v) for k, v in pairs if not _is_tracking(k)]
+        if len(kept) != len(pairs):
+            query = urlencode(kept)
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+def _sha(data: str) -> str:
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class PageCache:
+    """Cache of fetched pages and their extraction results.
+
+    URL entries (keyed by normalized URL) hold validators and point at a
+    content entry keyed by the SHA-256 of the raw HTML, so mirrors serving
+    identical bytes share one stored copy and one extraction. Entries are
+    files of up to several MiB: async code uses the ``a``-prefixed variants,
+    which run in a worker thread.
+    """
+
+    def __init__(self, root: Path, ttl: float, max_bytes: int):
+        self._ttl = ttl
+        self._urls = DiskCache(root / "urls", max_bytes=max(1, max_bytes // 16))
+        self._content = DiskCache(root / "content", max_bytes=max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+    def lookup(self, url: str) -> dict[str, Any] | None:
+        """Return the cached entry for ``url`` with a ``fresh`` flag, or ``None``."""
+        meta = self._urls.get(_sha(normalize_url(url)))
+        content = self._content.get(meta["content_hash"]) if meta else None
+        if not meta or not content:
+            self.misses += 1
+            return None
+        fresh = time.time() - meta.get("fetched_at", 0) < self._ttl
+        if fresh:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return {**meta, "extracted": content["extracted"], "fresh": fresh}
+
+    def peek(self, url: str) -> dict[str, Any] | None:
+        """``url``'s small meta entry (validators, ``fingerprint``), uncounted.
+
+        Reads only the per-URL entry, never the stored page; the content it
+        points at may since have been evicted.
+        """
+        return self._urls.get(_sha(normalize_url(url)))
+
+    async def alookup(self, url: str) -> dict[str, Any] | None:
+        return await asyncio.to_thread(self.lookup, url)
+
+    async def apeek(self, url: str) -> dict[str, Any] | None:
+        return await asyncio.to_thread(self.peek, url)
+
+    def validators(self, entry: dict[str, Any]) -> dict[str, str]:
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def revalidated_ok(self, url: str, entry: dict[str, Any]) -> dict[str, Any]:
+        """Record a 304 response: the cached copy is fresh again."""
+        self.revalidated += 1
+        key = _sha(normalize_url(url))
+        meta = {k: entry[k] for k in ("url", "etag", "last_modified", "content_hash", "fingerprint") if k in entry}
+        meta["fetched_at"] = time.time()
+        self._urls.set(key, meta)
+        self._content.touch(entry["content_hash"])
+        return entry["extracted"]
+
+    async def arevalidated_ok(self, url: str, entry: dict[str, Any]) -> dict[str, Any]:
+        return await asyncio.to_thread(self.revalidated_ok, url, entry)
+
+    def store(self, url: str, html: str, extracted: dict[str, Any], headers: dict[str, str] | None = None) -> None:
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        content_hash = _sha(html)
+        self._content.set(content_hash, {"html": html, "extracted": extracted})
+        self._urls.set(_sha(normalize_url(url)), {
+            "url": url,
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "content_hash": content_hash,
+            # Lets the mirror check read the signature without loading the page
+            "fingerprint": extracted.get("fingerprint"),
+            "fetched_at": time.time(),
+        })
+
+    async def astore(self, url: str, html: str, extracted: dict[str, Any], headers: dict[str, str] | None = None) -> None:
+        await asyncio.to_thread(self.store, url, html, extracted, headers)
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "urls": self._urls.stats(),
+            "content": self._content.stats(),
+        }
+
+
+_CACHE: PageCache | None = None
+
+
+def get_page_cache() -> PageCache | None:
+    global _CACHE
+    if not settings.page_cache_enabled:
+        return None
+    if _CACHE is None:
+        _CACHE = PageCache(cache_dir("pages"), ttl=settings.page_cache_ttl, max_bytes=settings.page_cache_max_bytes)
+    return _CACHE
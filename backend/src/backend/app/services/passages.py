@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from typing import Iterable, List, Mapping
+
+from .ranking import tokenize
+
+_TOKEN = re.compile(r"[A-Za-z0-9]+")
+# Search operators the query optimizer adds (site:gov, filetype:pdf, after:2020-01-01)
+_OPERATOR = re.compile(r"\b\w+:\S+")
+_SENTENCE_END = re.compile(r"[.!?](?=\s|$)")
+
+
+def derive_keywords(topic: str | None, queries: Iterable[str] | None = None) -> dict[str, float]:
+    """Keyword weights for passage scoring: topic terms 1.0, terms only in queries 0.5."""
+    weights: dict[str, float] = {}
+    for q in queries or ():
+        for term in tokenize(_OPERATOR.sub(" ", q)):
+            weights[term] = 0.5
+    for term in tokenize(_OPERATOR.sub(" ", topic or "")):
+        weights[term] = 1.0
+    return weights
+
+
+def _snap(text: str, start: int, end: int, slack: int) -> tuple[int, int]:
+    # Widen [start, end) to sentence boundaries when one is within ``slack`` chars
+    before = text.rfind(". ", max(0, start - slack), start)
+    if before != -1:
+        start = before + 2
+    m = _SENTENCE_END.search(text, end, min(len(text), end + slack))
+    if m:
+        end = m.end()
+    return start, end
+
+
+def select_passages(
+    text: str,
+    keywords: Mapping[str, float] | Iterable[str],
+    max_passages: int = 3,
+    window: int = 60,
+    slack: int = 120,
+) -> List[str]:
+    """Top ``max_passages`` non-overlapping passages of ``text`` for ``keywords``.
+
+    The document is tokenized once into an inverted position index over the
+    keyword terms. A ``window``-token window then slides across the keyword
+    hits with two pointers, so every candidate window is scored in one pass
+    that is linear in document length however many keywords there are.
+    A window scores the weights of the distinct keywords it covers plus a
+    small, sublinear bonus for repeats. Passages come back in document order.
+    """
+    weights = dict(keywords) if isinstance(keywords, Mapping) else {k: 1.0 for k in keywords}
+    weights = {t: w for k, w in weights.items() for t in tokenize(k)}
+    if not text or not weights:
+        return []
+
+    spans: list[tuple[int, int]] = []
+    index: dict[str, list[int]] = {}
+    for m in _TOKEN.finditer(text):
+        term = m.group().lower()
+        if term in weights:
+            index.setdefault(term, []).append(len(spans))
+        spans.append(m.span())
+    hits = list(heapq.merge(*([(pos, term) for pos in positions] for term, positions in index.items())))
+    if not hits:
+        return []
+
+    # Two-pointer sweep: the window starting at hit i covers hits[i:j].
+    # coverage/repeats are updated incrementally as hits enter and leave.
+    counts: dict[str, int] = {}
+    coverage = 0.0
+    repeats = 0.0
+    scored: list[tuple[float, int]] = []
+    j = 0
+    for i, (start, _) in enumerate(hits):
+        while j < len(hits) and hits[j][0] < start + window:
+            term = hits[j][1]
+            c = counts.get(term, 0)
+            counts[term] = c + 1
+            if c == 0:
+                coverage += weights[term]
+            else:
+                repeats += weights[term] * (math.log(c + 1) - math.log(c))
+            j += 1
+        scored.append((coverage + 0.1 * repeats, start))
+        term = hits[i][1]
+        c = counts[term]
+        counts[term] = c - 1
+        if c == 1:
+            coverage -= weights[term]
+        else:
+            repeats -= weights[term] * (math.log(c) - math.log(c - 1))
+
+    chosen: list[int] = []
+    for _, start in sorted(scored, key=lambda s: (-s[0], s[1])):
+        if all(abs(start - other) >= window for other in chosen):
+            chosen.append(start)
+            if len(chosen) >= max_passages:
+                break
+
+    out = []
+    for start in sorted(chosen):
+        # Centre the window a little before the first hit for context
+        first = max(0, start - window // 4)
+        last = min(len(spans), first + window) - 1
+        a, b = _snap(text, spans[first][0], spans[last][1], slack)
+        out.append(text[a:b].strip())
+    return out
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import io
+from typing import Any, Mapping
+
+from pypdf import PdfReader
+
+from .dedupe import fingerprint
+from .extraction import CpuBudgetExceeded
+from .ranking import tokenize
+
+PDF_TYPES = frozenset({"application/pdf", "application/x-pdf"})
+
+
+def is_pdf(media_type: str, url: str = "") -> bool:
+    """PDF by content type, or a generic binary type served from a ``.pdf`` path."""
+    if media_type in PDF_TYPES:
+        return True
+    return media_type in ("application/octet-stream", "binary/octet-stream") and url.lower().split("?", 1)[0].endswith(".pdf")
+
+
+def _relevant(text: str, weights: Mapping[str, float], min_coverage: float) -> bool:
+    # A page counts once it mentions enough of the keyword weight
+    total = sum(weights.values())
+    if not total:
+        return True
+    present = set(tokenize(text))
+    return sum(w for t, w in weights.items() if t in present) / total >= min_coverage
+
+
+def extract_pdf(
+    url: str,
+    data: bytes,
+    keywords: Mapping[str, float] | None = None,
+    max_pages: int = 50,
+    target_pages: int = 3,
+    min_coverage: float = 0.5,
+) -> dict[str, Any]:
+    """Extract text from a PDF one page at a time, stopping early.
+
+    Pages are read in order until ``target_pages`` of them are relevant to
+    ``keywords`` (any non-empty page counts without keywords) or
+    ``max_pages`` have been read, so long reports cost only the pages
+    needed. Kept pages come back as ``pages`` (1-based ``page`` numbers);
+    ``text`` joins them with blank lines. Runs in the extraction pool; if
+    the CPU budget runs out, the pages read so far are returned.
+
+    ``complete`` is false only when reading stopped for these ``keywords``
+    or the CPU budget. A document read up to ``max_pages`` is complete: any
+    call with the same cap reads the same pages, so it can be cached.
+    """
+    empty = {"url": url, "title": "", "text": "", "pages": [], "page_count": 0, "complete": True}
+    if not data.startswith(b"%PDF-"):
+        return empty
+    weights = {t: w for k, w in (keywords or {}).items() for t in tokenize(k)}
+    try:
+        reader = PdfReader(io.BytesIO(data))
+        if reader.is_encrypted and not reader.decrypt(""):
+            return empty
+        page_count = len(reader.pages)
+        title = str((reader.metadata or {}).get("/Title") or "")
+    except Exception:  # malformed files raise a variety of pypdf and parsing errors
+        return empty
+
+    pages: list[dict[str, Any]] = []
+    relevant = 0
+    read = 0
+    for number in range(1, min(page_count, max_pages) + 1):
+        read = number
+        try:
+            raw = reader.pages[number - 1].extract_text() or ""
+        except CpuBudgetExceeded:
+            # Out of CPU budget: keep the pages read so far
+            read = number - 1
+            break
+        except Exception:
+            continue
+        # PDF text breaks lines mid-sentence; collapse whitespace for passage windows
+        text = " ".join(raw.split())
+        if not text:
+            continue
+        pages.append({"page": number, "text": text})
+        if _relevant(text, weights, min_coverage):
+            relevant += 1
+            if relevant >= target_pages:
+                break
+
+    text = "\n\n".join(p["text"] for p in pages)
+    return {
+        "url": url,
+        "title": title,
+        "text": text,
+        "pages": pages,
+        "page_count": page_count,
+        "complete": read >= min(page_count, max_pages),
+        "fingerprint": fingerprint(text) if text else None,
+    }
+
+
+def page_of(pages: list[dict[str, Any]], text: str, passage: str) -> int | None:
+    """Page holding most of ``passage`` within ``text`` as joined by ``extract_pdf``."""
+    offset = text.find(passage)
+    if offset == -1:
+        # Sentence fallbacks are re-punctuated; their opening words still match
+        passage = passage[:40]
+        offset = text.find(passage)
+    if offset == -1:
+        return None
+    end = offset + len(passage)
+    best, overlap = None, 0
+    start = 0
+    for p in pages:
+        stop = start + len(p["text"])
+        share = min(stop, end) - max(start, offset)
+        if share > overlap:
+            best, overlap = p["page"], share
+        start = stop + 2
+    return best
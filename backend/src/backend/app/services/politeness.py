@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from collections import OrderedDict
+from typing import AsyncIterator, Awaitable, Callable, Iterable
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+from tldextract import extract as tld_extract
+
+from ..config import settings
+
+# Product token matched against robots.txt ``User-agent`` lines
+ROBOTS_AGENT = "crewAI-research-backend"
+
+
+def registrable_domain(url: str) -> str:
+    """``example.co.uk`` for ``https://news.example.co.uk/a``; also the publisher name."""
+    t = tld_extract(url)
+    return ".".join([p for p in [t.domain, t.suffix] if p])
+
+
+def _domain_key(url: str) -> str:
+    return registrable_domain(url) or (urlsplit(url).hostname or "").lower()
+
+
+def interleave_domains(urls: Iterable[str]) -> list[str]:
+    """Round-robin ``urls`` across domains, keeping their order within a domain.
+
+    Consecutive fetches then hit different sites, so a per-domain delay on
+    one site does not stall the slots behind it.
+    """
+    groups: dict[str, list[str]] = {}
+    for url in urls:
+        groups.setdefault(_domain_key(url), []).append(url)
+    out: list[str] = []
+    queues = list(groups.values())
+    depth = 0
+    while queues:
+        queues = [q for q in queues if depth < len(q)]
+        out.extend(q[depth] for q in queues)
+        depth += 1
+    return out
+
+
+class DomainScheduler:
+    """Per-domain concurrency cap and minimum spacing between request starts.
+
+    Domains are grouped by registrable domain (as for ``publisher``), so
+    ``a.example.com`` and ``b.example.com`` share one budget. Each start
+    reserves the next start time for its domain before sleeping, so waiting
+    callers are spaced ``delay`` apart without a polling loop. Domains with
+    nobody in or waiting for a slot and no start still reserved are dropped
+    in periodic sweeps, so a long-lived scheduler does not grow per domain.
+    """
+
+    def __init__(self, per_domain_limit: int, delay: float):
+        self._limit = per_domain_limit
+        self._delay = delay
+        self._slots: dict[str, asyncio.Semaphore] = {}
+        self._next: dict[str, float] = {}
+        self._users: dict[str, int] = {}
+        self._sweep_at = 64
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        for domain in [d for d in self._slots if not self._users.get(d) and self._next.get(d, 0.0) <= now]:
+            del self._slots[domain]
+            self._next.pop(domain, None)
+            self._users.pop(domain, None)
+        self._sweep_at = max(64, 2 * len(self._slots))
+
+    @asynccontextmanager
+    async def slot(self, url: str, delay: float | None = None) -> AsyncIterator[None]:
+        domain = _domain_key(url)
+        if len(self._slots) >= self._sweep_at:
+            self._prune()
+        sem = self._slots.get(domain)
+        if sem is None:
+            sem = self._slots[domain] = asyncio.Semaphore(self._limit)
+        self._users[domain] = self._users.get(domain, 0) + 1
+        try:
+            async with sem:
+                now = time.monotonic()
+                start = max(now, self._next.get(domain, 0.0))
+                self._next[domain] = start + (self._delay if delay is None else max(delay, self._delay))
+                if start > now:
+                    await asyncio.sleep(start - now)
+                yield
+        finally:
+            self._users[domain] -= 1
+
+
+class RobotsCache:
+    """robots.txt rules per origin, fetched once and kept for ``ttl`` seconds.
+
+    ``fetch(url)`` returns the robots.txt body, or ``None`` when it is
+    missing (4xx), unreachable or oversized; any of those allows everything,
+    so only an explicit ``Disallow`` blocks a URL. ``FetchEngine`` passes a
+    fetch that goes through its domain pacing and byte cap. At most
+    ``max_entries`` origins are kept (least recently used dropped first).
+    One fetch per origin is in flight at a time; concurrent lookups wait for it.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Awaitable[str | None]],
+        ttl: float | None = None,
+        max_entries: int | None = None,
+    ):
+        self._fetch = fetch
+        self._ttl = settings.robots_ttl if ttl is None else ttl
+        self._max_entries = max_entries or settings.robots_cache_max_entries
+        self._rules: OrderedDict[str, tuple[RobotFileParser | None, float]] = OrderedDict()
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def _cached(self, origin: str) -> tuple[RobotFileParser | None, float] | None:
+        entry = self._rules.get(origin)
+        if entry is None or entry[1] < time.monotonic():
+            return None
+        self._rules.move_to_end(origin)
+        return entry
+
+    async def _parser(self, url: str) -> RobotFileParser | None:
+        origin = self._origin(url)
+        entry = self._cached(origin)
+        if entry is not None:
+            return entry[0]
+        lock = self._locks.setdefault(origin, asyncio.Lock())
+        try:
+            async with lock:
+                entry = self._cached(origin)
+                if entry is not None:
+                    return entry[0]
+                parser = await self._load(origin)
+                self._rules[origin] = (parser, time.monotonic() + self._ttl)
+                self._rules.move_to_end(origin)
+                while len(self._rules) > self._max_entries:
+                    self._rules.popitem(last=False)
+                return parser
+        finally:
+            # Waiters already hold the lock object; later lookups hit the cache
+            if self._locks.get(origin) is lock:
+                del self._locks[origin]
+
+    async def _load(self, origin: str) -> RobotFileParser | None:
+        text = await self._fetch(f"{origin}/robots.txt")
+        if text is None:
+            return None
+        parser = RobotFileParser()
+        parser.parse(text.splitlines())
+        return parser
+    async def allowed(self, url: str) -> bool:
+        parser = await self._parser(url)
+        return parser is None or parser.can_fetch(ROBOTS_AGENT, url)
+
+    def crawl_delay(self, url: str) -> float | None:
+        """The site's ``Crawl-delay`` (capped), once its rules are cached."""
+        entry = self._cached(self._origin(url))
+        if entry is None or entry[0] is None:
+            return None
+        delay = entry[0].crawl_delay(ROBOTS_AGENT)
+        return None if delay is None else min(float(delay), settings.robots_max_crawl_delay)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from typing import Iterable, List, Sequence
+from urllib.parse import urlparse
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have how in into is it its of on or that the their this to "
+    "was were what when where which who why will with you your about after before between over under vs".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [w for w in _WORD.findall(text.lower()) if len(w) > 1 and w not in _STOPWORDS]
+
+
+class BM25:
+    """Okapi BM25 over a small batch of tokenized documents.
+
+    Term frequencies are kept as a sparse inverted index (term -> postings),
+    so scoring a query touches only the documents that contain its terms.
+    """
+
+    def __init__(self, docs: Sequence[Sequence[str]], k1: float = 1.5, b: float = 0.75):
+        self._k1 = k1
+        self._b = b
+        self._n = len(docs)
+        self._lengths = [len(d) for d in docs]
+        self._avg = (sum(self._lengths) / self._n) if self._n else 0.0
+        self._postings: dict[str, list[tuple[int, int]]] = {}
+        for i, doc in enumerate(docs):
+            for term, tf in Counter(doc).items():
+                self._postings.setdefault(term, []).append((i, tf))
+
+    def idf(self, term: str) -> float:
+        df = len(self._postings.get(term, ()))
+        return math.log(1 + (self._n - df + 0.5) / (df + 0.5))
+
+    def scores(self, query: Iterable[str]) -> List[float]:
+        out = [0.0] * self._n
+        if not self._avg:
+            return out
+        for term in set(query):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf(term)
+            for i, tf in postings:
+                norm = self._k1 * (1 - self._b + self._b * self._lengths[i] / self._avg)
+                out[i] += idf * tf * (self._k1 + 1) / (tf + norm)
+        return out
+
+
+def _candidate_text(c: dict) -> str:
+    path = urlparse(c.get("url") or "").path.replace("-", " ").replace("_", " ").replace("/", " ")
+    return " ".join([c.get("title") or "", c.get("snippet") or "", path])
+
+
+def rank_candidates(candidates: List[dict], query: str) -> List[dict]:
+    """Score candidates against ``query`` with BM25 and sort best first.
+
+    Each candidate gets ``relevance`` (BM25 scaled to 0..1 within the batch);
+    candidates without a provider score take it as their ``score``. The sort
+    is stable, so equally relevant candidates keep their incoming order.
+    """
+    if not candidates:
+        return []
+    bm25 = BM25([tokenize(_candidate_text(c)) for c in candidates])
+    raw = bm25.scores(tokenize(query))
+    top = max(raw) or 1.0
+    ranked = []
+    for c, s in zip(candidates, raw):
+        c = dict(c, relevance=round(s / top, 4))
+        if not c.get("score"):
+            c["score"] = c["relevance"]
+        ranked.append(c)
+    ranked.sort(key=lambda c: -c["relevance"])
+    return ranked
+
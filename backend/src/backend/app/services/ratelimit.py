@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+from ..config import settings
+
+
+class TokenBucket:
+    """Async token bucket: ``rate`` tokens per second, bursting up to ``capacity``.
+
+    Tokens are reserved synchronously, so concurrent callers on one event loop
+    are queued fairly without a lock; a caller that would overdraw the bucket
+    sleeps until its token has accrued.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self._rate = rate
+        self._capacity = max(1.0, capacity)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+
+    def _reserve(self) -> float:
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self._rate
+
+    async def acquire(self) -> None:
+        if self._rate <= 0:
+            return
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+_BUCKETS: dict[str, TokenBucket] = {}
+
+
+def provider_bucket(provider: str) -> TokenBucket:
+    bucket = _BUCKETS.get(provider)
+    if bucket is None:
+        if provider == "tavily":
+            bucket = TokenBucket(settings.tavily_rate_per_sec, settings.tavily_burst)
+        else:
+            bucket = TokenBucket(settings.ddg_rate_per_sec, settings.ddg_burst)
+        _BUCKETS[provider] = bucket
+    return bucket
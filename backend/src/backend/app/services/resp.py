@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import socket
+import threading
+from typing import Any
+from urllib.parse import urlparse
+
+
+class RespError(Exception):
+    pass
+
+
+class RespClient:
+    """Minimal blocking client for the Redis serialization protocol (RESP2).
+
+    Enough for simple key/hash commands against Redis or any compatible
+    server; the connection is opened lazily and re-opened after errors.
+    """
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        parsed = urlparse(url)
+        self._host = parsed.hostname or "localhost"
+        self._port = parsed.port or 6379
+        self._password = parsed.password
+        self._db = int(parsed.path.lstrip("/") or 0)
+        self._timeout = timeout
+        self._sock: socket.socket | None = None
+        self._buf = b""
+        self._lock = threading.Lock()
+
+    def execute(self, *args: Any) -> Any:
+        with self._lock:
+            try:
+                self._connect()
+                return self._roundtrip(args)
+            except (OSError, ConnectionError):
+                self._close()
+                raise
+
+    def close(self) -> None:
+        with self._lock:
+            self._close()
+
+    def _connect(self) -> None:
+        if self._sock is not None:
+            return
+        self._sock = socket.create_connection((self._host, self._port), timeout=self._timeout)
+        self._buf = b""
+        if self._password:
+            self._roundtrip(("AUTH", self._password))
+        if self._db:
+            self._roundtrip(("SELECT", self._db))
+
+    def _close(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._buf = b""
+
+    def _roundtrip(self, args: tuple) -> Any:
+        assert self._sock is not None
+        self._sock.sendall(encode(*args))
+        return self._read_reply()
+
+    def _read_line(self) -> bytes:
+        while b"\r\n" not in self._buf:
+            self._fill()
+        line, self._buf = self._buf.split(b"\r\n", 1)
+        return line
+
+    def _read_exact(self, n: int) -> bytes:
+        while len(self._buf) < n + 2:
+            self._fill()
+        data, self._buf = self._buf[:n], self._buf[n + 2 :]
+        return data
+
+    def _fill(self) -> None:
+        assert self._sock is not None
+        chunk = self._sock.recv(65536)
+        if not chunk:
+            raise ConnectionError("connection closed by server")
+        self._buf += chunk
+
+    def _read_reply(self) -> Any:
+        line = self._read_line()
+        kind, rest = line[:1], line[1:]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            raise RespError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            n = int(rest)
+            return None if n < 0 else self._read_exact(n)
+        if kind == b"*":
+            n = int(rest)
+            return None if n < 0 else [self._read_reply() for _ in range(n)]
+        raise RespError(f"unexpected reply: {line!r}")
+
+
+def encode(*args: Any) -> bytes:
+    out = [f"*{len(args)}\r\n".encode()]
+    for a in args:
+        data = a if isinstance(a, bytes) else str(a).encode("utf-8")
+        out.append(f"${len(data)}\r\n".encode() + data + b"\r\n")
+    return b"".join(out)
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from ..config import settings
+from .diskcache import DiskCache
+from .storage import cache_dir
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+class SearchCache:
+    """Two-tier (memory LRU + disk) TTL cache for search results.
+
+    Concurrent lookups for the same key share a single upstream call. The
+    call runs as its own task, so a caller that is cancelled (e.g. a client
+    disconnecting) leaves it running for the others and still caches it.
+    """
+
+    def __init__(self, disk: DiskCache | None, ttl: float, max_entries: int):
+        self._disk = disk
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._memory: OrderedDict[str, tuple[float, list[dict]]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def key(provider: str, query: str, max_results: int, region: str) -> str:
+        raw = json.dumps([provider, normalize_query(query), max_results, region])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def _get(self, key: str) -> list[dict] | None:
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry and now - entry[0] < self._ttl:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        if self._disk is not None:
+            stored = await asyncio.to_thread(self._disk.get, key)
+            if stored and now - stored.get("stored_at", 0) < self._ttl:
+                self.disk_hits += 1
+                self._remember(key, stored["stored_at"], stored["results"])
+                return stored["results"]
+        return None
+
+    def _remember(self, key: str, stored_at: float, results: list[dict]) -> None:
+        self._memory[key] = (stored_at, results)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_entries:
+            self._memory.popitem(last=False)
+
+    async def get_or_fetch(self, key: str, fetch: Callable[[], Awaitable[list[dict]]]) -> list[dict]:
+        cached = await self._get(key)
+        if cached is not None:
+            return cached
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            pending = self._inflight[key] = asyncio.create_task(self._fetch(key, fetch))
+            # Retrieve a failure even if every caller has gone
+            pending.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return await asyncio.shield(pending)
+
+    async def _fetch(self, key: str, fetch: Callable[[], Awaitable[list[dict]]]) -> list[dict]:
+        try:
+            results = await fetch()
+        finally:
+            self._inflight.pop(key, None)
+        now = time.time()
+        self._remember(key, now, results)
+        if self._disk is not None:
+            await asyncio.to_thread(self._disk.set, key, {"stored_at": now, "results": results})
+        return results
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.disk_hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round((lookups - self.misses) / lookups, 3) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "disk": self._disk.stats() if self._disk is not None else None,
+        }
+
+
+_CACHE: SearchCache | None = None
+
+
+def get_search_cache() -> SearchCache:
+    global _CACHE
+    if _CACHE is None:
+        disk = DiskCache(cache_dir("search"), max_bytes=settings.search_cache_max_bytes) if settings.search_cache_max_bytes > 0 else None
+        _CACHE = SearchCache(disk, ttl=settings.search_cache_ttl, max_entries=settings.search_cache_max_entries)
+    return _CACHE
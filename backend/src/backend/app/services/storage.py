@@ -1,19 +1,53 @@
 from __future__ import annotations
 
 from pathlib import Path
-from io import BytesIO
+from typing import Annotated, Callable, Iterable, Iterator
 from zipfile import ZipFile, ZIP_DEFLATED
 import json
+import re
+
+from pydantic import StringConstraints
+
+from ..config import settings
+
+# Run ids name directories under storage/runs, so they must be a single safe path segment
+RUN_ID_PATTERN = r"^[A-Za-z0-9_-]{1,64}$"
+_RUN_ID = re.compile(RUN_ID_PATTERN)
+# Request-model/parameter type: a bad run id is rejected with a 422
+RunId = Annotated[str, StringConstraints(pattern=RUN_ID_PATTERN)]
+
+
+def storage_root() -> Path:
+    if settings.storage_dir:
+        return Path(settings.storage_dir)
+    return Path(__file__).resolve().parents[4] / "storage"
 
 
 def runs_dir() -> Path:
-    base = Path(__file__).resolve().parents[4] / "storage" / "runs"
+    base = storage_root() / "runs"
     base.mkdir(parents=True, exist_ok=True)
     return base
 
 
+def cache_dir(name: str) -> Path:
+    p = storage_root() / "cache" / name
+    p.mkdir(parents=True, exist_ok=True)
+    return p
+
+
+def check_run_id(run_id: str) -> str:
+    if not isinstance(run_id, str) or not _RUN_ID.match(run_id):
+        raise ValueError(f"invalid run_id: {run_id!r}")
+    return run_id
+
+
+def run_dir(run_id: str) -> Path:
+    """Directory of ``run_id`` under ``runs_dir()`` (not created)."""
+    return runs_dir() / check_run_id(run_id)
+
+
 def run_path(run_id: str) -> Path:
-    p = runs_dir() / run_id
+    p = run_dir(run_id)
     p.mkdir(parents=True, exist_ok=True)
     return p
 
@@ -51,21 +85,91 @@ def _to_markdown(report: dict) -> str:
     return "\n".join(lines).strip() + "\n"
 
 
-def build_zip_bytes(report: dict) -> bytes:
-    """Build a ZIP archive (in-memory) for the given report dict."""
-    buf = BytesIO()
-    with ZipFile(buf, "w", compression=ZIP_DEFLATED) as z:
+class _ChunkSink:
+    """Write-only, non-seekable file object collecting ZIP output for draining.
+
+    ``ZipFile`` falls back to data descriptors when it cannot seek, so every
+    byte it writes can be handed to the client straight away.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, b: bytes) -> int:
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> Iterator[bytes]:
+        chunks, self._chunks = self._chunks, []
+        yield from chunks
+
+
+def _indent(text: str, prefix: str) -> str:
+    return text.replace("\n", "\n" + prefix)
+
+
+def _iter_report_json(report: dict, evidence: Iterable[dict]) -> Iterator[str]:
+    # Same layout as json.dumps(report, indent=2), with evidence streamed item by item
+    keys = list(report) if "evidence" in report else [*report, "evidence"]
+    yield "{"
+    for n, key in enumerate(keys):
+        yield f'{"," if n else ""}\n  {json.dumps(key)}: '
+        if key != "evidence":
+            yield _indent(json.dumps(report[key], ensure_ascii=False, indent=2), "  ")
+            continue
+        yield "["
+        first = True
+        for e in evidence:
+            yield ("\n" if first else ",\n") + "    " + _indent(json.dumps(e, ensure_ascii=False, indent=2), "    ")
+            first = False
+        yield "]" if first else "\n  ]"
+    yield "\n}"
+
+
+def iter_zip(
+    report: dict,
+    evidence: Callable[[], Iterable[dict]] | None = None,
+    chunk_size: int = 64 * 1024,
+) -> Iterator[bytes]:
+    """Yield a ZIP archive for ``report`` chunk by chunk.
+
+    ``evidence`` returns a fresh iterable of evidence items each time it is
+    called (e.g. lines read from disk); it defaults to ``report["evidence"]``.
+    Nothing larger than one entry's pending compressor output is buffered.
+    """
+    if evidence is None:
+        items = report.get("evidence", []) or []
+        evidence = lambda: items  # noqa: E731
+    sink = _ChunkSink()
+
+    def _entry(z: ZipFile, name: str, parts: Iterable[str]) -> Iterator[bytes]:
+        with z.open(name, "w") as f:
+            buf: list[str] = []
+            size = 0
+            for part in parts:
+                buf.append(part)
+                size += len(part)
+                if size >= chunk_size:
+                    f.write("".join(buf).encode("utf-8"))
+                    buf, size = [], 0
+                    yield from sink.drain()
+            if buf:
+                f.write("".join(buf).encode("utf-8"))
+        yield from sink.drain()
+
+    with ZipFile(sink, "w", compression=ZIP_DEFLATED) as z:
         # Full JSON report
-        z.writestr("report.json", json.dumps(report, ensure_ascii=False, indent=2))
+        yield from _entry(z, "report.json", _iter_report_json(report, evidence()))
         # Markdown rendering
-        z.writestr("report.md", _to_markdown(report))
+        yield from _entry(z, "report.md", [_to_markdown(report)])
         # Evidence JSONL
-        evidence = report.get("evidence", []) or []
-        ev_lines = "\n".join(json.dumps(e, ensure_ascii=False) for e in evidence)
-        z.writestr("evidence.jsonl", ev_lines)
+        yield from _entry(z, "evidence.jsonl", (("\n" if i else "") + json.dumps(e, ensure_ascii=False) for i, e in enumerate(evidence())))
         # Candidates JSON
         cands = report.get("candidates", []) or []
-        z.writestr("candidates.json", json.dumps(cands, ensure_ascii=False, indent=2))
+        yield from _entry(z, "candidates.json", [json.dumps(cands, ensure_ascii=False, indent=2)])
         # Metadata
         meta = {
             "topic": report.get("topic"),
@@ -73,5 +177,11 @@ def build_zip_bytes(report: dict) -> bytes:
             "optimized_queries": report.get("optimized_queries"),
             "generated_at": report.get("generated_at"),
         }
-        z.writestr("metadata.json", json.dumps(meta, ensure_ascii=False, indent=2))
-    return buf.getvalue()
+        yield from _entry(z, "metadata.json", [json.dumps(meta, ensure_ascii=False, indent=2)])
+    # Central directory
+    yield from sink.drain()
+
+
+def build_zip_bytes(report: dict) -> bytes:
+    """Build a ZIP archive (in-memory) for the given report dict."""
+    return b"".join(iter_zip(report))
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
-from typing import AsyncIterator, Iterable
+import json
+from typing import AsyncIterable, AsyncIterator, Iterable
 
 
-async def ldj_stream(items: list[dict]) -> AsyncIterator[str]:
-    for obj in items:
-        yield f"{obj}\n"
+async def ldj_stream(items: Iterable[dict] | AsyncIterable[dict]) -> AsyncIterator[str]:
+    """Serialize ``items`` as newline-delimited JSON, one object per line."""
+    if isinstance(items, AsyncIterable):
+        async for obj in items:
+            yield json.dumps(obj, ensure_ascii=False, default=str) + "\n"
+    else:
+        for obj in items:
+            yield json.dumps(obj, ensure_ascii=False, default=str) + "\n"
 
 
 def sse_format(event: str | None, data: str) -> str:
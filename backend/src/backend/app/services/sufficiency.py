@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Mapping
+
+from ..config import settings
+from .ranking import tokenize
+
+
+class Sufficiency:
+    """Tracks whether the evidence gathered so far is enough to stop harvesting.
+
+    Coverage is measured as quote count, distinct publishers and the share
+    of keyword weight that appears in at least one quote. ``met`` turns true
+    once every threshold is reached; a threshold of 0 is ignored.
+    """
+
+    def __init__(
+        self,
+        keywords: Mapping[str, float],
+        min_quotes: int | None = None,
+        min_publishers: int | None = None,
+        min_keyword_coverage: float | None = None,
+    ):
+        self._weights = dict(keywords)
+        self._total = sum(self._weights.values())
+        self._min_quotes = settings.harvest_min_quotes if min_quotes is None else min_quotes
+        self._min_publishers = settings.harvest_min_publishers if min_publishers is None else min_publishers
+        self._min_coverage = settings.harvest_min_keyword_coverage if min_keyword_coverage is None else min_keyword_coverage
+        self._quotes = 0
+        self._publishers: set[str] = set()
+        self._covered: set[str] = set()
+
+    def add(self, evidence: Iterable[dict]) -> None:
+        for e in evidence:
+            self._quotes += 1
+            if e.get("publisher"):
+                self._publishers.add(e["publisher"])
+            self._covered.update(t for t in tokenize(e.get("quote") or "") if t in self._weights)
+
+    @property
+    def keyword_coverage(self) -> float:
+        if not self._total:
+            return 1.0
+        return sum(self._weights[t] for t in self._covered) / self._total
+
+    @property
+    def met(self) -> bool:
+        return (
+            self._quotes >= self._min_quotes
+            and len(self._publishers) >= self._min_publishers
+            and self.keyword_coverage >= self._min_coverage
+        )
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "quotes": self._quotes,
+            "publishers": len(self._publishers),
+            "keyword_coverage": round(self.keyword_coverage, 3),
+            "sufficient": self.met,
+        }
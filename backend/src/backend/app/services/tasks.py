@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+from ..config import settings
+from .memory import aget_result, get_result, set_result
+
+TERMINAL_STATES = {"done", "failed", "cancelled"}
+
+# Work functions receive ``report(stage, progress)`` to publish progress.
+Report = Callable[[str, float], None]
+
+
+def get_status(run_id: str) -> dict[str, Any] | None:
+    return get_result(run_id, "status")
+
+
+async def aget_status(run_id: str) -> dict[str, Any] | None:
+    return await aget_result(run_id, "status")
+
+
+class RunTasks:
+    """Background execution of research stages, keyed by run_id.
+
+    Status lives in the run state (``status`` field) so any worker sharing
+    the run-state backend can answer polls; subscribers in this process are
+    woken on every change. Cancelling a task unwinds its ``async with``
+    blocks, which hands fetch, extraction and LLM slots straight back.
+    Status writes run in a thread (the run-state backend may block) and are
+    chained per run, so they land in the order they were made.
+    """
+
+    def __init__(self, max_concurrency: int):
+        self._slots = asyncio.Semaphore(max(1, max_concurrency))
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._changed: dict[str, asyncio.Event] = {}
+        self._writes: dict[str, asyncio.Task] = {}
+
+    async def submit(self, run_id: str, stage: str, work: Callable[[Report], Awaitable[Any]]) -> dict[str, Any]:
+        if run_id in self._tasks:
+            raise ValueError(f"run {run_id} already has a stage in progress")
+        self._tasks[run_id] = asyncio.create_task(self._execute(run_id, stage, work))
+        return await self._update(run_id, state="queued", stage=stage, progress=0.0, error=None)
+
+    def cancel(self, run_id: str) -> bool:
+        task = self._tasks.get(run_id)
+        if task is None:
+            return False
+        task.cancel()
+        return True
+
+    async def wait(self, run_id: str, timeout: float) -> None:
+        """Return after the run's next status change, or after ``timeout``."""
+        event = self._changed.setdefault(run_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def close(self) -> None:
+        tasks = list(self._tasks.values())
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.gather(*self._writes.values(), return_exceptions=True)
+
+    async def _execute(self, run_id: str, stage: str, work: Callable[[Report], Awaitable[Any]]) -> None:
+        def report(current: str, progress: float) -> None:
+            self._write(run_id, state="running", stage=current, progress=round(progress, 3))
+
+        try:
+            async with self._slots:
+                await self._update(run_id, state="running")
+                await work(report)
+            final: dict[str, Any] = {"state": "done", "progress": 1.0}
+        except asyncio.CancelledError:
+            final = {"state": "cancelled"}
+        except Exception as exc:
+            final = {"state": "failed", "error": str(exc) or type(exc).__name__}
+        finally:
+            # No longer cancellable once its final state is visible
+            self._tasks.pop(run_id, None)
+        await self._update(run_id, **final)
+
+    async def _update(self, run_id: str, **fields: Any) -> dict[str, Any]:
+        return await asyncio.shield(self._write(run_id, **fields))
+
+    def _write(self, run_id: str, **fields: Any) -> asyncio.Task:
+        # Queue a status change behind the run's previous one
+        previous = self._writes.get(run_id)
+
+        async def _apply() -> dict[str, Any]:
+            if previous is not None:
+                await asyncio.gather(previous, return_exceptions=True)
+            status = await asyncio.to_thread(_merge_status, run_id, fields)
+            if self._writes.get(run_id) is task:
+                del self._writes[run_id]
+            event = self._changed.pop(run_id, None)
+            if event is not None:
+                event.set()
+            return status
+
+        task = self._writes[run_id] = asyncio.create_task(_apply())
+        return task
+
+
+def _merge_status(run_id: str, fields: dict[str, Any]) -> dict[str, Any]:
+    status = dict(get_status(run_id) or {"run_id": run_id, "submitted_at": time.time()})
+    status.update(fields, updated_at=time.time())
+    set_result(run_id, "status", status)
+    return status
+
+
+_TASKS: RunTasks | None = None
+_TASKS_LOOP: asyncio.AbstractEventLoop | None = None
+
+
+def get_tasks() -> RunTasks:
+    global _TASKS, _TASKS_LOOP
+    loop = asyncio.get_running_loop()
+    if _TASKS is None or _TASKS_LOOP is not loop:
+        _TASKS = RunTasks(settings.run_task_concurrency)
+        _TASKS_LOOP = loop
+    return _TASKS
+
+
+async def close_tasks() -> None:
+    global _TASKS, _TASKS_LOOP
+    if _TASKS is not None:
+        await _TASKS.close()
+    _TASKS = None
+    _TASKS_LOOP = None
@@ -1,69 +1,114 @@
 from __future__ import annotations
 
+import asyncio
 from typing import Iterable
 
-import httpx
 from duckduckgo_search import DDGS
-from tldextract import extract as tld_extract
 from ..config import settings
+from .fetcher import get_engine
+from .page_cache import normalize_url
+from .politeness import registrable_domain as _domain
+from .ranking import rank_candidates
+from .ratelimit import provider_bucket
+from .search_cache import SearchCache, get_search_cache
 
 
-def _domain(url: str) -> str:
-    t = tld_extract(url)
-    return ".".join([p for p in [t.domain, t.suffix] if p])
-
-
-def search_candidates(queries: Iterable[str], max_results: int = 5) -> list[dict]:
+def _provider() -> str:
     # Prefer Tavily if configured
     if settings.search_provider.lower() == "tavily" and settings.tavily_api_key:
-        return _search_tavily(queries, max_results=max_results)
-    # Fallback: DDG
+        return "tavily"
+    return "ddg"
+
+
+async def search_candidates(queries: Iterable[str], max_results: int = 5) -> list[dict]:
+    """Search all ``queries`` concurrently and return the merged, ranked union.
+
+    Results are ordered by BM25 relevance of title/snippet/URL to the queries.
+    ``max_results`` applies per query. A failing query is skipped unless every
+    query failed, in which case the first error is raised.
+    """
+    provider = _provider()
+    unique = list(dict.fromkeys(q for q in queries if q and q.strip()))
+    batches = await asyncio.gather(*(search_query(provider, q, max_results=max_results) for q in unique), return_exceptions=True)
+    ok = [b for b in batches if not isinstance(b, BaseException)]
+    if batches and not ok:
+        raise batches[0]
+    return rank_candidates(merge_results(ok), " ".join(unique))
+
+
+def merge_results(batches: Iterable[list[dict]]) -> list[dict]:
+    """Dedupe results by canonical URL across queries and rank by score.
+
+    Ties (e.g. providers without scores) go to URLs returned by more queries,
+    then to the best position any query gave them.
+    """
+    merged: dict[str, dict] = {}
+    hits: dict[str, int] = {}
+    best_rank: dict[str, int] = {}
+    for batch in batches:
+        for rank, r in enumerate(batch):
+            # Tracking-parameter and fragment variants are the same page
+            url = normalize_url(r["url"])
+            hits[url] = hits.get(url, 0) + 1
+            best_rank[url] = min(best_rank.get(url, rank), rank)
+            if url not in merged or (r.get("score") or 0.0) > (merged[url].get("score") or 0.0):
+                merged[url] = {**r, "url": url}
+    return sorted(merged.values(), key=lambda r: (-(r.get("score") or 0.0), -hits[r["url"]], best_rank[r["url"]]))
+
+
+async def search_query(provider: str, query: str, max_results: int = 5) -> list[dict]:
+    """Search a single query through the shared result cache and provider rate limit."""
+    key = SearchCache.key(provider, query, max_results, settings.search_region)
+
+    async def _upstream() -> list[dict]:
+        await provider_bucket(provider).acquire()
+        if provider == "tavily":
+            return await _search_tavily(query, max_results)
+        return await asyncio.to_thread(_search_ddg, query, max_results)
+
+    return await get_search_cache().get_or_fetch(key, _upstream)
+
+
+def _search_ddg(query: str, max_results: int = 5) -> list[dict]:
     results: list[dict] = []
-    seen: set[str] = set()
     with DDGS() as ddgs:
-        for q in queries:
-            for r in ddgs.text(q, region="us-en", safesearch="moderate", timelimit="y", max_results=max_results):
-                url = r.get("href") or r.get("url")
-                if not url or url in seen:
-                    continue
-                seen.add(url)
-                results.append({
-                    "url": url,
-                    "title": r.get("title") or r.get("body") or "",
-                    "publisher": _domain(url),
-                    "date": r.get("date") or r.get("published") or "",
-                    "score": 0.0,
-                })
-                if len(results) >= max_results:
-                    break
-            if len(results) >= max_results:
-                break
+        for r in ddgs.text(query, region=settings.search_region, safesearch="moderate", timelimit="y", max_results=max_results):
+            url = r.get("href") or r.get("url")
+            if not url:
+                continue
+            results.append({
+                "url": url,
+                "title": r.get("title") or r.get("body") or "",
+                "snippet": r.get("body") or "",
+                "publisher": _domain(url),
+                "date": r.get("date") or r.get("published") or "",
+                "score": 0.0,
+            })
     return results
 
 
-def _search_tavily(queries: Iterable[str], max_results: int = 5) -> list[dict]:
-    q = next(iter(queries))  # Use the first optimized query
+async def _search_tavily(query: str, max_results: int = 5) -> list[dict]:
     payload = {
         "api_key": settings.tavily_api_key,
-        "query": q,
+        "query": query,
         "search_depth": "basic",
         "include_answer": False,
         "max_results": max_results,
     }
     results: list[dict] = []
-    with httpx.Client(timeout=20) as client:
-        resp = client.post("https://api.tavily.com/search", json=payload)
-        resp.raise_for_status()
-        data = resp.json()
-        for r in data.get("results", [])[:max_results]:
-            url = r.get("url")
-            if not url:
-                continue
-            results.append({
-                "url": url,
-                "title": r.get("title") or "",
-                "publisher": _domain(url),
-                "date": r.get("published_date") or "",
-                "score": r.get("score") or 0.0,
-            })
+    resp = await get_engine().client.post("https://api.tavily.com/search", json=payload, timeout=20)
+    resp.raise_for_status()
+    data = resp.json()
+    for r in data.get("results", [])[:max_results]:
+        url = r.get("url")
+        if not url:
+            continue
+        results.append({
+            "url": url,
+            "title": r.get("title") or "",
+            "snippet": r.get("content") or "",
+            "publisher": _domain(url),
+            "date": r.get("published_date") or "",
+            "score": r.get("score") or 0.0,
+        })
     return results
@@ -3,29 +3,45 @@ from __future__ import annotations
 from fastapi import APIRouter
 from pydantic import BaseModel
 from urllib.parse import urlparse
+from ....app.services.dedupe import cluster_evidence
+from ....app.services.storage import RunId
 
 router = APIRouter(tags=["agent:citation-builder"], prefix="/agents/citation-builder")
 
 
 class BuildRequest(BaseModel):
-    run_id: str
+    run_id: RunId
     evidence: list[dict]
 
 
 @router.post("/build")
 async def build(req: BuildRequest):
+    # Sources quoting the same passage (mirrors, syndication) share one citation
+    mirrors: dict[str, list[str]] = {}
+    leads: set[str] = set()
+    for cluster in cluster_evidence(req.evidence):
+        lead = cluster[0].get("url")
+        leads.add(lead)
+        for e in cluster[1:]:
+            if lead and e.get("url") and e["url"] != lead:
+                mirrors.setdefault(lead, []).append(e["url"])
+    # A URL is folded into another's citation only if none of its quotes is original
+    mirrored = {u for urls in mirrors.values() for u in urls} - leads
     citations = []
     seen = set()
     for i, e in enumerate(req.evidence):
         url = e.get("url")
-        if not url or url in seen:
+        if not url or url in seen or url in mirrored:
             continue
         seen.add(url)
         parsed = urlparse(url)
-        citations.append({
+        citation = {
             "id": f"C{i+1}",
             "url": url,
             "title": e.get("title") or parsed.netloc,
             "publisher": e.get("publisher") or parsed.netloc,
-        })
+        }
+        if mirrors.get(url):
+            citation["mirrors"] = list(dict.fromkeys(u for u in mirrors[url] if u in mirrored))
+        citations.append(citation)
     return {"run_id": req.run_id, "citations": citations}
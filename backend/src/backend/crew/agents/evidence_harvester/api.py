@@ -1,30 +1,170 @@
 from __future__ import annotations
 
+import asyncio
+import time
 import uuid
+from contextlib import aclosing
+from typing import Any, AsyncIterator
+
 from fastapi import APIRouter
 from pydantic import BaseModel
-from ....app.services.fetch_extract import extract_from_url, evidence_from_text
+from ....app.config import settings
+from ....app.services.dedupe import DocumentDeduper
+from ....app.services.fetch_extract import acached_fingerprint, evidence_from_text, iter_extracted
+from ....app.services.page_cache import normalize_url
+from ....app.services.passages import derive_keywords
+from ....app.services.politeness import interleave_domains
+from ....app.services.storage import RunId
+from ....app.services.sufficiency import Sufficiency
 from ....app.services.websearch import _domain
 
 router = APIRouter(tags=["agent:evidence-harvester"], prefix="/agents/evidence-harvester")
 
 
+# Sources fetched per harvest call
+MAX_SOURCES = 8
+
+
 class HarvestRequest(BaseModel):
-    run_id: str | None = None
+    run_id: RunId | None = None
     sources: list[dict] = []
+    # Passages are chosen for keywords derived from these
+    topic: str | None = None
+    queries: list[str] | None = None
+    # Fingerprints of documents harvested earlier in the run (mirrors are skipped)
+    known_documents: list[str] = []
+    # Stop once evidence is sufficient; None = settings.harvest_adaptive
+    adaptive: bool | None = None
+
+
+async def _skip_mirrors(urls: list[str], dedupe: DocumentDeduper | None) -> tuple[list[str], dict[str, str]]:
+    """Drop URLs whose cached document signature matches one already harvested."""
+    if dedupe is None:
+        return urls, {}
+    keep: list[str] = []
+    skipped: dict[str, str] = {}
+    fingerprints = await asyncio.gather(*(acached_fingerprint(url) for url in urls))
+    for url, fp in zip(urls, fingerprints):
+        dup = dedupe.before_fetch(fp)
+        if dup:
+            skipped[url] = dup
+            continue
+        if fp:
+            dedupe.after_extract(url, {"fingerprint": fp})
+        keep.append(url)
+    return keep, skipped
+
+
+def _source_evidence(url: str, extracted: dict, keywords: dict[str, float]) -> list[dict]:
+    quotes = evidence_from_text(
+        url, extracted.get("title", ""), extracted.get("text", ""),
+        keywords=keywords, max_quotes=2, pages=extracted.get("pages"),
+    )
+    for ev in quotes:
+        ev["publisher"] = _domain(url)
+    return quotes
+
+
+async def harvest_stream(
+    run_id: str,
+    sources: list[dict],
+    topic: str | None = None,
+    queries: list[str] | None = None,
+    known_documents: list[str] | None = None,
+    adaptive: bool | None = None,
+) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+    """Harvest ``sources``, yielding events as each one finishes.
+
+    Per source: ``evidence`` for each quote, then ``source`` with its status
+    (ok|empty|duplicate|timeout|error|skipped) and timing; ``error`` events
+    carry the message. A final ``done`` event summarizes the run.
+
+    Source URLs are canonicalized (tracking-parameter variants collapse) and
+    round-robined across domains. In adaptive mode they are fetched in the
+    given (ranked) order within each domain, a few at a time, and once the
+    evidence is sufficient (see ``Sufficiency``) a ``sufficient`` event is
+    emitted and the remaining fetches are cancelled. Keywords also let PDF
+    extraction stop after the relevant pages.
+    """
+    started = time.monotonic()
+    adaptive = settings.harvest_adaptive if adaptive is None else adaptive
+    keywords = derive_keywords(topic, queries)
+    coverage = Sufficiency(keywords)
+    dedupe = DocumentDeduper(known_documents or ()) if settings.dedupe_enabled else None
+    urls = list(dict.fromkeys(normalize_url(src["url"]) for src in sources[:MAX_SOURCES] if src.get("url")))
+    fetch, skipped = await _skip_mirrors(urls, dedupe)
+    # Alternate sites so per-domain pacing does not idle the parallel slots
+    fetch = interleave_domains(fetch)
+    for url, dup in skipped.items():
+        yield "source", {"url": url, "elapsed_ms": 0, "status": "duplicate", "duplicate_of": dup, "evidence_count": 0}
+    documents: dict[str, str] = {}
+    finished: set[str] = set()
+    stopped_early = False
+    limit = settings.harvest_parallel if adaptive else None
+    async with aclosing(iter_extracted(fetch, deadline=settings.harvest_deadline, limit=limit, keywords=keywords)) as pages:
+        async for url, extracted, error, elapsed in pages:
+            finished.add(url)
+            timing = {"url": url, "elapsed_ms": round(elapsed * 1000)}
+            if error is not None:
+                status = "timeout" if isinstance(error, asyncio.TimeoutError) else "error"
+                yield "error", {**timing, "status": status, "message": str(error) or type(error).__name__}
+                yield "source", {**timing, "status": status, "evidence_count": 0}
+                continue
+            dup = dedupe.after_extract(url, extracted) if dedupe and extracted else None
+            if dup:
+                yield "source", {**timing, "status": "duplicate", "duplicate_of": dup, "evidence_count": 0}
+                continue
+            if extracted and extracted.get("fingerprint"):
+                documents[url] = extracted["fingerprint"]
+            quotes = _source_evidence(url, extracted, keywords) if extracted else []
+            for ev in quotes:
+                yield "evidence", ev
+            coverage.add(quotes)
+            yield "source", {**timing, "status": "ok" if quotes else "empty", "evidence_count": len(quotes)}
+            if adaptive and coverage.met and len(finished) < len(fetch):
+                stopped_early = True
+                yield "sufficient", {"run_id": run_id, **coverage.report()}
+                break
+    elapsed_ms = round((time.monotonic() - started) * 1000)
+    for url in fetch:
+        if url not in finished:
+            yield "source", {"url": url, "elapsed_ms": elapsed_ms, "status": "skipped", "evidence_count": 0}
+    yield "done", {
+        "run_id": run_id,
+        "sources": len(urls),
+        "evidence_count": coverage.report()["quotes"],
+        "documents": documents,
+        "coverage": coverage.report(),
+        "stopped_early": stopped_early,
+        "elapsed_ms": elapsed_ms,
+    }
 
 
 @router.post("/harvest")
 async def harvest(req: HarvestRequest):
     run_id = req.run_id or uuid.uuid4().hex[:12]
-    evidence = []
-    for src in req.sources[:8]:
-        url = src.get("url")
-        if not url:
-            continue
-        extracted = extract_from_url(url)
-        quotes = evidence_from_text(url, extracted.get("title", ""), extracted.get("text", ""), keywords=["flow", "productivity"], max_quotes=2)
-        for ev in quotes:
-            ev["publisher"] = _domain(url)
-            evidence.append(ev)
-    return {"run_id": run_id, "evidence": evidence}
+    evidence: list[dict] = []
+    duplicates: dict[str, str] = {}
+    summary: dict[str, Any] = {}
+    events = harvest_stream(run_id, req.sources, req.topic, req.queries, req.known_documents, adaptive=req.adaptive)
+    async for event, data in events:
+        if event == "evidence":
+            evidence.append(data)
+        elif event == "source" and data["status"] == "duplicate":
+            duplicates[data["url"]] = data["duplicate_of"]
+        elif event == "done":
+            summary = data
+    # Report evidence in source order rather than completion order
+    order: dict[str, int] = {}
+    for i, src in enumerate(req.sources):
+        if src.get("url"):
+            order.setdefault(normalize_url(src["url"]), i)
+    evidence.sort(key=lambda e: order.get(e["url"], len(order)))
+    return {
+        "run_id": run_id,
+        "evidence": evidence,
+        "documents": summary.get("documents", {}),
+        "duplicates": duplicates,
+        "coverage": summary.get("coverage"),
+        "stopped_early": summary.get("stopped_early", False),
+    }
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from fastapi import APIRouter
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+
+
+@dataclass(frozen=True)
+class Agent:
+    path: str
+    request_model: type[BaseModel]
+    handler: Callable[[Any], Awaitable[Any]]
+
+    async def invoke(self, payload: dict[str, Any]) -> Any:
+        return await self.handler(self.request_model.model_validate(payload))
+
+
+_AGENTS: dict[str, Agent] = {}
+
+
+def register_routes(router: APIRouter) -> None:
+    """Record a router's agent endpoints so the orchestrator can call them in-process.
+
+    Each POST route taking a single request model becomes an ``Agent`` keyed
+    by the path it is mounted at (without the API prefix), e.g.
+    ``/agents/query-optimizer/optimize``.
+    """
+    for route in router.routes:
+        if not isinstance(route, APIRoute) or "POST" not in route.methods:
+            continue
+        body = route.dependant.body_params
+        model = body[0].field_info.annotation if len(body) == 1 else None
+        if isinstance(model, type) and issubclass(model, BaseModel):
+            _AGENTS[route.path] = Agent(path=route.path, request_model=model, handler=route.endpoint)
+
+
+def get_agent(path: str) -> Agent | None:
+    return _AGENTS.get(path)
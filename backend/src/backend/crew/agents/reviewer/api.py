@@ -2,12 +2,13 @@ from __future__ import annotations
 
 from fastapi import APIRouter
 from pydantic import BaseModel
+from ....app.services.storage import RunId
 
 router = APIRouter(tags=["agent:reviewer"], prefix="/agents/reviewer")
 
 
 class ReviewRequest(BaseModel):
-    run_id: str
+    run_id: RunId
 
 
 @router.post("/review")
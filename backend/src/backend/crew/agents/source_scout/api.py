@@ -13,5 +13,5 @@ class DiscoverRequest(BaseModel):
 
 @router.post("/discover")
 async def discover(req: DiscoverRequest):
-    cands = search_candidates(req.queries, max_results=5)
+    cands = await search_candidates(req.queries, max_results=5)
     return {"candidates": cands}
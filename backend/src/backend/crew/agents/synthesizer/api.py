@@ -3,6 +3,7 @@ from __future__ import annotations
 from fastapi import APIRouter
 from pydantic import BaseModel
 from typing import List
+from ....app.services.storage import RunId
 from ....app.services.websearch import _domain
 from ....app.services.llm import synthesize_with_llm
 
@@ -10,11 +11,12 @@ router = APIRouter(tags=["agent:synthesizer"], prefix="/agents/synthesizer")
 
 
 class SynthesizeRequest(BaseModel):
-    run_id: str
+    run_id: RunId
     evidence: List[dict] | None = None
+    topic: str | None = None
 
 
 @router.post("/synthesize")
 async def synthesize(req: SynthesizeRequest):
     ev = req.evidence or []
-    return synthesize_with_llm(req.run_id, ev)
+    return await synthesize_with_llm(req.run_id, ev, topic=req.topic)
@@ -2,12 +2,13 @@ from __future__ import annotations
 
 from fastapi import APIRouter
 from pydantic import BaseModel
+from ....app.services.storage import RunId
 
 router = APIRouter(tags=["agent:title-abstract"], prefix="/agents/title-abstract")
 
 
 class TitleRequest(BaseModel):
-    run_id: str
+    run_id: RunId
 
 
 @router.post("/generate")
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import os
+import sys
+import zipfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import pytest
+from fastapi.testclient import TestClient  # type: ignore
+from backend.app.config import settings
+from backend.app.main import app
+from backend.app.services import artifacts, memory
+from backend.app.services.memory import RunStore, append_evidence, get_evidence, get_result, set_result
+
+
+def _fresh_store() -> RunStore:
+    return RunStore(max_runs=10, max_bytes=1_000_000, ttl=3600, spill=False)
+
+
+def test_stages_persist_and_survive_store_loss(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(settings, "storage_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "run_artifacts_fsync_interval", 60.0)
+    monkeypatch.setattr(memory, "_STORE", _fresh_store())
+
+    append_evidence("r1", [{"quote": "a"}])
+    append_evidence("r1", [{"quote": "b"}, {"quote": "c"}])
+    set_result("r1", "topic", "Flow")
+    set_result("r1", "synthesis", {"sections": [{"heading": "S", "content": "x"}]})
+
+    run_dir = tmp_path / "runs" / "r1"
+    assert (run_dir / "evidence.jsonl").read_text().count("\n") == 3
+    index = json.loads((run_dir / "index.json").read_text())
+    assert index["evidence"]["count"] == 3
+    assert set(index["stages"]) == {"topic", "synthesis"}
+    assert artifacts._PENDING  # fsyncs were batched, not issued per write
+    artifacts.flush_pending()
+    assert not artifacts._PENDING
+
+    # A crash mid-append leaves a torn last line; readers skip it.
+    with open(run_dir / "evidence.jsonl", "a") as f:
+        f.write('{"quote": "tor')
+
+    # A restarted worker (empty store) still sees everything.
+    monkeypatch.setattr(memory, "_STORE", _fresh_store())
+    assert [e["quote"] for e in get_evidence("r1")] == ["a", "b", "c"]
+    assert get_result("r1", "topic") == "Flow"
+
+    resp = TestClient(app).get("/api/v1/runs/r1/download")
+    assert resp.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(resp.content)) as z:
+        report = json.loads(z.read("report.json"))
+    assert report["topic"] == "Flow" and len(report["evidence"]) == 3
+
+
+def test_idle_runs_are_flushed_and_renames_follow_fsync(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(settings, "storage_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "run_artifacts_fsync_interval", 0.05)
+    events: list[str] = []
+    real_fsync, real_replace = os.fsync, os.replace
+    monkeypatch.setattr(artifacts.os, "fsync", lambda fd: events.append("fsync") or real_fsync(fd))
+    monkeypatch.setattr(artifacts.os, "replace", lambda a, b: events.append("replace") or real_replace(a, b))
+
+    artifacts.write_stage("r1", "topic", "Flow")
+    assert events == ["fsync", "replace", "fsync", "replace"]  # stage file, then index
+
+    async def main() -> None:
+        artifacts.start_flusher()
+        try:
+            artifacts.append_evidence("r1", [{"quote": "a"}])
+            artifacts.append_evidence("r1", [{"quote": "b"}])
+            assert artifacts._PENDING
+            for _ in range(50):  # no further writes: the flusher syncs on its own
+                if not artifacts._PENDING:
+                    break
+                await asyncio.sleep(0.02)
+            assert not artifacts._PENDING
+        finally:
+            await artifacts.stop_flusher()
+
+    asyncio.run(main())
+
+
+def test_run_ids_cannot_escape_storage(monkeypatch, tmp_path) -> None:
+    storage = tmp_path / "st"
+    monkeypatch.setattr(settings, "storage_dir", str(storage))
+    monkeypatch.setattr(memory, "_STORE", _fresh_store())
+    client = TestClient(app)
+
+    resp = client.post("/api/v1/research/synthesize", json={"run_id": "../../pwned_run", "evidence": []})
+    assert resp.status_code == 422
+    assert client.get("/api/v1/runs/..%2F..%2Fpwned_run/download").status_code in (404, 422)
+    assert client.post("/api/v1/agents/synthesizer/synthesize", json={"run_id": "a/b", "evidence": []}).status_code == 422
+
+    with pytest.raises(ValueError):
+        set_result("../escape", "synthesis", {})
+    assert not (tmp_path / "pwned_run").exists() and not (tmp_path / "escape").exists()
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from fastapi.testclient import TestClient  # type: ignore
+from backend.app.config import settings
+from backend.app.main import app
+from backend.app.services import fetch_extract, jobs
+from backend.crew.agents.source_scout import api as scout_api
+
+
+async def _fake_search(queries, max_results=5):
+    slug = queries[0].split()[-1].replace(":", "-")
+    return [{"url": f"https://{slug}.example.com/a", "title": queries[0], "publisher": "example.com", "date": "", "score": 0.0}]
+
+
+async def _fake_extract(url, keywords=None):
+    return {"url": url, "title": "", "text": f"Flow state boosts productivity. Seen at {url}."}
+
+
+def _poll(client: TestClient, run_id: str, states: set[str]) -> dict:
+    for _ in range(200):
+        status = client.get(f"/api/v1/runs/{run_id}").json()
+        if status["state"] in states:
+            return status
+        time.sleep(0.02)
+    raise AssertionError(f"run {run_id} stuck in {status}")
+
+
+def _setup(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(settings, "storage_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "batch_workers", 0)
+    monkeypatch.setattr(jobs, "_QUEUE", None)
+    monkeypatch.setattr(scout_api, "search_candidates", _fake_search)
+
+
+def test_submitted_run_completes_in_background(monkeypatch, tmp_path) -> None:
+    _setup(monkeypatch, tmp_path)
+    monkeypatch.setattr(fetch_extract, "aextract_from_url", _fake_extract)
+
+    with TestClient(app) as client:
+        resp = client.post("/api/v1/runs", json={"topic": "flow state"})
+        assert resp.status_code == 202
+        run_id = resp.json()["run_id"]
+
+        status = _poll(client, run_id, {"done", "failed"})
+        assert status["state"] == "done" and status["progress"] == 1.0
+
+        body = client.get(f"/api/v1/runs/{run_id}/events").text
+        events = [json.loads(line.removeprefix("data: ")) for line in body.splitlines() if line.startswith("data: ")]
+        assert events[-1]["state"] == "done"
+
+        resp = client.post("/api/v1/research/synthesize", json={"run_id": run_id, "background": True})
+        assert resp.status_code == 202 and resp.json()["stage"] == "synthesize"
+        assert _poll(client, run_id, {"done", "failed"})["state"] == "done"
+
+
+def test_cancel_stops_in_flight_stage(monkeypatch, tmp_path) -> None:
+    _setup(monkeypatch, tmp_path)
+    started, released = [], []
+
+    async def _stuck_extract(url, keywords=None):
+        started.append(url)
+        try:
+            await asyncio.sleep(60)
+        finally:
+            released.append(url)
+
+    monkeypatch.setattr(fetch_extract, "aextract_from_url", _stuck_extract)
+
+    with TestClient(app) as client:
+        resp = client.post("/api/v1/research/gather", json={"sources": [{"url": "https://a.example.com"}], "background": True})
+        run_id = resp.json()["run_id"]
+        _poll(client, run_id, {"running"})
+        # "running" is recorded before the stage reaches its fetch
+        for _ in range(200):
+            if started:
+                break
+            time.sleep(0.01)
+        assert client.delete(f"/api/v1/runs/{run_id}").status_code == 200
+        assert _poll(client, run_id, {"cancelled"})["stage"] == "gather"
+        assert released
+        assert client.delete(f"/api/v1/runs/{run_id}").status_code == 404
+
+
+def test_background_gather_reports_per_source_progress(monkeypatch, tmp_path) -> None:
+    _setup(monkeypatch, tmp_path)
+    gate = threading.Event()
+
+    async def _gated_extract(url, keywords=None):
+        if "b.example.org" in url:
+            await asyncio.to_thread(gate.wait, 10)
+        return await _fake_extract(url)
+
+    monkeypatch.setattr(fetch_extract, "aextract_from_url", _gated_extract)
+    sources = [{"url": "https://a.example.com/x"}, {"url": "https://b.example.org/y"}]
+
+    with TestClient(app) as client:
+        resp = client.post("/api/v1/research/gather", json={"sources": sources, "background": True})
+        run_id = resp.json()["run_id"]
+        try:
+            for _ in range(200):
+                status = client.get(f"/api/v1/runs/{run_id}").json()
+                if status.get("progress") == 0.5:
+                    break
+                time.sleep(0.02)
+            assert status["stage"] == "gather" and status["progress"] == 0.5
+        finally:
+            gate.set()
+        assert _poll(client, run_id, {"done", "failed"})["state"] == "done"
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import io
+import json
+import sys
+import zipfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from fastapi.testclient import TestClient  # type: ignore
+from backend.app.config import settings
+from backend.app.main import app
+from backend.app.services.memory import set_evidence, set_result
+from backend.app.services.storage import iter_zip
+
+
+def _report(n: int) -> dict:
+    return {
+        "topic": "Flow",
+        "run_id": "r1",
+        "candidates": [{"url": "https://example.com"}],
+        "evidence": [{"url": f"https://example.com/{i}", "quote": f"Quote number {i} " * 20} for i in range(n)],
+        "synthesis": {"sections": [{"heading": "Summary", "content": "Flow helps."}]},
+    }
+
+
+def test_iter_zip_streams_entries_in_small_chunks() -> None:
+    report = _report(2000)
+    chunks = list(iter_zip(report, chunk_size=16 * 1024))
+
+    assert len(chunks) > 10
+    assert max(len(c) for c in chunks) < 64 * 1024
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as z:
+        assert json.loads(z.read("report.json")) == report
+        assert z.read("report.json").decode() == json.dumps(report, indent=2)
+        lines = z.read("evidence.jsonl").decode().splitlines()
+        assert [json.loads(line) for line in lines] == report["evidence"]
+        assert "## Summary" in z.read("report.md").decode()
+
+
+def test_download_streams_persisted_run_state(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(settings, "storage_dir", str(tmp_path))
+    client = TestClient(app)
+    assert client.get("/api/v1/runs/missing-run/download").status_code == 404
+
+    report = _report(3)
+    set_evidence("dl-run", report["evidence"])
+    set_result("dl-run", "topic", "Flow")
+    set_result("dl-run", "synthesis", report["synthesis"])
+
+    resp = client.get("/api/v1/runs/dl-run/download")
+    assert resp.status_code == 200 and resp.headers["content-type"] == "application/zip"
+    with zipfile.ZipFile(io.BytesIO(resp.content)) as z:
+        data = json.loads(z.read("report.json"))
+    assert data["run_id"] == "dl-run" and data["evidence"] == report["evidence"]
+
+    # Fields missing from a bundle request are filled from the run state
+    resp = client.post("/api/v1/runs/bundle", json={"topic": "Flow", "run_id": "dl-run"})
+    with zipfile.ZipFile(io.BytesIO(resp.content)) as z:
+        assert len(z.read("evidence.jsonl").decode().splitlines()) == 3
+
+
+def test_bundle_filename_survives_non_ascii_topics() -> None:
+    resp = TestClient(app).post("/api/v1/runs/bundle", json={"topic": 'Flow “state”; 心流 🚀'})
+
+    assert resp.status_code == 200
+    disposition = resp.headers["content-disposition"]
+    assert 'filename="research_flow_state.zip"' in disposition
+    assert "filename*=UTF-8''research_flow_%E2%80%9Cstate%E2%80%9D%3B_%E5%BF%83%E6%B5%81_%F0%9F%9A%80.zip" in disposition
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from backend.app.services.dedupe import DocumentDeduper, SimHashIndex, cluster_evidence, fingerprint, hamming
+from backend.crew.agents.citation_builder.api import BuildRequest, build
+
+_ARTICLE = " ".join(f"Sentence {i} explains how sustained focus and flow shape output in week {i}." for i in range(40))
+
+
+def test_simhash_matches_reformatted_copies_only() -> None:
+    mirror = _ARTICLE.upper().replace(".", "!") + " Copyright Mirror Site."
+    assert hamming(fingerprint(_ARTICLE), fingerprint(mirror)) <= 3
+    assert hamming(fingerprint(_ARTICLE), fingerprint("A different article about gardening and soil health.")) > 3
+
+    index = SimHashIndex(max_distance=3)
+    index.add(fingerprint(_ARTICLE), "original")
+    assert index.near(fingerprint(mirror)) == "original"
+    assert index.near(fingerprint("Unrelated text on ocean tides and the moon.")) is None
+
+
+def test_cluster_evidence_and_citations_fold_mirrors() -> None:
+    quote = "Flow state improves productivity for knowledge workers in long sessions."
+    evidence = [
+        {"url": "https://a.example.com", "quote": quote},
+        {"url": "https://b.example.com", "quote": "Unrelated findings on sleep and memory."},
+        {"url": "https://mirror.example.net", "quote": quote.replace(".", "!")},
+    ]
+    clusters = cluster_evidence(evidence, max_distance=3)
+    assert [len(c) for c in clusters] == [2, 1]
+
+    out = asyncio.run(build(BuildRequest(run_id="r", evidence=evidence)))
+    assert [c["url"] for c in out["citations"]] == ["https://a.example.com", "https://b.example.com"]
+    assert out["citations"][0]["mirrors"] == ["https://mirror.example.net"]
+
+
+def test_document_deduper_skips_known_and_cached_mirrors() -> None:
+    fp = fingerprint(_ARTICLE)
+    earlier = DocumentDeduper(known=[fp], max_distance=3)
+    assert earlier.before_fetch(fp) == "earlier source"
+
+    dedupe = DocumentDeduper(max_distance=3)
+    assert dedupe.before_fetch(None) is None
+    assert dedupe.after_extract("https://a.example.com", {"fingerprint": fp}) is None
+    # the same URL re-checked after extraction is not its own duplicate
+    assert dedupe.after_extract("https://a.example.com", {"fingerprint": fp}) is None
+    assert dedupe.after_extract("https://copy.example.net", {"fingerprint": fp}) == "https://a.example.com"
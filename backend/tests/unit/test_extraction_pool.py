@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from backend.app.config import settings
+from backend.app.services import extraction
+from backend.app.services.fetch_extract import extract_from_html
+
+
+def _spin() -> int:
+    n = 0
+    while True:
+        n += 1
+
+
+def _spin_swallowing_errors() -> int:
+    # Like extractor fallbacks that wrap heavy work in ``except Exception``
+    while True:
+        try:
+            _spin()
+        except Exception:
+            pass
+
+
+def test_run_in_pool_extracts_and_caps_cpu_time(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "extract_workers", 2)
+    monkeypatch.setattr(settings, "extract_cpu_seconds", 0.5)
+    html = "<html><body><article><p>" + "Deep work sustains flow across long sessions. " * 20 + "</p></article></body></html>"
+
+    async def main():
+        return await asyncio.gather(
+            extraction.run_in_pool(extract_from_html, "https://example.com", html),
+            extraction.run_in_pool(_spin),
+            extraction.run_in_pool(_spin_swallowing_errors),
+        )
+
+    try:
+        extracted, spun, swallowed = asyncio.run(main())
+    finally:
+        extraction.shutdown_pool()
+
+    assert "Deep work sustains flow" in extracted["text"]
+    assert spun is None
+    assert swallowed is None
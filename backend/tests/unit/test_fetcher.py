@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import httpx
+
+from backend.app.services.fetcher import FetchEngine, iter_within
+
+
+async def _fetch_all(engine: FetchEngine, urls: list[str], deadline: float | None = None) -> dict:
+    return {url: page async for url, page, _, _ in iter_within(urls, engine.fetch, deadline) if page is not None}
+
+
+def _transport(delays: dict[str, float]) -> httpx.MockTransport:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(delays.get(request.url.host, 0))
+        if request.url.path == "/missing":
+            return httpx.Response(404)
+        return httpx.Response(200, text=f"<p>{request.url.host}</p>")
+
+    return httpx.MockTransport(handler)
+
+
+def test_fetches_run_concurrently_and_respect_deadline() -> None:
+    async def main() -> dict:
+        # Distinct registrable domains: robots.txt fetches are paced per domain too
+        delays = {"a.example.com": 0.2, "b.example.org": 0.2, "slow.example.net": 5}
+        engine = FetchEngine(max_concurrency=4, per_host_limit=2, timeout=5, transport=_transport(delays), domain_delay=0.0)
+        try:
+            return await _fetch_all(
+                engine,
+                ["https://a.example.com/", "https://b.example.org/", "https://slow.example.net/", "https://a.example.com/missing"],
+                deadline=1.0,
+            )
+        finally:
+            await engine.aclose()
+
+    start = time.monotonic()
+    pages = asyncio.run(main())
+    elapsed = time.monotonic() - start
+
+    assert set(pages) == {"https://a.example.com/", "https://b.example.org/"}
+    assert pages["https://a.example.com/"]["text"] == "<p>a.example.com</p>"
+    assert elapsed < 2.0
+
+
+def test_fetch_rejects_binaries_and_oversized_bodies_while_streaming() -> None:
+    sent: dict[str, int] = {}
+
+    async def body(path: str, size: int):
+        for _ in range(size // 1024):
+            sent[path] = sent.get(path, 0) + 1024
+            yield b"x" * 1024
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/robots.txt":
+            return httpx.Response(404)
+        if path == "/file.zip":
+            return httpx.Response(200, headers={"content-type": "application/zip"}, content=body(path, 64 * 1024))
+        if path == "/huge":
+            # No Content-Length: only the running byte count can stop it
+            return httpx.Response(200, headers={"content-type": "text/html"}, content=body(path, 1024 * 1024))
+        return httpx.Response(200, headers={"content-type": "text/html; charset=latin-1"}, content="<p>café</p>".encode("latin-1"))
+
+    async def main() -> tuple[dict, dict]:
+        engine = FetchEngine(transport=httpx.MockTransport(handler), max_bytes=16 * 1024, domain_delay=0)
+        try:
+            pages = await _fetch_all(engine, ["https://a.test/file.zip", "https://a.test/huge", "https://a.test/ok"])
+            return pages, dict(engine.rejected)
+        finally:
+            await engine.aclose()
+
+    pages, rejected = asyncio.run(main())
+
+    assert set(pages) == {"https://a.test/ok"}
+    assert pages["https://a.test/ok"]["text"] == "<p>café</p>"
+    assert rejected == {"content_type": 1, "too_large": 1}
+    assert sent.get("/file.zip", 0) <= 1024
+    assert sent["/huge"] <= 32 * 1024
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from fastapi.testclient import TestClient  # type: ignore
+from backend.app.config import settings
+from backend.app.main import app
+from backend.app.services import fetch_extract, orchestrator
+from backend.app.services.fetcher import iter_within
+from backend.app.services.memory import get_evidence
+from backend.app.services.streaming import ldj_stream
+
+
+def _ordered_extract(monkeypatch):
+    """Fake extractor: broken and slow finish only after fast's evidence is recorded.
+
+    ``asyncio.wait`` reports calls finishing close together as an unordered
+    set, so the wait is on the orchestrator appending fast's evidence (done
+    once its ``source`` event has been consumed), not on fast returning.
+    """
+    fast_recorded = asyncio.Event()
+    append = orchestrator.aappend_evidence
+
+    async def recording_append(run_id: str, items: list[dict]) -> None:
+        await append(run_id, items)
+        if any("fast" in e["url"] for e in items):
+            fast_recorded.set()
+
+    monkeypatch.setattr(orchestrator, "aappend_evidence", recording_append)
+
+    async def extract(url: str, keywords=None) -> dict:
+        if "fast" not in url:
+            await fast_recorded.wait()
+        if "broken" in url:
+            raise RuntimeError("connection reset")
+        return {"url": url, "title": "", "text": f"Flow state boosts productivity at {url}. Filler sentence here."}
+
+    return extract
+
+
+def test_iter_within_yields_in_completion_order_and_times_out() -> None:
+    async def work(key: str) -> str:
+        await asyncio.sleep({"fast": 0.01, "slow": 0.05, "stuck": 10}[key])
+        return key.upper()
+
+    async def main():
+        return [(k, v, type(e).__name__ if e else None) async for k, v, e, _ in iter_within(["stuck", "slow", "fast"], work, deadline=0.3)]
+
+    assert asyncio.run(main()) == [("fast", "FAST", None), ("slow", "SLOW", None), ("stuck", None, "TimeoutError")]
+
+
+def test_ldj_stream_emits_json_lines() -> None:
+    async def main():
+        return [line async for line in ldj_stream([{"a": "ü"}, {"b": None}])]
+
+    assert asyncio.run(main()) == ['{"a": "ü"}\n', '{"b": null}\n']
+
+
+def test_gather_stream_emits_evidence_per_source(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(settings, "storage_dir", str(tmp_path))
+    monkeypatch.setattr(fetch_extract, "aextract_from_url", _ordered_extract(monkeypatch))
+    sources = [{"url": "https://slow.example.com"}, {"url": "https://broken.example.com"}, {"url": "https://fast.example.com"}]
+
+    resp = TestClient(app).post("/api/v1/research/gather/stream", json={"run_id": "gs1", "sources": sources})
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    names = [line["event"] for line in lines]
+
+    # fast source's evidence arrives before the slow one finishes
+    first_source = next(line["data"] for line in lines if line["event"] == "source")
+    assert names[0] == "evidence" and "fast" in first_source["url"]
+    errors = [line["data"] for line in lines if line["event"] == "error"]
+    assert errors[0]["url"] == "https://broken.example.com/" and errors[0]["message"] == "connection reset"
+    assert all(isinstance(line["data"].get("elapsed_ms", 0), int) for line in lines)
+    done = lines[-1]
+    assert done["event"] == "done" and done["data"]["evidence_count"] == names.count("evidence") > 0
+    assert len(get_evidence("gs1")) == done["data"]["evidence_count"]
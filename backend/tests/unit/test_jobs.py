@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from fastapi.testclient import TestClient  # type: ignore
+from backend.app.config import settings
+from backend.app.main import app
+from backend.app.services import fetch_extract, jobs
+from backend.app.services.jobs import BatchRunner, JobQueue
+from backend.crew.agents.source_scout import api as scout_api
+
+
+async def _fake_search(queries, max_results=5):
+    slug = queries[0].split()[-1].replace(":", "-")
+    return [{"url": f"https://{slug}.example.com/a", "title": queries[0], "publisher": "example.com", "date": "", "score": 0.0}]
+
+
+async def _fake_extract(url, keywords=None):
+    return {"url": url, "title": "", "text": f"Flow state boosts productivity. Seen at {url}."}
+
+
+def test_batch_endpoints_and_runner(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(settings, "storage_dir", str(tmp_path))
+    monkeypatch.setattr(jobs, "_QUEUE", None)
+    monkeypatch.setattr(scout_api, "search_candidates", _fake_search)
+    monkeypatch.setattr(fetch_extract, "aextract_from_url", _fake_extract)
+    client = TestClient(app)
+
+    resp = client.post("/api/v1/research/batch", json={"topics": ["flow state", "deep work", " "]})
+    assert resp.status_code == 200
+    batch_id = resp.json()["batch_id"]
+    assert len(resp.json()["jobs"]) == 2
+    assert client.get(f"/api/v1/research/batch/{batch_id}").json()["counts"] == {"queued": 2}
+
+    asyncio.run(BatchRunner(app, jobs.get_queue(), workers=2, batch_id=batch_id).drain())
+
+    status = client.get(f"/api/v1/research/batch/{batch_id}/results").json()
+    assert status["finished"] and status["counts"] == {"done": 2}
+    assert all(j["progress"] == 1 and j["run_id"] and j["result"]["evidence_count"] > 0 for j in status["jobs"])
+    assert client.get("/api/v1/research/batch/missing").status_code == 404
+
+
+def test_queue_requeues_stale_and_retries_failures(tmp_path) -> None:
+    queue = JobQueue(tmp_path / "jobs.db", lease_seconds=0, max_attempts=2)
+    batch_id, _ = queue.enqueue(["a"])
+
+    crashed = queue.claim()
+    # The worker died without a heartbeat: the next claim picks the job up again.
+    resumed = queue.claim()
+    assert resumed["job_id"] == crashed["job_id"] and resumed["attempts"] == 2
+
+    queue.fail(resumed["job_id"], "boom")
+    assert queue.batch(batch_id)["counts"] == {"failed": 1}
+    assert queue.claim() is None
+
+
+def test_stale_jobs_out_of_attempts_fail_instead_of_looping(tmp_path) -> None:
+    queue = JobQueue(tmp_path / "jobs.db", lease_seconds=0, max_attempts=2)
+    batch_id, _ = queue.enqueue(["a"])
+
+    queue.claim()
+    queue.claim()  # both attempts crashed the worker without a heartbeat
+    assert queue.requeue_stale() == 1
+    status = queue.batch(batch_id)
+    assert status["counts"] == {"failed": 1} and "lease" in status["jobs"][0]["error"]
+
+
+def test_runner_heartbeats_long_stages(monkeypatch, tmp_path) -> None:
+    queue = JobQueue(tmp_path / "jobs.db", lease_seconds=0.3, max_attempts=1)
+    batch_id, _ = queue.enqueue(["a"])
+
+    class SlowOrchestrator:
+        def __init__(self, app):
+            pass
+
+        async def run(self, topic, constraints, run_id=None):
+            # One stage much longer than the lease, with no events meanwhile
+            await asyncio.sleep(1.0)
+            assert queue.requeue_stale() == 0
+            yield "result", {"run_id": "r1"}
+
+    monkeypatch.setattr(jobs, "Orchestrator", SlowOrchestrator)
+    asyncio.run(BatchRunner(app, queue, workers=1, batch_id=batch_id).drain())
+
+    assert queue.batch(batch_id)["counts"] == {"done": 1}
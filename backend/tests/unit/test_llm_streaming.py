@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import pytest
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from backend.app.config import settings
+from backend.app.services import llm
+
+_REPLY = json.dumps({"sections": [{"heading": "Executive Summary", "content": "Flow helps."}]})
+
+
+def _fake_openai(fail_first: int) -> tuple[FastAPI, dict]:
+    app = FastAPI()
+    seen = {"requests": 0}
+
+    @app.post("/v1/chat/completions")
+    async def completions(body: dict):
+        seen["requests"] += 1
+        if seen["requests"] <= fail_first:
+            return JSONResponse({"error": {"message": "overloaded"}}, status_code=503)
+
+        async def _chunks():
+            for i in range(0, len(_REPLY), 16):
+                chunk = {
+                    "id": "c1",
+                    "object": "chat.completion.chunk",
+                    "created": 0,
+                    "model": body["model"],
+                    "choices": [{"index": 0, "delta": {"content": _REPLY[i : i + 16]}, "finish_reason": None}],
+                }
+                yield f"data: {json.dumps(chunk)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(_chunks(), media_type="text/event-stream")
+
+    return app, seen
+
+
+@pytest.fixture
+def fake_openai_url():
+    app, seen = _fake_openai(fail_first=1)
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, log_level="error"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    yield f"http://127.0.0.1:{port}/v1", seen
+    server.should_exit = True
+    thread.join(timeout=5)
+
+
+def test_stream_synthesis_streams_tokens_retries_and_caches(fake_openai_url, monkeypatch, tmp_path) -> None:
+    base_url, seen = fake_openai_url
+    monkeypatch.setattr(settings, "storage_dir", str(tmp_path))
+    monkeypatch.setattr(llm, "_RESPONSE_CACHE", None)
+    monkeypatch.setattr(settings, "llm_provider", "openai")
+    monkeypatch.setattr(settings, "openai_api_key", "test-key")
+    monkeypatch.setattr(settings, "openai_base_url", base_url)
+    monkeypatch.setattr(settings, "llm_retry_base_delay", 0.01)
+    evidence = [{"url": "https://example.com", "quote": "Flow helps."}]
+
+    async def main(run_id: str) -> list[tuple[str, object]]:
+        try:
+            return [e async for e in llm.stream_synthesis(run_id, evidence)]
+        finally:
+            await llm.close_llm_client()
+
+    events = asyncio.run(main("run-1"))
+
+    tokens = [d for e, d in events if e == "token"]
+    assert len(tokens) > 1 and "".join(tokens) == _REPLY
+    assert events[-1][0] == "result"
+    assert events[-1][1]["sections"][0]["content"] == "Flow helps."
+    assert seen["requests"] == 2
+
+    # Same model, prompt and evidence checksums: served from the response cache.
+    cached = asyncio.run(main("run-2"))
+    assert seen["requests"] == 2
+    assert [d for e, d in cached if e == "token"] == [_REPLY]
+    assert cached[-1][1]["run_id"] == "run-2"
+    assert llm.response_cache_stats()["hits"] >= 1
+
+
+def test_map_reduce_synthesis_summarizes_chunks_then_reduces(fake_openai_url, monkeypatch, tmp_path) -> None:
+    base_url, seen = fake_openai_url
+    monkeypatch.setattr(settings, "storage_dir", str(tmp_path))
+    monkeypatch.setattr(llm, "_RESPONSE_CACHE", None)
+    monkeypatch.setattr(settings, "llm_provider", "openai")
+    monkeypatch.setattr(settings, "openai_api_key", "test-key")
+    monkeypatch.setattr(settings, "openai_base_url", base_url)
+    monkeypatch.setattr(settings, "llm_retry_base_delay", 0.01)
+    monkeypatch.setattr(settings, "synthesis_mode", "auto")
+    monkeypatch.setattr(settings, "synthesis_token_budget", 100)
+    monkeypatch.setattr(settings, "synthesis_chunk_tokens", 100)
+    evidence = [
+        {"url": f"https://example.com/{i}", "quote": f"Source {i} reports finding number {i} about {word} and focus.", "checksum": f"c{i}"}
+        for i, word in enumerate(["flow", "attention", "sleep", "breaks", "music", "deadlines", "meetings", "email"])
+    ]
+
+    async def main() -> list[tuple[str, object]]:
+        try:
+            return [e async for e in llm.stream_synthesis("run-mr", evidence, topic="flow")]
+        finally:
+            await llm.close_llm_client()
+
+    events = asyncio.run(main())
+
+    result = events[-1][1]
+    packing = result["quality_metrics"]["packing"]
+    assert packing["mode"] == "map_reduce"
+    assert packing["chunks"] > 1
+    assert sum(1 for e, _ in events if e == "progress") == packing["chunks"]
+    # one failed-then-retried call, one call per chunk, one reduce call
+    assert seen["requests"] == packing["chunks"] + 2
+    assert result["sections"][0]["heading"] == "Executive Summary"
+
+
+def test_with_retry_retries_only_transient_api_errors(monkeypatch) -> None:
+    import httpx
+    import openai
+
+    monkeypatch.setattr(settings, "llm_retry_base_delay", 0.0)
+    request = httpx.Request("POST", "https://api.test/v1/chat/completions")
+    calls: list[int] = []
+
+    async def flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            raise openai.RateLimitError("slow down", response=httpx.Response(429, request=request), body=None)
+        if len(calls) == 2:
+            raise openai.APITimeoutError(request=request)
+        return "ok"
+
+    async def broken():
+        calls.append(1)
+        raise openai.BadRequestError("bad", response=httpx.Response(400, request=request), body=None)
+
+    assert asyncio.run(llm._with_retry(flaky)) == "ok" and len(calls) == 3
+    calls.clear()
+    with pytest.raises(openai.BadRequestError):
+        asyncio.run(llm._with_retry(broken))
+    assert len(calls) == 1
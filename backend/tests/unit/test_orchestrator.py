@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from fastapi.testclient import TestClient  # type: ignore
+from backend.app.config import settings
+from backend.app.main import app
+from backend.app.services import memory, orchestrator
+from backend.crew.agents.registry import get_agent
+
+
+def test_agents_are_registered_by_route_path(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(settings, "storage_dir", str(tmp_path))
+    monkeypatch.setattr(memory, "_STORE", None)
+    agent = get_agent("/agents/title-abstract/generate")
+    assert agent is not None and agent.request_model.__name__ == "TitleRequest"
+    resp = TestClient(app).post("/api/v1/agents/title-abstract/generate", json={"run_id": "run-1"})
+    assert resp.status_code == 200
+
+
+def test_orchestrator_calls_agents_in_process(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(settings, "storage_dir", str(tmp_path))
+    monkeypatch.setattr(memory, "_STORE", None)
+    async def main() -> tuple[dict, dict]:
+        orch = orchestrator.Orchestrator(app)
+        return await orch.title("run-1"), await orch.review("run-1")
+
+    title, review = asyncio.run(main())
+
+    assert title["run_id"] == "run-1" and title["title"]
+    assert isinstance(review["issues"], list)
+    assert orchestrator._CLIENT is None
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from backend.app.services.packing import item_tokens, pack_evidence
+
+
+def _ev(quote: str, n: int) -> dict:
+    return {"url": f"https://example.com/{n}", "quote": quote, "checksum": f"c{n}"}
+
+
+def test_pack_evidence_dedupes_ranks_and_respects_budget() -> None:
+    evidence = [
+        _ev("Weather patterns shifted across the region this spring.", 1),
+        _ev("Flow state improves productivity for knowledge workers in long sessions.", 2),
+        _ev("Flow state improves productivity for knowledge workers in long sessions!", 3),
+        _ev("Deep focus and flow correlate with measured productivity gains.", 4),
+        _ev("Unrelated filler " * 40, 5),
+    ]
+    budget = item_tokens(evidence[1]) + item_tokens(evidence[3]) + 5
+
+    packed, report = pack_evidence(evidence, "flow state productivity", budget=budget)
+
+    assert [e["checksum"] for e in packed] == ["c2", "c4"]
+    assert report["dropped_duplicates"] == 1
+    assert report["dropped_over_budget"] == 2
+    assert report["estimated_tokens"] <= budget
+    assert report["included_checksums"] == ["c2", "c4"]
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from backend.app.config import settings
+from backend.app.services import fetch_extract, page_cache
+from backend.app.services.diskcache import DiskCache
+from backend.app.services.page_cache import PageCache, normalize_url
+from backend.crew.agents.evidence_harvester.api import harvest_stream
+
+
+def test_normalize_url_drops_fragment_and_default_port() -> None:
+    assert normalize_url("HTTPS://Example.com:443/a?b=1#top") == "https://example.com/a?b=1"
+    assert normalize_url("http://example.com") == "http://example.com/"
+
+
+def test_page_cache_hits_and_revalidates(tmp_path) -> None:
+    cache = PageCache(tmp_path, ttl=60, max_bytes=1_000_000)
+    extracted = {"url": "https://example.com/a", "title": "", "text": "Body"}
+
+    assert cache.lookup("https://example.com/a") is None
+    cache.store("https://example.com/a", "<p>Body</p>", extracted, {"ETag": '"v1"'})
+
+    hit = cache.lookup("https://EXAMPLE.com/a#section")
+    assert hit and hit["fresh"] and hit["extracted"] == extracted
+
+    stale_cache = PageCache(tmp_path, ttl=0, max_bytes=1_000_000)
+    stale = stale_cache.lookup("https://example.com/a")
+    assert stale and not stale["fresh"]
+    assert stale_cache.validators(stale) == {"If-None-Match": '"v1"'}
+    assert stale_cache.revalidated_ok("https://example.com/a", stale) == extracted
+
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+
+    # The mirror check reads the signature from the small per-URL entry only
+    cache.store("https://example.com/b", "<p>B</p>", {**extracted, "fingerprint": "00ff00ff00ff00ff"})
+    cache._content = None
+    assert cache.peek("https://example.com/b")["fingerprint"] == "00ff00ff00ff00ff"
+    assert cache.misses == 1
+
+
+def test_harvest_counts_one_lookup_per_url(monkeypatch, tmp_path) -> None:
+    cache = PageCache(tmp_path, ttl=60, max_bytes=1_000_000)
+    monkeypatch.setattr(settings, "page_cache_enabled", True)
+    monkeypatch.setattr(settings, "dedupe_enabled", True)
+    monkeypatch.setattr(page_cache, "_CACHE", cache)
+
+    class _Offline:
+        async def fetch(self, url, headers=None):
+            return None
+
+    monkeypatch.setattr(fetch_extract, "get_engine", lambda: _Offline())
+
+    async def main() -> None:
+        async for _ in harvest_stream("r1", [{"url": "https://a.example.com/1"}, {"url": "https://b.example.org/1"}]):
+            pass
+
+    asyncio.run(main())
+
+    assert cache.stats()["misses"] == 2
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path) -> None:
+    cache = DiskCache(tmp_path, max_bytes=300)
+    payload = "x" * 80
+    for key in ("aa1", "bb2", "cc3"):
+        cache.set(key, payload)
+    cache.get("aa1")
+    cache.set("dd4", payload)
+
+    assert cache.get("bb2") is None
+    assert cache.get("aa1") == payload
+    assert cache.stats()["evictions"] >= 1
+
+
+def test_disk_cache_scans_directory_once(tmp_path, monkeypatch) -> None:
+    first = DiskCache(tmp_path, max_bytes=10_000)
+    for key in ("aa1", "bb2"):
+        first.set(key, "x" * 40)
+
+    scans = []
+    real_glob = Path.glob
+    monkeypatch.setattr(Path, "glob", lambda self, pattern: scans.append(pattern) or real_glob(self, pattern))
+    cache = DiskCache(tmp_path, max_bytes=200)
+    assert cache.stats()["entries"] == 2
+    for key in ("cc3", "dd4", "ee5"):
+        cache.set(key, "y" * 40)
+    cache.get("cc3")
+
+    assert cache.stats()["entries"] < 5 and cache.stats()["bytes"] <= 200
+    assert cache.get("aa1") is None and cache.get("cc3") == "y" * 40
+    assert len(scans) == 1
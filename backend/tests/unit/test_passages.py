@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from backend.app.services.passages import derive_keywords, select_passages
+
+
+def test_derive_keywords_weights_topic_over_queries_and_skips_operators() -> None:
+    kw = derive_keywords("Sleep and memory", ["sleep memory consolidation site:gov", "sleep memory filetype:pdf"])
+    assert kw == {"consolidation": 0.5, "sleep": 1.0, "memory": 1.0}
+
+
+def test_select_passages_returns_best_non_overlapping_windows_in_order() -> None:
+    filler = "Nothing relevant is said in this sentence at all. " * 12
+    text = (
+        filler
+        + "Sleep supports memory consolidation during slow wave phases. "
+        + filler
+        + "Only sleep is mentioned here. "
+        + filler
+        + "Memory and sleep interact; sleep loss harms memory. "
+        + filler
+    )
+    passages = select_passages(text, derive_keywords("sleep memory"), max_passages=2, window=20)
+
+    assert len(passages) == 2
+    assert "slow wave" in passages[0] and "sleep loss harms memory" in passages[1]
+    assert not any("Only sleep" in p for p in passages)
+    assert select_passages(text, {"quantum": 1.0}) == []
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from backend.app.services.fetch_extract import evidence_from_text
+from backend.app.services.pdf_extract import extract_pdf
+
+
+def _pdf(pages: list[str]) -> bytes:
+    """Minimal PDF with one line of Helvetica text per page."""
+    n = len(pages)
+    font = 3 + 2 * n
+    objs = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [%s] /Count %d >>" % (" ".join(f"{3 + 2 * i} 0 R" for i in range(n)), n),
+    ]
+    for i, text in enumerate(pages):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objs.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * i} 0 R /Resources << /Font << /F1 {font} 0 R >> >> >>")
+        objs.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    objs.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for i, body in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{o:010d} 00000 n \n" for o in offsets).encode()
+    out += f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return out
+
+
+def test_extract_pdf_stops_after_enough_relevant_pages() -> None:
+    data = _pdf([
+        "Table of contents.",
+        "Deep work and flow state improve focus.",
+        "Unrelated appendix material.",
+        "Flow state research on deep work output.",
+        "More flow state findings on deep work.",
+    ])
+
+    out = extract_pdf("https://a.test/r.pdf", data, {"flow": 1.0, "state": 1.0, "deep": 0.5}, target_pages=2)
+
+    assert [p["page"] for p in out["pages"]] == [1, 2, 3, 4]
+    assert out["page_count"] == 5 and out["complete"] is False
+    assert out["fingerprint"]
+    assert extract_pdf("https://a.test/r.pdf", b"<html>not a pdf</html>")["text"] == ""
+
+    # Reading up to the page cap does not depend on the keywords
+    capped = extract_pdf("https://a.test/r.pdf", data, {"flow": 1.0}, max_pages=2, target_pages=3)
+    assert [p["page"] for p in capped["pages"]] == [1, 2] and capped["complete"] is True
+
+
+def test_evidence_from_pdf_pages_records_page_selector() -> None:
+    pages = [
+        {"page": 2, "text": "An introduction that says little."},
+        {"page": 5, "text": "Flow state raises productivity in knowledge work."},
+    ]
+    text = "\n\n".join(p["text"] for p in pages)
+
+    ev = evidence_from_text("https://a.test/r.pdf", "", text, keywords={"flow": 1.0, "productivity": 1.0}, max_quotes=1, pages=pages)
+
+    assert ev[0]["selector"] == "page=5"
+    assert "Flow state" in ev[0]["quote"]
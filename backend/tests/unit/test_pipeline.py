@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from fastapi.testclient import TestClient  # type: ignore
+from backend.app.config import settings
+from backend.app.main import app
+from backend.app.services import fetch_extract, memory
+from backend.crew.agents.source_scout import api as scout_api
+
+
+async def _fake_search(queries, max_results=5):
+    q = queries[0]
+    slug = q.split()[-1].replace(":", "-")
+    return [
+        {"url": f"https://{slug}.example.com/a", "title": q, "publisher": "example.com", "date": "", "score": 0.0},
+        {"url": "https://shared.example.com/", "title": q, "publisher": "example.com", "date": "", "score": 0.0},
+    ]
+
+
+async def _fake_extract(url, keywords=None):
+    return {"url": url, "title": "", "text": f"Flow state boosts productivity. Seen at {url}."}
+
+
+def _events(body: str) -> list[tuple[str, dict]]:
+    out = []
+    for block in body.strip().split("\n\n"):
+        lines = block.splitlines()
+        event = lines[0].removeprefix("event: ")
+        data = "\n".join(line.removeprefix("data: ") for line in lines[1:])
+        out.append((event, json.loads(data)))
+    return out
+
+
+def test_run_endpoint_streams_every_stage(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(settings, "storage_dir", str(tmp_path))
+    monkeypatch.setattr(memory, "_STORE", None)
+    monkeypatch.setattr(scout_api, "search_candidates", _fake_search)
+    monkeypatch.setattr(fetch_extract, "aextract_from_url", _fake_extract)
+
+    resp = TestClient(app).post("/api/v1/research/run", json={"topic": "flow state"})
+    assert resp.status_code == 200
+    events = _events(resp.text)
+    names = [e for e, _ in events]
+
+    assert names[0] == "queries"
+    assert names.count("candidates") == len(events[0][1]["optimized_queries"])
+    assert "evidence" in names
+    assert names[-4:] == ["synthesis", "title", "review", "result"]
+
+    result = events[-1][1]
+    harvested = [u for e, d in events if e == "evidence" for u in d["sources"]]
+    assert len(harvested) == len(set(harvested))
+    assert result["evidence_count"] == len(result["evidence"]) > 0
+    assert isinstance(result["synthesis"]["sections"], list)
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import httpx
+
+from backend.app.services.fetcher import FetchEngine, iter_within
+from backend.app.services.page_cache import normalize_url
+from backend.app.services.politeness import DomainScheduler, RobotsCache, interleave_domains
+
+
+async def _fetch_all(engine: FetchEngine, urls: list[str], deadline: float | None = None) -> dict:
+    return {url: page async for url, page, _, _ in iter_within(urls, engine.fetch, deadline) if page is not None}
+
+
+def test_normalize_url_strips_tracking_params() -> None:
+    url = "https://News.Example.com./a?id=7&utm_source=x&UTM_Medium=y&fbclid=z#section"
+    assert normalize_url(url) == "https://news.example.com/a?id=7"
+    assert normalize_url("https://example.com/a?q=flow+state") == "https://example.com/a?q=flow+state"
+
+
+def test_interleave_domains_round_robins_keeping_rank() -> None:
+    urls = [
+        "https://a.example.com/1",
+        "https://b.example.com/2",  # same registrable domain as a.example.com
+        "https://other.org/1",
+        "https://example.com/3",
+        "https://third.net/1",
+    ]
+    assert interleave_domains(urls) == [
+        "https://a.example.com/1",
+        "https://other.org/1",
+        "https://third.net/1",
+        "https://b.example.com/2",
+        "https://example.com/3",
+    ]
+
+
+def test_engine_honours_robots_and_paces_domains() -> None:
+    starts: dict[str, list[float]] = {}
+    robots_fetches: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/robots.txt":
+            robots_fetches.append(request.url.host)
+            return httpx.Response(200, text="User-agent: *\nDisallow: /private\n")
+        starts.setdefault(request.url.host, []).append(time.monotonic())
+        return httpx.Response(200, text=str(request.url))
+
+    async def main() -> dict:
+        engine = FetchEngine(transport=httpx.MockTransport(handler), domain_delay=0.2)
+        try:
+            return await _fetch_all(engine, [
+                "https://a.example.com/1?utm_campaign=x",
+                "https://a.example.com/2",
+                "https://a.example.com/private/3",
+                "https://b.example.org/1",
+            ])
+        finally:
+            await engine.aclose()
+
+    pages = asyncio.run(main())
+
+    assert set(pages) == {"https://a.example.com/1?utm_campaign=x", "https://a.example.com/2", "https://b.example.org/1"}
+    assert pages["https://a.example.com/1?utm_campaign=x"]["url"] == "https://a.example.com/1"
+    assert sorted(robots_fetches) == ["a.example.com", "b.example.org"]
+    a = sorted(starts["a.example.com"])
+    assert a[1] - a[0] >= 0.18
+    # Another site is not held up by a.example.com's pacing
+    assert starts["b.example.org"][0] - a[0] < 0.15
+
+
+def test_scheduler_and_robots_cache_stay_bounded() -> None:
+    async def robots(url: str) -> str | None:
+        return "User-agent: *\nDisallow: /private\n"
+
+    async def main() -> tuple[int, int, bool]:
+        scheduler = DomainScheduler(per_domain_limit=2, delay=0.0)
+        for i in range(200):
+            async with scheduler.slot(f"https://site{i}.example{i}.org/"):
+                pass
+        cache = RobotsCache(robots, ttl=60, max_entries=10)
+        for i in range(50):
+            await cache.allowed(f"https://site{i}.org/page")
+        return len(scheduler), len(cache), await cache.allowed("https://site49.org/private/x")
+
+    domains, origins, allowed = asyncio.run(main())
+    assert domains < 100
+    assert origins == 10 and allowed is False
+
+
+def test_oversized_robots_txt_is_ignored() -> None:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/robots.txt":
+            return httpx.Response(200, text="User-agent: *\nDisallow: /\n" + "#" * 2_000_000)
+        return httpx.Response(200, text="ok")
+
+    async def main() -> dict | None:
+        engine = FetchEngine(transport=httpx.MockTransport(handler), domain_delay=0.0)
+        try:
+            return await engine.fetch("https://a.example.com/page")
+        finally:
+            await engine.aclose()
+
+    page = asyncio.run(main())
+    assert page is not None and page["text"] == "ok"
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from backend.app.services.fetch_extract import evidence_from_text
+from backend.app.services.ranking import BM25, rank_candidates, tokenize
+
+
+def test_bm25_prefers_rare_terms_and_shorter_documents() -> None:
+    docs = [tokenize(t) for t in ["flow state flow", "flow state and many other unrelated words here", "state of the union"]]
+    scores = BM25(docs).scores(tokenize("flow state"))
+    assert scores[0] > scores[1] > scores[2] > 0
+
+
+def test_rank_candidates_scores_unscored_results() -> None:
+    candidates = [
+        {"url": "https://a.example.com/weather", "title": "Weather today", "score": 0.0},
+        {"url": "https://b.example.com/flow-state-productivity", "title": "Flow and focus", "snippet": "Flow state boosts productivity", "score": 0.0},
+        {"url": "https://c.example.com/x", "title": "Productivity tips", "score": 0.0},
+    ]
+    ranked = rank_candidates(candidates, "flow state productivity")
+    assert [c["url"][8] for c in ranked] == ["b", "c", "a"]
+    assert ranked[0]["relevance"] == ranked[0]["score"] == 1.0
+    assert ranked[-1]["relevance"] == 0.0
+
+
+def test_evidence_quotes_the_relevant_passage() -> None:
+    text = ("Intro sentence about nothing in particular. " * 10) + "Deep flow states raise productivity markedly. " + ("Closing remarks. " * 20)
+    quotes = evidence_from_text("https://x.example.com", "", text, keywords=["flow", "productivity"], max_quotes=1)
+    assert "Deep flow states raise productivity" in quotes[0]["quote"]
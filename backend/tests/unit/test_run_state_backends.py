@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import socketserver
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from backend.app.services.memory import RedisRunStore, SQLiteRunStore
+from backend.app.services.resp import encode
+
+
+def test_sqlite_store_is_shared_between_workers(tmp_path) -> None:
+    path = tmp_path / "state.db"
+    worker_a = SQLiteRunStore(path, ttl=3600)
+    worker_b = SQLiteRunStore(path, ttl=3600)
+
+    worker_a.update("run1", evidence=[{"quote": "q"}])
+    worker_b.update("run1", synthesis={"sections": []})
+
+    assert worker_b.get("run1") == {"evidence": [{"quote": "q"}], "synthesis": {"sections": []}}
+    assert worker_a.get("missing") == {}
+    assert worker_a._conn().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+class _FakeRedis(socketserver.StreamRequestHandler):
+    """Tiny RESP stand-in supporting the commands RedisRunStore uses."""
+
+    data: dict[bytes, dict[bytes, bytes]] = {}
+    lists: dict[bytes, list[bytes]] = {}
+
+    def _read_command(self) -> list[bytes] | None:
+        header = self.rfile.readline()
+        if not header:
+            return None
+        args = []
+        for _ in range(int(header[1:])):
+            n = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(n + 2)[:-2])
+        return args
+
+    def handle(self) -> None:
+        while (cmd := self._read_command()) is not None:
+            name = cmd[0].upper()
+            if name == b"HSET":
+                h = self.data.setdefault(cmd[1], {})
+                for i in range(2, len(cmd), 2):
+                    h[cmd[i]] = cmd[i + 1]
+                self.wfile.write(f":{(len(cmd) - 2) // 2}\r\n".encode())
+            elif name == b"HGETALL":
+                flat = [x for kv in self.data.get(cmd[1], {}).items() for x in kv]
+                self.wfile.write(encode(*flat) if flat else b"*0\r\n")
+            elif name == b"EXPIRE":
+                self.wfile.write(b":1\r\n")
+            elif name == b"RPUSH":
+                items = self.lists.setdefault(cmd[1], [])
+                items.extend(cmd[2:])
+                self.wfile.write(f":{len(items)}\r\n".encode())
+            elif name == b"LRANGE":
+                items = self.lists.get(cmd[1], [])
+                self.wfile.write(encode(*items) if items else b"*0\r\n")
+            elif name == b"DEL":
+                found = self.lists.pop(cmd[1], None) is not None or self.data.pop(cmd[1], None) is not None
+                self.wfile.write(f":{int(found)}\r\n".encode())
+            elif name == b"DBSIZE":
+                self.wfile.write(f":{len(self.data)}\r\n".encode())
+            else:
+                self.wfile.write(b"-ERR unknown command\r\n")
+
+
+def test_redis_store_round_trips_over_resp() -> None:
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _FakeRedis)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        host, port = server.server_address
+        store = RedisRunStore(f"redis://{host}:{port}/0", ttl=60)
+        store.update("run1", evidence=[{"quote": "q"}], title={"title": "T"})
+        store.update("run1", review={"issues": []})
+
+        assert store.get("run1") == {"evidence": [{"quote": "q"}], "title": {"title": "T"}, "review": {"issues": []}}
+        assert store.get("other") == {}
+        assert store.stats()["keys"] == 1
+
+        store.set_evidence("run1", [{"quote": "a"}])
+        store.append_evidence("run1", [{"quote": "b"}, {"quote": "c"}])
+        assert [e["quote"] for e in store.get_evidence("run1")] == ["a", "b", "c"]
+        store.set_evidence("run1", [])
+        assert store.get_evidence("run1") is None
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_sqlite_evidence_appends_are_not_lost_between_writers(tmp_path) -> None:
+    path = tmp_path / "state.db"
+    workers = [SQLiteRunStore(path, ttl=3600) for _ in range(4)]
+    workers[0].set_evidence("run1", [])
+
+    def _append(i: int) -> None:
+        workers[i % 4].append_evidence("run1", [{"quote": f"q{i}"}])
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(_append, range(40)))
+
+    quotes = {e["quote"] for e in workers[1].get_evidence("run1")}
+    assert quotes == {f"q{i}" for i in range(40)}
+    workers[2].set_evidence("run1", [{"quote": "fresh"}])
+    assert workers[3].get_evidence("run1") == [{"quote": "fresh"}]
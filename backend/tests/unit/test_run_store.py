@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from backend.app.config import settings
+from backend.app.services.memory import RunStore
+
+
+def test_run_store_evicts_and_reloads_spilled_runs(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "storage_dir", str(tmp_path))
+    store = RunStore(max_runs=2, max_bytes=1_000_000, ttl=3600, spill=True)
+
+    store.update("r1", evidence=[{"quote": "one"}])
+    store.update("r2", evidence=[{"quote": "two"}])
+    store.update("r3", evidence=[{"quote": "three"}])
+
+    assert store.stats()["runs"] == 2
+    assert (tmp_path / "runs" / "r1" / "state.json").exists()
+
+    store.update("r1", synthesis={"sections": []})
+    assert store.get("r1") == {"evidence": [{"quote": "one"}], "synthesis": {"sections": []}}
+    assert store.stats()["reloaded"] == 1
+
+
+def test_run_store_enforces_byte_bound_and_ttl() -> None:
+    store = RunStore(max_runs=100, max_bytes=200, ttl=3600, spill=False)
+    store.update("a", evidence=[{"quote": "x" * 120}])
+    store.update("b", evidence=[{"quote": "y" * 120}])
+
+    assert store.get("a") == {}
+    assert store.stats()["runs"] == 1
+
+    expiring = RunStore(max_runs=100, max_bytes=1_000_000, ttl=0, spill=False)
+    expiring.update("c", evidence=[])
+    assert expiring.get("c") == {}
+
+
+def test_run_store_measures_only_appended_evidence(monkeypatch) -> None:
+    from backend.app.services import memory
+
+    measured: list[object] = []
+    real = memory._measure
+    monkeypatch.setattr(memory, "_measure", lambda value: measured.append(value) or real(value))
+    store = RunStore(max_runs=10, max_bytes=1_000_000, ttl=3600, spill=False)
+
+    store.update("r", synthesis={"sections": []})
+    for i in range(50):
+        store.append_evidence("r", [{"quote": f"q{i}"}])
+
+    assert len(measured) == 51
+    state = store.get("r")
+    exact = real(state["synthesis"]) + real(state["evidence"])
+    assert abs(store.stats()["bytes"] - exact) <= 50
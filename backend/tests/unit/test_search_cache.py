@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from backend.app.services.diskcache import DiskCache
+from backend.app.services.ratelimit import TokenBucket
+from backend.app.services.search_cache import SearchCache
+from backend.app.services.websearch import merge_results
+
+
+def test_search_cache_coalesces_and_persists(tmp_path) -> None:
+    calls = 0
+
+    async def upstream() -> list[dict]:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return [{"url": "https://example.com", "title": "Example", "score": 0.0}]
+
+    key = SearchCache.key("ddg", "  Flow   State ", 5, "us-en")
+    assert key == SearchCache.key("ddg", "flow state", 5, "us-en")
+
+    async def main() -> list[list[dict]]:
+        cache = SearchCache(DiskCache(tmp_path, max_bytes=1_000_000), ttl=60, max_entries=8)
+        results = await asyncio.gather(*(cache.get_or_fetch(key, upstream) for _ in range(5)))
+        assert cache.stats()["coalesced"] == 4
+        return results
+
+    results = asyncio.run(main())
+    assert calls == 1
+    assert all(r == results[0] for r in results)
+
+    # A fresh process-level cache is served from the disk tier.
+    reloaded = SearchCache(DiskCache(tmp_path, max_bytes=1_000_000), ttl=60, max_entries=8)
+    assert asyncio.run(reloaded.get_or_fetch(key, upstream)) == results[0]
+    assert calls == 1
+    assert reloaded.stats()["disk_hits"] == 1
+
+
+def test_cancelled_caller_does_not_cancel_coalesced_waiters() -> None:
+    release = asyncio.Event()
+
+    async def upstream() -> list[dict]:
+        await release.wait()
+        return [{"url": "https://example.com", "title": "Example", "score": 0.0}]
+
+    async def main() -> list[dict]:
+        cache = SearchCache(None, ttl=60, max_entries=8)
+        owner = asyncio.create_task(cache.get_or_fetch("k", upstream))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get_or_fetch("k", upstream))
+        await asyncio.sleep(0)
+        owner.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        return await waiter
+
+    assert asyncio.run(main())[0]["url"] == "https://example.com"
+
+
+def test_merge_results_dedupes_and_ranks() -> None:
+    merged = merge_results([
+        [{"url": "https://a.com", "score": 0.0}, {"url": "https://b.com", "score": 0.0}],
+        [{"url": "https://b.com", "score": 0.0}, {"url": "https://c.com", "score": 0.9}],
+    ])
+
+    assert [r["url"] for r in merged] == ["https://c.com/", "https://b.com/", "https://a.com/"]
+
+
+def test_token_bucket_paces_after_burst() -> None:
+    bucket = TokenBucket(rate=20.0, capacity=2)
+
+    async def main() -> None:
+        await asyncio.gather(*(bucket.acquire() for _ in range(6)))
+
+    start = time.monotonic()
+    asyncio.run(main())
+    elapsed = time.monotonic() - start
+
+    # Two tokens are free, the other four accrue at 20/s.
+    assert 0.15 <= elapsed < 1.0
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from backend.app.config import settings
+from backend.app.services import fetch_extract
+from backend.app.services.sufficiency import Sufficiency
+from backend.crew.agents.evidence_harvester.api import harvest_stream
+
+
+def test_sufficiency_needs_every_threshold() -> None:
+    s = Sufficiency({"sleep": 1.0, "memory": 1.0}, min_quotes=2, min_publishers=2, min_keyword_coverage=1.0)
+    s.add([{"publisher": "a.com", "quote": "Sleep matters."}, {"publisher": "a.com", "quote": "Memory too."}])
+    assert not s.met  # one publisher
+    s.add([{"publisher": "b.com", "quote": "Nothing new."}])
+    assert s.met and s.report() == {"quotes": 3, "publishers": 2, "keyword_coverage": 1.0, "sufficient": True}
+
+
+def test_adaptive_harvest_cancels_remaining_fetches(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(settings, "storage_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "harvest_parallel", 2)
+    monkeypatch.setattr(settings, "harvest_min_quotes", 2)
+    monkeypatch.setattr(settings, "harvest_min_publishers", 2)
+    monkeypatch.setattr(settings, "harvest_min_keyword_coverage", 0.5)
+    started: list[str] = []
+    cancelled: list[str] = []
+
+    async def _extract(url: str, keywords=None) -> dict:
+        started.append(url)
+        try:
+            await asyncio.sleep(30 if "hang" in url else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(url)
+            raise
+        return {"url": url, "title": "", "text": f"Sleep improves memory consolidation according to {url}."}
+
+    monkeypatch.setattr(fetch_extract, "aextract_from_url", _extract)
+    sources = [{"url": u} for u in ["https://a.com/1", "https://hang.com/2", "https://b.org/3", "https://c.net/4", "https://d.io/5"]]
+
+    async def main():
+        return [e async for e in harvest_stream("r", sources, topic="sleep memory", adaptive=True)]
+
+    events = asyncio.run(main())
+    names = [e for e, _ in events]
+    statuses = {d["url"]: d["status"] for e, d in events if e == "source"}
+
+    assert "sufficient" in names and events[-1][1]["stopped_early"]
+    assert cancelled == ["https://hang.com/2"]
+    assert "https://d.io/5" not in started  # never launched
+    assert statuses["https://hang.com/2"] == statuses["https://d.io/5"] == "skipped"
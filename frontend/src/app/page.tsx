@@ -36,7 +36,7 @@ export default function Home() {
       append(`Found ${s.candidates.length} candidates`)
 
       append('Gathering evidence...')
-      const g = await apiGather(s.candidates)
+      const g = await apiGather(s.candidates, undefined, topic, s.optimized_queries)
       setRunId(g.run_id)
       setEvidence(g.evidence)
       append(`Extracted ${g.evidence_count} evidence items`)
@@ -68,7 +68,7 @@ export default function Home() {
       // Ensure we have a run by doing search+gather first
       const s = await apiSearch(topic)
       setCandidates(s.candidates)
-      const g = await apiGather(s.candidates)
+      const g = await apiGather(s.candidates, undefined, topic, s.optimized_queries)
       setRunId(g.run_id)
       setEvidence(g.evidence)
       const base = process.env.NEXT_PUBLIC_BACKEND_URL || 'http://localhost:8000'
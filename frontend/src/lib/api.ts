@@ -38,10 +38,12 @@ export async function apiSearch(topic: string) {
   return post<{ optimized_queries: string[]; candidates: Candidate[] }>('/research/search', { topic })
 }
 
-export async function apiGather(sources: Candidate[], runId?: string) {
+export async function apiGather(sources: Candidate[], runId?: string, topic?: string, queries?: string[]) {
   return post<{ run_id: string; evidence: Evidence[]; evidence_count: number }>('/research/gather', {
     run_id: runId,
     sources,
+    topic,
+    queries,
   })
 }
 